@@ -6,37 +6,93 @@ from flask_sqlalchemy import SQLAlchemy
 from flask_mail import Mail
 from flask_limiter import Limiter
 from flask_limiter.util import get_remote_address
-from flask_migrate import Migrate
 from flask_jwt_extended import JWTManager
 from .config import Config
+from .classification import RequestClassifier
+from .compression import Compressor
+from .content import ContentRegistry
+from .engines import configure_engine_options, install_sqlite_pragmas
+from .hashing import PasswordHasher
+from .lifecycle import defer, running_from_cli
+from .logs import LogPipeline
+from .metrics import Metrics
+from .ratelimits import SQLiteStorage  # noqa: F401 - registers the sqlite:// limits storage
+from .replicas import ReadRouter, RoutingSession
+from .serialization import configure_json
+from .validators import EmailChecker
 
 csrf = CSRFProtect()
-db = SQLAlchemy()
+db = SQLAlchemy(session_options={'class_': RoutingSession})
 mail = Mail()
 limiter = Limiter(key_func=get_remote_address)
-migrate = Migrate()
 jwt = JWTManager()
+password_hasher = PasswordHasher()
+content_registry = ContentRegistry()
+request_classifier = RequestClassifier()
+metrics = Metrics()
+read_router = ReadRouter()
+email_checker = EmailChecker()
+log_pipeline = LogPipeline()
+compressor = Compressor()
 
-def create_app():
+def init_migrate(app):
+    # Imported here: Alembic is a sizeable import that only the flask
+    # command needs.
+    from flask_migrate import Migrate
+    from .search import include_name
+    Migrate(app, db, include_name=include_name)
+
+def create_app(config_class=Config):
     app = Flask(__name__)
-    app.config.from_object(Config)
+    app.config.from_object(config_class)
+    log_pipeline.init_app(app)
+    configure_json(app)
     
     csrf.init_app(app)
+    configure_engine_options(app)
     db.init_app(app)
-    mail.init_app(app)
+    install_sqlite_pragmas(app, db)
+    read_router.init_app(app, db)
     limiter.init_app(app)
-    migrate.init_app(app, db)
     jwt.init_app(app)
+    if app.config['LAZY_EXTENSIONS']:
+        # Only the outbox sends mail and only the flask command migrates;
+        # web workers never pay for either.
+        defer(app, 'mail', mail.init_app)
+        if running_from_cli():
+            init_migrate(app)
+        else:
+            defer(app, 'migrate', init_migrate)
+    else:
+        mail.init_app(app)
+        init_migrate(app)
+    password_hasher.init_app(app)
+    content_registry.init_app(app)
+    email_checker.init_app(app)
     
     @app.after_request
     def set_csrf_cookie(response):
+        if request_classifier.is_stateless():
+            return response
         response.set_cookie('csrf_token', generate_csrf())
         return response
     
     from .routes import main_bp
     app.register_blueprint(main_bp)
+    metrics.init_app(app, db)
+    # After metrics, so its request timing includes compression.
+    compressor.init_app(app)
+    request_classifier.init_app(app, csrf)
+
+    from .commands import loans_cli, outbox_cli, plans_cli, rollups_cli, seed_command
+    app.cli.add_command(rollups_cli)
+    app.cli.add_command(outbox_cli)
+    app.cli.add_command(seed_command)
+    app.cli.add_command(plans_cli)
+    app.cli.add_command(loans_cli)
 
-    with app.app_context():
-        db.create_all()
+    if app.config['SCHEMA_AUTO_CREATE']:
+        with app.app_context():
+            db.create_all()
     
     return app
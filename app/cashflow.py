@@ -0,0 +1,151 @@
+# cashflow.py
+from datetime import date, timedelta
+from sqlalchemy import func, select, type_coerce
+from . import db, rollups
+from .models import DailyCashFlow, Income, Expense
+
+GRANULARITIES = ('day', 'week', 'month')
+BUCKET_FIELDS = ('income', 'income_count', 'expenses', 'expense_count')
+
+
+def daily_buckets(user_id, model, entries, buckets=None):
+    """Group ``(datetime, amount)`` pairs into one row per UTC day.
+
+    Returns a ``{day: row}`` dict; pass it back in as ``buckets`` to merge
+    income and expenses into the same rows.
+    """
+    amount_field, count_field = (('income', 'income_count') if model.__tablename__ == 'income'
+                                 else ('expenses', 'expense_count'))
+    buckets = {} if buckets is None else buckets
+    for when, amount in entries:
+        day = when.date()
+        row = buckets.get(day)
+        if row is None:
+            row = buckets[day] = {'user_id': user_id, 'day': day,
+                                  'income': 0.0, 'income_count': 0, 'expenses': 0.0, 'expense_count': 0}
+        row[amount_field] += amount
+        row[count_field] += 1
+    return buckets
+
+
+def add_entries(user_id, model, entries):
+    """Fold new income or expense rows into the user's daily buckets.
+
+    ``entries`` are ``(datetime, amount)`` pairs. Runs in the caller's
+    transaction; the caller commits, so the raw rows and their buckets land
+    together.
+    """
+    rows = list(daily_buckets(user_id, model, entries).values())
+    if not rows:
+        return
+    table = DailyCashFlow.__table__
+
+    insert = rollups.dialect_insert()
+    if insert is not None:
+        stmt = insert(table)
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[table.c.user_id, table.c.day],
+            set_={field: table.c[field] + stmt.excluded[field] for field in BUCKET_FIELDS},
+        )
+        db.session.execute(stmt, rows)
+        return
+
+    for row in rows:
+        result = db.session.execute(
+            table.update()
+            .where(table.c.user_id == row['user_id'], table.c.day == row['day'])
+            .values({field: table.c[field] + row[field] for field in BUCKET_FIELDS})
+        )
+        if result.rowcount == 0:
+            db.session.execute(table.insert().values(**row))
+
+
+def period_start(day, granularity):
+    if granularity == 'week':
+        return day - timedelta(days=day.weekday())
+    if granularity == 'month':
+        return day.replace(day=1)
+    return day
+
+
+def _next_period(start, granularity):
+    if granularity == 'week':
+        return start + timedelta(days=7)
+    if granularity == 'month':
+        return (start.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return start + timedelta(days=1)
+
+
+def cash_flow(user_id, start, end, granularity='month'):
+    """Income, expenses and net per day, ISO week or month in [start, end].
+
+    Reads at most one bucket per day in the range and rolls them up here, so
+    the cost follows the length of the range rather than the number of raw
+    rows. Periods without activity are returned with zeros.
+    """
+    if granularity not in GRANULARITIES:
+        raise ValueError(f"granularity must be one of: {', '.join(GRANULARITIES)}")
+    if start > end:
+        raise ValueError("start must not be after end")
+
+    periods = {}
+    current = period_start(start, granularity)
+    while current <= end:
+        periods[current] = {'period': current, 'income': 0.0, 'income_count': 0,
+                            'expenses': 0.0, 'expense_count': 0}
+        try:
+            current = _next_period(current, granularity)
+        except OverflowError:
+            break  # the range ends in the last period before date.max
+
+    rows = db.session.execute(
+        select(DailyCashFlow.day, *(getattr(DailyCashFlow, field) for field in BUCKET_FIELDS))
+        .where(DailyCashFlow.user_id == user_id, DailyCashFlow.day >= start, DailyCashFlow.day <= end)
+    )
+    for row in rows:
+        period = periods[period_start(row.day, granularity)]
+        for field in BUCKET_FIELDS:
+            period[field] += getattr(row, field)
+
+    result = list(periods.values())
+    for period in result:
+        period['net'] = period['income'] - period['expenses']
+    return result
+
+
+def rebuild(chunk_size=1000):
+    """Recompute every user's daily buckets from the raw rows.
+
+    Works one user-id range per transaction; returns the number of buckets
+    written.
+    """
+    table = DailyCashFlow.__table__
+    max_id = max(db.session.execute(select(func.max(model.user_id))).scalar() or 0
+                 for model in (Income, Expense, DailyCashFlow))
+    written = 0
+
+    for lo in range(1, max_id + 1, chunk_size):
+        hi = lo + chunk_size
+        buckets = {}
+        for model, amount_field, count_field in ((Income, 'income', 'income_count'),
+                                                 (Expense, 'expenses', 'expense_count')):
+            # type_coerce (not CAST) so SQLite's 'YYYY-MM-DD' strings come back as dates.
+            day = type_coerce(func.date(model.date), db.Date)
+            rows = db.session.execute(
+                select(model.user_id, day, func.sum(model.amount), func.count(model.id))
+                .where(model.user_id >= lo, model.user_id < hi)
+                .group_by(model.user_id, day)
+            )
+            for user_id, bucket_day, total, count in rows:
+                row = buckets.setdefault((user_id, bucket_day), {
+                    'user_id': user_id, 'day': bucket_day,
+                    'income': 0.0, 'income_count': 0, 'expenses': 0.0, 'expense_count': 0})
+                row[amount_field] = total
+                row[count_field] = count
+
+        db.session.execute(table.delete().where(table.c.user_id >= lo, table.c.user_id < hi))
+        if buckets:
+            db.session.execute(table.insert(), list(buckets.values()))
+        db.session.commit()
+        written += len(buckets)
+    return written
@@ -0,0 +1,82 @@
+# classification.py
+from flask import current_app, request
+from flask.sessions import SecureCookieSessionInterface
+from werkzeug.exceptions import HTTPException
+
+ENVIRON_KEY = 'healthfin.stateless'
+
+
+def stateless(view):
+    """Mark a view as stateless: no cookie session, no CSRF check or token.
+
+    Meant for bearer-token (``jwt_required``) JSON endpoints and public
+    content; place it between the route decorator and ``jwt_required``.
+    """
+    view.stateless = True
+    return view
+
+
+class _ClassifyingSessionInterface(SecureCookieSessionInterface):
+    """Skips decoding and re-signing the session cookie on stateless requests."""
+
+    def __init__(self, classifier):
+        self.classifier = classifier
+
+    def open_session(self, app, request):
+        if self.classifier.is_stateless(app, request):
+            # An empty session that is never saved: nothing is read from or
+            # written to the cookie.
+            return self.session_class()
+        return super().open_session(app, request)
+
+    def save_session(self, app, session, response):
+        if self.classifier.is_stateless(app, request):
+            return
+        super().save_session(app, session, response)
+
+
+class RequestClassifier:
+    """Splits requests into stateless API calls and stateful browser requests.
+
+    Stateless endpoints are the views marked with :func:`stateless` plus
+    ``STATELESS_ENDPOINTS``, minus ``STATEFUL_ENDPOINTS``; setting
+    ``STATELESS_FAST_PATH = False`` treats every request as stateful again.
+    Must be initialised after the blueprints are registered.
+    """
+
+    def init_app(self, app, csrf):
+        endpoints = set()
+        if app.config['STATELESS_FAST_PATH']:
+            endpoints = {endpoint for endpoint, view in app.view_functions.items()
+                         if getattr(view, 'stateless', False)}
+            endpoints |= set(app.config['STATELESS_ENDPOINTS'])
+            endpoints -= set(app.config['STATEFUL_ENDPOINTS'])
+        app.extensions['request_classifier'] = frozenset(endpoints)
+        app.session_interface = _ClassifyingSessionInterface(self)
+
+        # CSRFProtect's own hook checks every request; run the check here
+        # instead, only for stateful requests.
+        app.config['WTF_CSRF_CHECK_DEFAULT'] = False
+
+        @app.before_request
+        def csrf_protect_stateful():
+            if app.config['WTF_CSRF_ENABLED'] and not self.is_stateless(app, request):
+                csrf.protect(apply_exemptions=True)
+
+    def is_stateless(self, app=None, req=None):
+        app = app or current_app
+        req = req or request
+        cached = req.environ.get(ENVIRON_KEY)
+        if cached is None:
+            cached = req.environ[ENVIRON_KEY] = self._endpoint(app, req) in app.extensions['request_classifier']
+        return cached
+
+    def _endpoint(self, app, req):
+        if req.url_rule is not None:
+            return req.url_rule.endpoint
+        # The session is opened before Flask matches the URL, so match it here.
+        try:
+            rule, _ = app.create_url_adapter(req).match(return_rule=True)
+        except HTTPException:
+            return None
+        return rule.endpoint
@@ -0,0 +1,134 @@
+# commands.py
+import csv
+import time
+import click
+import numpy as np
+from flask import current_app
+from flask.cli import AppGroup
+from . import cashflow, db, loans, outbox, projections, rollups, seeding
+
+rollups_cli = AppGroup('rollups', help='Maintain the per-user financial summary and daily cash-flow tables.')
+
+
+@rollups_cli.command('rebuild')
+@click.option('--chunk-size', default=1000, show_default=True, help='Users recomputed per transaction.')
+@click.option('--dry-run', is_flag=True, help='Only report drift, do not write.')
+def rebuild_rollups(chunk_size, dry_run):
+    """Recompute rollups and cash-flow buckets from the raw rows and report any drift."""
+    drift = rollups.rebuild(chunk_size=chunk_size, dry_run=dry_run)
+    for user_id, stored, expected in drift:
+        if stored is None:
+            click.echo(f"user {user_id}: missing rollup")
+            continue
+        changes = ', '.join(
+            f"{field} {stored[field]} -> {expected[field]}"
+            for field in rollups.SUMMARY_FIELDS
+            if stored[field] != expected[field]
+        )
+        click.echo(f"user {user_id}: {changes}")
+    verb = 'found' if dry_run else 'repaired'
+    click.echo(f"{len(drift)} drifted rollup(s) {verb}.")
+    if not dry_run:
+        buckets = cashflow.rebuild(chunk_size=chunk_size)
+        click.echo(f"{buckets} daily cash-flow bucket(s) rebuilt.")
+
+
+outbox_cli = AppGroup('outbox', help='Deliver queued email.')
+
+
+@outbox_cli.command('work')
+@click.option('--workers', type=int, default=None, help='Sender threads (default: OUTBOX_WORKERS).')
+def work_outbox(workers):
+    """Run the sender pool until interrupted."""
+    pool = outbox.OutboxWorkerPool(current_app._get_current_object(), workers=workers).start()
+    click.echo(f"Outbox worker pool started with {pool.workers} worker(s).")
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        click.echo("Stopping outbox workers...")
+    finally:
+        pool.stop()
+
+
+@outbox_cli.command('drain')
+def drain_outbox():
+    """Deliver everything that is currently due, then exit."""
+    handled = outbox.drain()
+    click.echo(f"{handled} message(s) processed.")
+
+
+@click.command('seed')
+@click.option('--seed', 'seed_value', type=int, default=0, show_default=True,
+              help='RNG seed; the same seed and --end always produce the same data.')
+@click.option('--users', type=int, default=100, show_default=True, help='Users to add.')
+@click.option('--history', type=int, default=365, show_default=True, help='Days of history per user.')
+@click.option('--per-day', type=int, default=1, show_default=True,
+              help='Income, expense and transaction rows per user per day.')
+@click.option('--end', type=click.DateTime(formats=['%Y-%m-%d']), default=None,
+              help='Last day of history (default: today).')
+@click.option('--chunk-size', type=int, default=20000, show_default=True, help='Rows per insert transaction.')
+@click.option('--processes', type=int, default=1, show_default=True,
+              help='Split users by id range across this many processes.')
+@click.option('--reset', is_flag=True, help='Drop and recreate all tables first.')
+def seed_command(seed_value, users, history, per_day, end, chunk_size, processes, reset):
+    """Bulk-load deterministic synthetic users and financial history."""
+    if reset:
+        db.drop_all()
+        db.create_all()
+    started = time.perf_counter()
+    try:
+        first, rows = seeding.seed(users, history, seed=seed_value, per_day=per_day, end=end,
+                                   chunk_size=chunk_size, processes=processes)
+    except ValueError as e:
+        raise click.UsageError(str(e))
+    elapsed = time.perf_counter() - started
+    click.echo(f"Seeded users {first}-{first + users - 1} ({rows} rows) in {elapsed:.1f}s "
+               f"({rows / elapsed:,.0f} rows/s). Password: {seeding.TEMPLATE_PASSWORD}")
+
+
+plans_cli = AppGroup('saving-plans', help='Project savings under the enrolled saving plans.')
+
+
+@plans_cli.command('project')
+@click.option('--months', type=int, default=120, show_default=True, help='Projection horizon.')
+@click.option('--scenarios', default=None,
+              help='Comma-separated annual rate offsets (default: PROJECTION_SCENARIOS).')
+@click.option('--chunk-size', type=int, default=2000, show_default=True, help='Enrollments projected per batch.')
+@click.option('--output', type=click.File('w'), default='-', help='CSV file to write (default: stdout).')
+def project_saving_plans(months, scenarios, chunk_size, output):
+    """Project every enrollment in one pass and write the final balances as CSV."""
+    offsets = ([float(value) for value in scenarios.split(',')] if scenarios
+               else list(current_app.config['PROJECTION_SCENARIOS']))
+    writer = csv.writer(output)
+    writer.writerow(['user_id', 'plan_id'] + [f'balance_{offset:+g}' for offset in offsets])
+
+    started = time.perf_counter()
+    projected = 0
+    for user_ids, plan_ids, curves in projections.project_all(months, offsets, chunk_size=chunk_size):
+        finals = np.round(curves[:, :, -1], 2)
+        writer.writerows([user_id, plan_id, *balances]
+                         for user_id, plan_id, balances in zip(user_ids.tolist(), plan_ids.tolist(), finals.tolist()))
+        projected += len(user_ids)
+    click.echo(f"{projected} enrollment(s) projected over {months} months "
+               f"in {time.perf_counter() - started:.2f}s.", err=True)
+
+
+loans_cli = AppGroup('loans', help='Score loan applications.')
+
+
+@loans_cli.command('score')
+@click.option('--chunk-size', type=int, default=None, help='Applications per chunk (default: LOAN_SCORING_CHUNK_SIZE).')
+@click.option('--workers', type=int, default=None, help='Scoring processes (default: LOAN_SCORING_WORKERS).')
+def score_loans(chunk_size, workers):
+    """Score every pending application against the applicant's cash flow."""
+    started = time.perf_counter()
+    try:
+        counts = loans.score_pending(chunk_size=chunk_size, workers=workers)
+    except loans.CashFlowMissing:
+        raise click.ClickException("No cash-flow buckets for the existing income and expenses; "
+                                   "run `flask rollups rebuild` first.")
+    elapsed = time.perf_counter() - started
+    total = sum(counts.values())
+    summary = ', '.join(f"{counts[status]} {status}" for status in (loans.APPROVED, loans.REVIEW, loans.DECLINED))
+    click.echo(f"{total} application(s) scored in {elapsed:.1f}s ({summary}).")
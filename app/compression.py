@@ -0,0 +1,125 @@
+# compression.py
+import zlib
+from flask import request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip and deflate are always available
+    brotli = None
+
+
+class _Encoder:
+    """An incremental compressor with one interface for every encoding."""
+
+    def __init__(self, encoding, level, brotli_quality):
+        if encoding == 'br':
+            self._compressor = brotli.Compressor(quality=brotli_quality)
+            self.compress, self._finish = self._compressor.process, self._compressor.finish
+            self._flush = self._compressor.flush
+        else:
+            # 'gzip' wants the gzip container, 'deflate' the zlib one (RFC 9110).
+            wbits = zlib.MAX_WBITS | 16 if encoding == 'gzip' else zlib.MAX_WBITS
+            self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+            self.compress, self._finish = self._compressor.compress, self._compressor.flush
+            self._flush = lambda: self._compressor.flush(zlib.Z_SYNC_FLUSH)
+
+    def flush(self):
+        """Everything compressed so far, decodable without the rest of the stream."""
+        return self._flush()
+
+    def finish(self):
+        return self._finish()
+
+
+def encode(data, encoding, level=6, brotli_quality=4):
+    """Compress ``data`` in one go, exactly as the middleware would."""
+    encoder = _Encoder(encoding, level, brotli_quality)
+    return encoder.compress(data) + encoder.finish()
+
+
+class Compressor:
+    """Compresses responses for clients that accept it.
+
+    The encoding is negotiated from ``Accept-Encoding`` (the client's
+    q-values first, then the order of COMPRESS_ALGORITHMS; ``br`` only when
+    the brotli package is installed). Buffered responses below
+    COMPRESS_MIN_SIZE are sent as they are. Streamed responses are
+    compressed chunk by chunk as the server pulls them, each chunk flushed
+    so it reaches the client without waiting for the next. Responses that already carry a Content-Encoding, such as
+    the prebuilt static content, are left alone.
+    """
+
+    def __init__(self, app=None):
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        config = app.config
+        self.enabled = config['COMPRESS_ENABLED']
+        self.min_size = config['COMPRESS_MIN_SIZE']
+        self.level = config['COMPRESS_LEVEL']
+        self.brotli_quality = config['COMPRESS_BROTLI_QUALITY']
+        self.mimetypes = frozenset(config['COMPRESS_MIMETYPES'])
+        self.algorithms = [name for name in config['COMPRESS_ALGORITHMS'] if name != 'br' or brotli is not None]
+        app.extensions['compressor'] = self
+        if self.enabled:
+            app.after_request(self.after_request)
+
+    def negotiate(self):
+        accepted = request.accept_encodings
+        best, best_quality = None, 0
+        for name in self.algorithms:
+            quality = accepted[name]
+            if quality > best_quality:
+                best, best_quality = name, quality
+        return best
+
+    def _compressible(self, response):
+        if response.mimetype not in self.mimetypes or response.direct_passthrough:
+            return False
+        if response.status_code < 200 or response.status_code in (204, 206, 304):
+            return False
+        if 'Content-Encoding' in response.headers or 'no-transform' in response.cache_control:
+            return False
+        return True
+
+    def after_request(self, response):
+        if not self._compressible(response):
+            return response
+        # Bodies below the threshold are the same for every client, so they
+        # don't vary on Accept-Encoding either.
+        if not response.is_streamed and response.calculate_content_length() < self.min_size:
+            return response
+        response.vary.add('Accept-Encoding')
+        encoding = self.negotiate()
+        if encoding is None:
+            return response
+
+        if response.is_streamed:
+            response.response = self._stream(response.response, encoding)
+            response.headers.pop('Content-Length', None)
+        else:
+            response.set_data(encode(response.get_data(), encoding, self.level, self.brotli_quality))
+
+        response.headers['Content-Encoding'] = encoding
+        etag, weak = response.get_etag()
+        if etag and not weak:
+            # A strong validator names exact bytes; the compressed ones differ.
+            response.set_etag(f'{etag}-{encoding}')
+        return response
+
+    def _stream(self, chunks, encoding):
+        encoder = _Encoder(encoding, self.level, self.brotli_quality)
+        try:
+            for chunk in chunks:
+                if isinstance(chunk, str):
+                    chunk = chunk.encode()
+                if chunk:
+                    # Flushed per chunk, so the client gets each chunk when the
+                    # app yields it instead of when the compressor's buffer fills.
+                    yield encoder.compress(chunk) + encoder.flush()
+            yield encoder.finish()
+        finally:
+            close = getattr(chunks, 'close', None)
+            if close is not None:
+                close()
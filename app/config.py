@@ -4,6 +4,39 @@ class Config:
     SECRET_KEY = os.environ.get('SECRET_KEY') or 'your-secret-key'
     SQLALCHEMY_DATABASE_URI = os.environ.get('DATABASE_URL') or 'sqlite:///site.db'
     SQLALCHEMY_TRACK_MODIFICATIONS = False
+    # create_all() on boot suits development; ProductionConfig leaves the
+    # schema to `flask db upgrade`.
+    SCHEMA_AUTO_CREATE = os.environ.get('SCHEMA_AUTO_CREATE', 'true').lower() in ('true', '1')
+    # Initialize Mail and Migrate on first use instead of in every worker.
+    LAZY_EXTENSIONS = os.environ.get('LAZY_EXTENSIONS', 'false').lower() in ('true', '1')
+    # Views marked @replica_reads read from this bind; a user who wrote in the
+    # last READ_YOUR_WRITES_SECONDS is kept on the primary.
+    DATABASE_REPLICA_URL = os.environ.get('DATABASE_REPLICA_URL')
+    SQLALCHEMY_BINDS = {'replica': DATABASE_REPLICA_URL} if DATABASE_REPLICA_URL else {}
+    READ_YOUR_WRITES_SECONDS = float(os.environ.get('READ_YOUR_WRITES_SECONDS') or 5)
+    READ_YOUR_WRITES_STORAGE_URI = os.environ.get('READ_YOUR_WRITES_STORAGE_URI')
+    # The sqlite:// storage is shared by every worker process on the host;
+    # use redis:// or memcached:// once the app runs on more than one.
+    RATELIMIT_STORAGE_URI = os.environ.get('RATELIMIT_STORAGE_URI') or 'sqlite:///ratelimit.db'
+    RATELIMIT_STRATEGY = os.environ.get('RATELIMIT_STRATEGY') or 'sliding-window-counter'
+    LOGIN_RATE_LIMIT = os.environ.get('LOGIN_RATE_LIMIT') or '10 per minute;100 per hour'
+    REGISTER_RATE_LIMIT = os.environ.get('REGISTER_RATE_LIMIT') or '5 per minute;20 per hour'
+    CONTACT_RATE_LIMIT = os.environ.get('CONTACT_RATE_LIMIT') or '5 per minute;20 per hour'
+    # 'sqlite' applies the SQLITE_* pragmas to every connection, 'server' the
+    # DB_POOL_* pool settings; 'auto' picks one from the URL and 'default'
+    # leaves SQLAlchemy's defaults alone.
+    DB_ENGINE_PROFILE = os.environ.get('DB_ENGINE_PROFILE') or 'auto'
+    SQLITE_JOURNAL_MODE = os.environ.get('SQLITE_JOURNAL_MODE') or 'wal'
+    SQLITE_SYNCHRONOUS = os.environ.get('SQLITE_SYNCHRONOUS') or 'normal'
+    SQLITE_MMAP_SIZE = int(os.environ.get('SQLITE_MMAP_SIZE') or 256 * 1024 * 1024)
+    SQLITE_CACHE_SIZE = int(os.environ.get('SQLITE_CACHE_SIZE') or -64000)  # negative means KiB
+    SQLITE_BUSY_TIMEOUT = int(os.environ.get('SQLITE_BUSY_TIMEOUT') or 5000)  # milliseconds
+    SQLITE_TEMP_STORE = os.environ.get('SQLITE_TEMP_STORE') or 'memory'
+    DB_POOL_SIZE = int(os.environ.get('DB_POOL_SIZE') or 10)
+    DB_MAX_OVERFLOW = int(os.environ.get('DB_MAX_OVERFLOW') or 20)
+    DB_POOL_TIMEOUT = int(os.environ.get('DB_POOL_TIMEOUT') or 30)
+    DB_POOL_RECYCLE = int(os.environ.get('DB_POOL_RECYCLE') or 1800)
+    DB_POOL_PRE_PING = os.environ.get('DB_POOL_PRE_PING', 'true').lower() in ('true', '1')
     MAIL_SERVER = os.environ.get('MAIL_SERVER') or 'smtp.gmail.com'
     MAIL_PORT = int(os.environ.get('MAIL_PORT') or 587)
     MAIL_USE_TLS = os.environ.get('MAIL_USE_TLS', 'true').lower() in ('true', '1')
@@ -11,8 +44,107 @@ class Config:
     MAIL_USERNAME = os.environ.get('EMAIL_USER')
     MAIL_PASSWORD = os.environ.get('EMAIL_PASS')
     MAIL_DEFAULT_SENDER = os.environ.get('MAIL_DEFAULT_SENDER')
+    OUTBOX_WORKERS = int(os.environ.get('OUTBOX_WORKERS') or 2)
+    OUTBOX_BATCH_SIZE = int(os.environ.get('OUTBOX_BATCH_SIZE') or 50)
+    OUTBOX_POLL_INTERVAL = float(os.environ.get('OUTBOX_POLL_INTERVAL') or 1.0)
+    OUTBOX_LEASE_SECONDS = int(os.environ.get('OUTBOX_LEASE_SECONDS') or 300)
+    OUTBOX_MAX_ATTEMPTS = int(os.environ.get('OUTBOX_MAX_ATTEMPTS') or 8)
+    OUTBOX_RETRY_BASE_SECONDS = int(os.environ.get('OUTBOX_RETRY_BASE_SECONDS') or 30)
+    OUTBOX_RETRY_MAX_SECONDS = int(os.environ.get('OUTBOX_RETRY_MAX_SECONDS') or 3600)
+    # Any werkzeug method string, e.g. 'scrypt:32768:8:1' or 'pbkdf2:sha256:600000'.
+    # Stored hashes made with a different method or cost are upgraded on login.
+    PASSWORD_HASH_METHOD = os.environ.get('PASSWORD_HASH_METHOD') or 'scrypt:32768:8:1'
+    PASSWORD_HASH_WORKERS = int(os.environ.get('PASSWORD_HASH_WORKERS') or 2)
+    PASSWORD_HASH_QUEUE_SIZE = int(os.environ.get('PASSWORD_HASH_QUEUE_SIZE') or 8)
+    PASSWORD_HASH_TIMEOUT = float(os.environ.get('PASSWORD_HASH_TIMEOUT') or 10)
     SECURITY_PASSWORD_SALT = os.environ.get('SECURITY_PASSWORD_SALT') or 'your-security-password-salt'
     JWT_SECRET_KEY = os.environ.get('JWT_SECRET_KEY')
+    # Endpoints marked @stateless (bearer-token API, public content) skip the
+    # cookie session and CSRF entirely; the lists adjust that per endpoint.
+    STATELESS_FAST_PATH = os.environ.get('STATELESS_FAST_PATH', 'true').lower() in ('true', '1')
+    STATELESS_ENDPOINTS = []
+    STATEFUL_ENDPOINTS = []
+    # List endpoints page with keyset cursors; deployments whose clients still
+    # expect the old unpaginated shape can opt back in (or pass ?legacy=1).
+    LEGACY_LIST_RESPONSES = os.environ.get('LEGACY_LIST_RESPONSES', 'false').lower() in ('true', '1')
+    # Accounts allowed to read the support inbox (/api/admin/messages).
+    ADMIN_EMAILS = [email.strip().lower() for email in os.environ.get('ADMIN_EMAILS', '').split(',') if email.strip()]
+    PAGE_SIZE_DEFAULT = int(os.environ.get('PAGE_SIZE_DEFAULT') or 50)
+    PAGE_SIZE_MAX = int(os.environ.get('PAGE_SIZE_MAX') or 500)
+    # Records from the app's loggers are queued and written as JSON by a
+    # background thread. LOG_SAMPLING maps logger names to the share of
+    # their sub-WARNING records kept; LOG_REDACT_FIELDS are masked wherever
+    # they appear in a record's arguments or extra fields.
+    LOG_LEVEL = os.environ.get('LOG_LEVEL') or 'INFO'
+    LOG_FORMAT = os.environ.get('LOG_FORMAT') or 'json'
+    LOG_FILE = os.environ.get('LOG_FILE')
+    LOG_ASYNC = os.environ.get('LOG_ASYNC', 'true').lower() in ('true', '1')
+    LOG_QUEUE_SIZE = int(os.environ.get('LOG_QUEUE_SIZE') or 10000)
+    LOG_SAMPLING = {}
+    LOG_REDACT_FIELDS = ['email', 'email_address', 'password', 'name', 'first_name', 'last_name',
+                         'message', 'phone_number', 'token', 'access_token', 'authorization']
+    # 'auto' encodes with orjson when it is installed, 'stdlib' never does.
+    JSON_ENCODER = os.environ.get('JSON_ENCODER') or 'auto'
+    METRICS_ENABLED = os.environ.get('METRICS_ENABLED', 'true').lower() in ('true', '1')
+    # /metrics names every endpoint and its traffic, so it is only served when
+    # METRICS_EXPOSE is set, and then, if METRICS_TOKEN is set, only with
+    # "Authorization: Bearer <token>" (Prometheus' bearer_token).
+    METRICS_EXPOSE = os.environ.get('METRICS_EXPOSE', 'false').lower() in ('true', '1')
+    METRICS_TOKEN = os.environ.get('METRICS_TOKEN')
+    # A request running one statement shape more often than this is reported
+    # as a likely N+1 (and fails outright when METRICS_N_PLUS_ONE_RAISE is set).
+    METRICS_N_PLUS_ONE_THRESHOLD = int(os.environ.get('METRICS_N_PLUS_ONE_THRESHOLD') or 10)
+    METRICS_N_PLUS_ONE_RAISE = False
+    # Responses of these types are compressed for clients that accept it;
+    # buffered ones only from COMPRESS_MIN_SIZE bytes. COMPRESS_LEVEL is the
+    # zlib level for gzip/deflate (1 fastest .. 9 smallest).
+    COMPRESS_ENABLED = os.environ.get('COMPRESS_ENABLED', 'true').lower() in ('true', '1')
+    COMPRESS_MIN_SIZE = int(os.environ.get('COMPRESS_MIN_SIZE') or 1024)
+    COMPRESS_LEVEL = int(os.environ.get('COMPRESS_LEVEL') or 6)
+    COMPRESS_BROTLI_QUALITY = int(os.environ.get('COMPRESS_BROTLI_QUALITY') or 4)
+    COMPRESS_ALGORITHMS = ['br', 'gzip', 'deflate']
+    COMPRESS_MIMETYPES = ['application/json', 'application/x-ndjson', 'text/csv', 'text/plain', 'text/html']
+    CONTENT_MAX_AGE = int(os.environ.get('CONTENT_MAX_AGE') or 3600)
+    CASH_FLOW_MAX_DAYS = int(os.environ.get('CASH_FLOW_MAX_DAYS') or 3660)
+    PROJECTION_MAX_MONTHS = int(os.environ.get('PROJECTION_MAX_MONTHS') or 600)
+    # Default projection scenarios, as offsets added to each plan's annual rate.
+    PROJECTION_SCENARIOS = [-0.01, 0.0, 0.01]
+    # Checking that an address's domain accepts mail needs DNS; disable it
+    # (syntax-only validation) where there is no network. Lookups are bounded
+    # by EMAIL_DNS_TIMEOUT and cached per domain.
+    EMAIL_CHECK_DELIVERABILITY = os.environ.get('EMAIL_CHECK_DELIVERABILITY', 'true').lower() in ('true', '1')
+    EMAIL_DNS_TIMEOUT = float(os.environ.get('EMAIL_DNS_TIMEOUT') or 2.0)
+    EMAIL_DOMAIN_CACHE_SIZE = int(os.environ.get('EMAIL_DOMAIN_CACHE_SIZE') or 4096)
+    EMAIL_DOMAIN_CACHE_TTL = int(os.environ.get('EMAIL_DOMAIN_CACHE_TTL') or 3600)
+    EMAIL_DOMAIN_FAILURE_TTL = int(os.environ.get('EMAIL_DOMAIN_FAILURE_TTL') or 60)
+    LOAN_ANNUAL_RATE = float(os.environ.get('LOAN_ANNUAL_RATE') or 0.12)
+    LOAN_TERM_CHOICES = [6, 12, 18, 24, 36, 48, 60]
+    LOAN_HISTORY_MONTHS = int(os.environ.get('LOAN_HISTORY_MONTHS') or 6)
+    # Largest share of monthly income a repayment may take and still be approved outright.
+    LOAN_MAX_PAYMENT_RATIO = float(os.environ.get('LOAN_MAX_PAYMENT_RATIO') or 0.35)
+    LOAN_SCORING_WORKERS = int(os.environ.get('LOAN_SCORING_WORKERS') or 2)
+    LOAN_SCORING_CHUNK_SIZE = int(os.environ.get('LOAN_SCORING_CHUNK_SIZE') or 5000)
+    BATCH_MAX_ENTRIES = int(os.environ.get('BATCH_MAX_ENTRIES') or 1000)
+
+
+class ProductionConfig(Config):
+    """For pre-forking servers; see wsgi.py."""
+    DEBUG = False
+    SCHEMA_AUTO_CREATE = os.environ.get('SCHEMA_AUTO_CREATE', 'false').lower() in ('true', '1')
+    LAZY_EXTENSIONS = os.environ.get('LAZY_EXTENSIONS', 'true').lower() in ('true', '1')
+
+
+class TestConfig(Config):
+    TESTING = True
+    SQLALCHEMY_DATABASE_URI = 'sqlite://'
+    WTF_CSRF_ENABLED = False
+    JWT_SECRET_KEY = 'test-jwt-secret-key-not-for-production'
+    RATELIMIT_STORAGE_URI = 'memory://'
+    PASSWORD_HASH_METHOD = 'pbkdf2:sha256:1000'
+    PASSWORD_HASH_WORKERS = 0
+    METRICS_N_PLUS_ONE_RAISE = True
+    EMAIL_CHECK_DELIVERABILITY = False
+    LOAN_SCORING_WORKERS = 0
 
 
 #authorization from google still a problem
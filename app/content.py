@@ -0,0 +1,102 @@
+# content.py
+import gzip
+import hashlib
+import json
+from flask import Response, request
+
+try:
+    import brotli
+except ImportError:  # optional: gzip is always available
+    brotli = None
+
+CONTENT = {
+    "about-us": {
+        "title": "ABOUT US",
+        "description": "Healthfin recognizes the burden of healthcare costs. We bridge the gap to affordability by offering flexible and affordable health insurance plans, along with expert advice and personalized support, aiming to provide value with competitive rates and flexible repayment options."
+    },
+    "mission": {
+        "title": "OUR MISSION",
+        "description": "To champion well-being by providing accessible, comprehensive health insurance and fostering a culture of preventative care for a healthier and more vibrant future."
+    },
+    "vision": {
+        "title": "OUR VISION",
+        "description": "We envision a future where healthy living is accessible to all. By connecting people with affordable and comprehensive health services, we empower individuals to live healthier, more fulfilling lives."
+    },
+    "message": {
+        "title": "OUR MESSAGE",
+        "description": "Healthfin is a health insurance company built on the foundation of empowering your well-being. We believe health insurance should be more than just a policy; it is the support you need to be an active partner in your journey to a healthier, happier you."
+    },
+    "contact-info": {
+        "email": "email@gmail.com",
+        "phone": "+254712345678"
+    },
+}
+
+BUNDLE = 'bundle'
+
+
+class _Entry:
+    """One payload, serialized and compressed once."""
+
+    def __init__(self, payload):
+        # Same bytes jsonify would produce outside debug mode.
+        self.identity = (json.dumps(payload, separators=(',', ':'), sort_keys=True) + '\n').encode()
+        self.digest = hashlib.sha256(self.identity).hexdigest()[:32]
+        self.encoded = {'gzip': gzip.compress(self.identity, compresslevel=9, mtime=0)}
+        if brotli is not None:
+            self.encoded['br'] = brotli.compress(self.identity, quality=11)
+
+    def etag(self, encoding=None):
+        # Each representation gets its own strong validator.
+        return f'"{self.digest}-{encoding}"' if encoding else f'"{self.digest}"'
+
+
+class ContentRegistry:
+    """Serves the static marketing content from prebuilt bytes.
+
+    Payloads are serialized, hashed and compressed at startup; a request only
+    negotiates an encoding and checks ``If-None-Match``.
+    """
+
+    def __init__(self, app=None, content=None):
+        self.content = content if content is not None else CONTENT
+        self.entries = {}
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.max_age = app.config['CONTENT_MAX_AGE']
+        self.entries = {name: _Entry(payload) for name, payload in self.content.items()}
+        self.entries[BUNDLE] = _Entry(self.content)
+        app.extensions['content_registry'] = self
+
+    def _matches(self, entry):
+        if_none_match = request.if_none_match
+        if if_none_match.star_tag:
+            return True
+        # If-None-Match uses weak comparison, so any representation's tag
+        # proves the client already has this version.
+        return any(tag.split('-', 1)[0] == entry.digest for tag in if_none_match.as_set(include_weak=True))
+
+    def _negotiate(self, entry):
+        accepted = request.accept_encodings
+        for encoding in ('br', 'gzip'):
+            if encoding in entry.encoded and accepted[encoding]:
+                return encoding
+        return None
+
+    def response(self, name):
+        entry = self.entries[name]
+        encoding = self._negotiate(entry)
+        headers = {
+            'ETag': entry.etag(encoding),
+            'Cache-Control': f'public, max-age={self.max_age}',
+            'Vary': 'Accept-Encoding',
+        }
+        if self._matches(entry):
+            return Response(status=304, headers=headers)
+
+        body = entry.encoded[encoding] if encoding else entry.identity
+        if encoding:
+            headers['Content-Encoding'] = encoding
+        return Response(body, mimetype='application/json', headers=headers)
@@ -0,0 +1,80 @@
+# engines.py
+from sqlalchemy import event
+from sqlalchemy.engine import make_url
+
+PROFILES = ('auto', 'sqlite', 'server', 'default')
+
+
+def resolve_profile(config):
+    """The engine profile to use: DB_ENGINE_PROFILE, with 'auto' picked from the URL."""
+    profile = config['DB_ENGINE_PROFILE']
+    if profile not in PROFILES:
+        raise ValueError(f"DB_ENGINE_PROFILE must be one of {', '.join(PROFILES)}, not {profile!r}")
+    if profile == 'auto':
+        backend = make_url(config['SQLALCHEMY_DATABASE_URI']).get_backend_name()
+        return 'sqlite' if backend == 'sqlite' else 'server'
+    return profile
+
+
+def engine_options(config):
+    """``create_engine`` keyword arguments for the configured profile."""
+    profile = resolve_profile(config)
+    if profile == 'server':
+        return {
+            'pool_size': config['DB_POOL_SIZE'],
+            'max_overflow': config['DB_MAX_OVERFLOW'],
+            'pool_timeout': config['DB_POOL_TIMEOUT'],
+            'pool_recycle': config['DB_POOL_RECYCLE'],
+            'pool_pre_ping': config['DB_POOL_PRE_PING'],
+        }
+    return {}
+
+
+def sqlite_pragmas(config, database):
+    """PRAGMA statements run on every new SQLite connection, in order."""
+    pragmas = [
+        f"PRAGMA busy_timeout = {int(config['SQLITE_BUSY_TIMEOUT'])}",
+        f"PRAGMA cache_size = {int(config['SQLITE_CACHE_SIZE'])}",
+        f"PRAGMA temp_store = {config['SQLITE_TEMP_STORE']}",
+    ]
+    if database not in (None, '', ':memory:'):
+        # WAL lets readers run alongside the single writer, and with it
+        # synchronous=NORMAL only fsyncs at checkpoints instead of every commit.
+        pragmas += [
+            f"PRAGMA journal_mode = {config['SQLITE_JOURNAL_MODE']}",
+            f"PRAGMA synchronous = {config['SQLITE_SYNCHRONOUS']}",
+            f"PRAGMA mmap_size = {int(config['SQLITE_MMAP_SIZE'])}",
+        ]
+    return pragmas
+
+
+def configure_engine_options(app):
+    """Merge the profile's options into SQLALCHEMY_ENGINE_OPTIONS; call before ``db.init_app``.
+
+    Options set explicitly in SQLALCHEMY_ENGINE_OPTIONS take precedence.
+    """
+    options = engine_options(app.config)
+    options.update(app.config.get('SQLALCHEMY_ENGINE_OPTIONS') or {})
+    app.config['SQLALCHEMY_ENGINE_OPTIONS'] = options
+
+
+def install_sqlite_pragmas(app, db):
+    """Apply the SQLite profile's pragmas to each connection; call after ``db.init_app``."""
+    if resolve_profile(app.config) != 'sqlite':
+        return
+
+    with app.app_context():
+        for engine in db.engines.values():
+            if engine.dialect.name != 'sqlite':
+                continue
+            pragmas = sqlite_pragmas(app.config, engine.url.database)
+
+            def on_connect(dbapi_connection, connection_record, pragmas=pragmas):
+                cursor = dbapi_connection.cursor()
+                try:
+                    for pragma in pragmas:
+                        cursor.execute(pragma)
+                finally:
+                    cursor.close()
+
+            event.listen(engine, 'connect', on_connect)
@@ -0,0 +1,90 @@
+# export.py
+import csv
+import io
+import json
+from sqlalchemy import literal, null, select
+from . import db
+from .models import Income, Expense, Transaction
+
+EXPORT_COLUMNS = ('kind', 'id', 'date', 'amount', 'type', 'category')
+# Rows fetched per round trip from the server-side cursor, and the approximate
+# number of bytes buffered before a chunk is handed to the WSGI server.
+FETCH_SIZE = 1000
+CHUNK_BYTES = 64 * 1024
+
+
+def history_statements(user_id):
+    return [
+        select(literal('income').label('kind'), Income.id, Income.date.label('date'), Income.amount,
+               null().label('type'), Income.category)
+        .where(Income.user_id == user_id).order_by(Income.date, Income.id),
+        select(literal('expense').label('kind'), Expense.id, Expense.date.label('date'), Expense.amount,
+               null().label('type'), Expense.category)
+        .where(Expense.user_id == user_id).order_by(Expense.date, Expense.id),
+        select(literal('transaction').label('kind'), Transaction.id, Transaction.timestamp.label('date'),
+               Transaction.amount, Transaction.type, null().label('category'))
+        .where(Transaction.user_id == user_id).order_by(Transaction.timestamp, Transaction.id),
+    ]
+
+
+def iter_history(user_id):
+    """Yield every finance row for a user without materialising the result.
+
+    ``yield_per`` turns on ``stream_results`` so rows come off a server-side
+    cursor ``FETCH_SIZE`` at a time; nothing is added to the identity map.
+    """
+    for stmt in history_statements(user_id):
+        result = db.session.execute(stmt.execution_options(yield_per=FETCH_SIZE))
+        try:
+            for row in result:
+                yield row
+        finally:
+            result.close()
+
+
+def _chunked(lines):
+    buffer, size = [], 0
+    for line in lines:
+        buffer.append(line)
+        size += len(line)
+        if size >= CHUNK_BYTES:
+            yield ''.join(buffer)
+            buffer, size = [], 0
+    if buffer:
+        yield ''.join(buffer)
+
+
+def ndjson_chunks(rows):
+    def lines():
+        for row in rows:
+            yield json.dumps({
+                'kind': row.kind,
+                'id': row.id,
+                'date': row.date.isoformat(),
+                'amount': row.amount,
+                'type': row.type,
+                'category': row.category,
+            }) + '\n'
+    return _chunked(lines())
+
+
+def csv_chunks(rows):
+    def lines():
+        out = io.StringIO()
+        writer = csv.writer(out)
+        writer.writerow(EXPORT_COLUMNS)
+        for row in rows:
+            writer.writerow((row.kind, row.id, row.date.isoformat(), row.amount, row.type or '', row.category or ''))
+            yield out.getvalue()
+            out.seek(0)
+            out.truncate()
+        # Only reached with leftover output when there were no rows: the header.
+        if out.tell():
+            yield out.getvalue()
+    return _chunked(lines())
+
+
+EXPORT_FORMATS = {
+    'ndjson': ('application/x-ndjson', ndjson_chunks),
+    'csv': ('text/csv', csv_chunks),
+}
@@ -0,0 +1,112 @@
+# hashing.py
+import atexit
+import multiprocessing
+import os
+import threading
+from concurrent.futures import ProcessPoolExecutor, TimeoutError
+from concurrent.futures.process import BrokenProcessPool
+from werkzeug.security import DEFAULT_PBKDF2_ITERATIONS, check_password_hash, generate_password_hash
+
+
+def canonical_method(method):
+    """Expand a werkzeug method to the prefix it writes into stored hashes."""
+    parts = method.split(':')
+    if parts[0] == 'scrypt':
+        defaults = ['scrypt', '32768', '8', '1']
+    elif parts[0] == 'pbkdf2':
+        defaults = ['pbkdf2', 'sha256', str(DEFAULT_PBKDF2_ITERATIONS)]
+    else:
+        return method
+    return ':'.join(parts + defaults[len(parts):])
+
+
+class HashingBusy(Exception):
+    """Raised when the hashing queue is full, a hash times out or the pool
+    died; callers should answer 503."""
+
+
+class PasswordHasher:
+    """Runs password hashing and verification in a bounded process pool.
+
+    Hashing is deliberately slow CPU work; keeping it out of the request
+    thread's interpreter stops a login spike from starving cheap endpoints,
+    and the bounded queue turns overload into fast 503s instead of an
+    ever-growing backlog. With ``PASSWORD_HASH_WORKERS = 0`` everything runs
+    inline, which is what the tests use.
+    """
+
+    def __init__(self, app=None):
+        self._executor = None
+        self._executor_pid = None
+        self._lock = threading.Lock()
+        self._slots = None
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.method = canonical_method(app.config['PASSWORD_HASH_METHOD'])
+        self.workers = app.config['PASSWORD_HASH_WORKERS']
+        self.timeout = app.config['PASSWORD_HASH_TIMEOUT']
+        self._slots = threading.BoundedSemaphore(app.config['PASSWORD_HASH_QUEUE_SIZE'])
+        app.extensions['password_hasher'] = self
+
+    def _get_executor(self):
+        # Created lazily and per process, so an app preloaded before fork
+        # does not share a pool with its parent.
+        with self._lock:
+            if self._executor is None or self._executor_pid != os.getpid():
+                self._executor = ProcessPoolExecutor(self.workers,
+                                                     mp_context=multiprocessing.get_context('spawn'))
+                self._executor_pid = os.getpid()
+                atexit.register(self._executor.shutdown, wait=False, cancel_futures=True)
+            return self._executor
+
+    def _reset_executor(self, executor):
+        with self._lock:
+            if self._executor is executor:
+                self._executor = None
+        executor.shutdown(wait=False, cancel_futures=True)
+
+    def _run(self, fn, *args):
+        slots = self._slots
+        if not slots.acquire(blocking=False):
+            raise HashingBusy()
+        if not self.workers:
+            try:
+                return fn(*args)
+            finally:
+                slots.release()
+
+        executor = self._get_executor()
+        try:
+            future = executor.submit(fn, *args)
+        except BrokenProcessPool:
+            slots.release()
+            self._reset_executor(executor)
+            raise HashingBusy()
+        # The slot is held until the worker is done with the hash, not just
+        # until this request stops waiting, so timed-out hashes still count.
+        future.add_done_callback(lambda _: slots.release())
+        try:
+            return future.result(timeout=self.timeout)
+        except TimeoutError:
+            raise HashingBusy()
+        except BrokenProcessPool:
+            self._reset_executor(executor)
+            raise HashingBusy()
+
+    def hash(self, password):
+        return self._run(generate_password_hash, password, self.method)
+
+    def verify(self, password_hash, password):
+        return self._run(check_password_hash, password_hash, password)
+
+    def needs_rehash(self, password_hash):
+        """True if the stored hash was made with a different method or cost."""
+        return password_hash.split('$', 1)[0] != self.method
+
+    def shutdown(self):
+        with self._lock:
+            if self._executor is not None:
+                self._executor.shutdown(wait=True)
+                self._executor = None
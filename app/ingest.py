@@ -0,0 +1,63 @@
+# ingest.py
+from datetime import datetime, timezone
+from . import cashflow, db, rollups
+from .validators import validate_amount
+
+CATEGORY_MAX_LENGTH = 64
+
+
+def parse_entries(entries, now=None):
+    """Validate a batch of ``{amount, date?, category?}`` entries.
+
+    Returns ``(rows, errors)`` where ``errors`` is a list of
+    ``{"index": i, "errors": [...]}`` for every rejected entry.
+    """
+    now = now or datetime.utcnow()
+    rows, errors = [], []
+    for index, entry in enumerate(entries):
+        if not isinstance(entry, dict):
+            errors.append({"index": index, "errors": ["Entry must be an object"]})
+            continue
+
+        entry_errors = validate_amount(entry.get('amount'))
+
+        date = now
+        if entry.get('date') is not None:
+            try:
+                date = datetime.fromisoformat(entry['date'])
+            except (TypeError, ValueError):
+                entry_errors.append("Invalid date format")
+            else:
+                # Dates are stored as naive UTC, like the server-side default.
+                if date.tzinfo is not None:
+                    date = date.astimezone(timezone.utc).replace(tzinfo=None)
+
+        category = entry.get('category')
+        if category is not None and (not isinstance(category, str) or len(category) > CATEGORY_MAX_LENGTH):
+            entry_errors.append("Invalid category")
+
+        if entry_errors:
+            errors.append({"index": index, "errors": entry_errors})
+        else:
+            rows.append({"amount": float(entry['amount']), "date": date, "category": category})
+    return rows, errors
+
+
+def insert_entries(model, user_id, rows):
+    """Insert validated rows with one executemany and fold them into the rollups.
+
+    Runs in the caller's transaction; the caller commits.
+    """
+    if not rows:
+        return
+    for row in rows:
+        row['user_id'] = user_id
+    db.session.execute(db.insert(model), rows)
+    cashflow.add_entries(user_id, model, ((row['date'], row['amount']) for row in rows))
+
+    total = sum(row['amount'] for row in rows)
+    latest = max(row['date'] for row in rows)
+    if model.__tablename__ == 'income':
+        rollups.apply_delta(user_id, income=total, income_count=len(rows), at=latest)
+    else:
+        rollups.apply_delta(user_id, expenses=total, expense_count=len(rows), at=latest)
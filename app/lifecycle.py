@@ -0,0 +1,53 @@
+# lifecycle.py
+import gc
+import os
+import threading
+from flask import current_app
+
+_deferred_lock = threading.Lock()
+
+
+def defer(app, name, init):
+    """Postpone ``init(app)`` until something calls :func:`require` for ``name``."""
+    app.extensions.setdefault('deferred', {})[name] = init
+
+
+def require(name, app=None):
+    """Run the deferred initializer for ``name`` once, if there is one."""
+    app = app or current_app._get_current_object()
+    deferred = app.extensions.get('deferred')
+    if not deferred or name not in deferred:
+        return
+    with _deferred_lock:
+        init = deferred.pop(name, None)
+        if init is not None:
+            init(app)
+
+
+def running_from_cli():
+    # The flask command sets this before it loads the app.
+    return os.environ.get('FLASK_RUN_FROM_CLI') == 'true'
+
+
+def preload(app, db):
+    """Prepare an app built in a pre-forking server's master process for its workers.
+
+    Pooled connections must not be shared across a fork, so the master's are
+    dropped now and each worker discards any it inherits without closing
+    them under the parent. Everything allocated so far is then frozen out of
+    the garbage collector, so collections in a worker do not touch (and copy)
+    the pages it shares with the master.
+    """
+    with app.app_context():
+        engines = list(db.engines.values())
+    for engine in engines:
+        engine.dispose()
+
+    def reset_pools():
+        for engine in engines:
+            engine.dispose(close=False)
+
+    os.register_at_fork(after_in_child=reset_pools)
+    gc.collect()
+    gc.freeze()
+    return app
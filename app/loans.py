@@ -0,0 +1,174 @@
+# loans.py
+import multiprocessing
+from collections import Counter, deque
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+import numpy as np
+from flask import current_app
+from sqlalchemy import bindparam, exists, func, select
+from . import db
+from .models import DailyCashFlow, Expense, Income, LoanApplication
+
+PENDING = 'pending'
+APPROVED = 'approved'
+REVIEW = 'review'
+DECLINED = 'declined'
+
+
+class CashFlowMissing(Exception):
+    """Raised when there are income or expense rows but no cash-flow buckets.
+
+    Scoring reads only the buckets, so every applicant would look like they
+    had no history; run ``flask rollups rebuild`` first.
+    """
+
+
+def monthly_payment(principal, annual_rate, months):
+    """Level payment repaying ``principal`` over ``months``; accepts arrays."""
+    principal = np.asarray(principal, dtype=float)
+    months = np.asarray(months, dtype=float)
+    rate = annual_rate / 12
+    if rate == 0:
+        return principal / months
+    return principal * rate / (1 - (1 + rate) ** -months)
+
+
+def repayment_schedule(principal, annual_rate, months):
+    """Month-by-month amortisation; the last payment absorbs rounding."""
+    payment = float(monthly_payment(principal, annual_rate, months))
+    rate = annual_rate / 12
+    balance = principal
+    schedule = []
+    for month in range(1, months + 1):
+        interest = balance * rate
+        repaid = balance if month == months else payment - interest
+        balance -= repaid
+        schedule.append({
+            "month": month,
+            "payment": round(repaid + interest, 2),
+            "interest": round(interest, 2),
+            "principal": round(repaid, 2),
+            "balance": round(max(balance, 0.0), 2),
+        })
+    return schedule
+
+
+def score(chunk, terms):
+    """Score a chunk of applications; pure, so it can run in a worker process.
+
+    ``chunk`` holds ``(application_id, estimated_cost, term_months, income,
+    expenses)`` tuples, the totals covering the last ``history_months``.
+    An application is approved when the payment fits both the free cash flow
+    and ``max_payment_ratio`` of income, sent to review when it only fits
+    the cash flow, and declined otherwise. Returns executemany parameters
+    for the UPDATE.
+    """
+    ids, costs, months, income, expenses = (np.array(column, dtype=float) for column in zip(*chunk))
+    payment = monthly_payment(costs, terms['annual_rate'], months)
+    monthly_income = income / terms['history_months']
+    free_cash = (income - expenses) / terms['history_months']
+    with np.errstate(divide='ignore', invalid='ignore'):
+        ratio = np.where(monthly_income > 0, payment / monthly_income, np.nan)
+
+    fits_cash = payment <= free_cash
+    status = np.where(fits_cash & (ratio <= terms['max_payment_ratio']), APPROVED,
+                      np.where(fits_cash, REVIEW, DECLINED))
+    total_interest = payment * months - costs
+    return [
+        {'b_id': int(ids[i]), 'status': str(status[i]), 'annual_rate': terms['annual_rate'],
+         'monthly_payment': round(float(payment[i]), 2), 'total_interest': round(float(total_interest[i]), 2),
+         'affordability_ratio': None if np.isnan(ratio[i]) else round(float(ratio[i]), 4)}
+        for i in range(len(ids))
+    ]
+
+
+def pending_chunks(chunk_size, since):
+    """Yield pending applications joined with cash flow, partitioned by user id.
+
+    Each chunk covers a contiguous user-id range holding about
+    ``chunk_size`` pending applications (a user's applications are never
+    split), so the cash-flow query for the range is a single index range
+    scan. History comes from the daily cash-flow buckets, which carry the
+    same totals as the raw income and expense rows.
+    """
+    last = 0
+    while True:
+        pending = (LoanApplication.status == PENDING, LoanApplication.user_id > last)
+        upper = db.session.execute(
+            select(LoanApplication.user_id).where(*pending)
+            .order_by(LoanApplication.user_id).offset(chunk_size - 1).limit(1)
+        ).scalar()
+        in_range = (LoanApplication.user_id <= upper,) if upper is not None else ()
+
+        applications = db.session.execute(
+            select(LoanApplication.id, LoanApplication.user_id, LoanApplication.estimated_cost,
+                   LoanApplication.term_months)
+            .where(*pending, *in_range)
+        ).all()
+        if not applications:
+            return
+        hi = max(application.user_id for application in applications)
+
+        flows = {
+            user_id: (income or 0.0, expenses or 0.0)
+            for user_id, income, expenses in db.session.execute(
+                select(DailyCashFlow.user_id, func.sum(DailyCashFlow.income), func.sum(DailyCashFlow.expenses))
+                .where(DailyCashFlow.user_id > last, DailyCashFlow.user_id <= hi, DailyCashFlow.day >= since)
+                .group_by(DailyCashFlow.user_id)
+            )
+        }
+        yield [(a.id, a.estimated_cost, a.term_months, *flows.get(a.user_id, (0.0, 0.0))) for a in applications]
+        if upper is None:
+            return
+        last = hi
+
+
+def score_pending(chunk_size=None, workers=None, now=None):
+    """Score every pending application; returns a Counter of decisions.
+
+    Chunks are loaded here and scored by a spawned process pool (inline
+    when LOAN_SCORING_WORKERS is 0), with at most two chunks per worker in
+    flight. Results are written back per chunk in their own transaction,
+    only for rows still pending. Raises CashFlowMissing, before scoring
+    anything, if the buckets have not been built for existing history.
+    """
+    if not db.session.execute(select(exists().select_from(DailyCashFlow))).scalar() and any(
+            db.session.execute(select(exists().select_from(model))).scalar() for model in (Income, Expense)):
+        raise CashFlowMissing()
+
+    config = current_app.config
+    chunk_size = chunk_size or config['LOAN_SCORING_CHUNK_SIZE']
+    workers = config['LOAN_SCORING_WORKERS'] if workers is None else workers
+    now = now or datetime.utcnow()
+    terms = {
+        'annual_rate': config['LOAN_ANNUAL_RATE'],
+        'history_months': config['LOAN_HISTORY_MONTHS'],
+        'max_payment_ratio': config['LOAN_MAX_PAYMENT_RATIO'],
+    }
+    since = (now - timedelta(days=round(30.4 * terms['history_months']))).date()
+
+    table = LoanApplication.__table__
+    update = table.update().where(table.c.id == bindparam('b_id'), table.c.status == PENDING)
+    counts = Counter()
+
+    def write(results):
+        for row in results:
+            row['scored_at'] = now
+            counts[row['status']] += 1
+        db.session.execute(update, results)
+        db.session.commit()
+
+    if workers == 0:
+        for chunk in pending_chunks(chunk_size, since):
+            write(score(chunk, terms))
+        return counts
+
+    in_flight = deque()
+    with ProcessPoolExecutor(workers, mp_context=multiprocessing.get_context('spawn')) as executor:
+        for chunk in pending_chunks(chunk_size, since):
+            in_flight.append(executor.submit(score, chunk, terms))
+            if len(in_flight) >= 2 * workers:
+                write(in_flight.popleft().result())
+        while in_flight:
+            write(in_flight.popleft().result())
+    return counts
@@ -0,0 +1,214 @@
+# logs.py
+import atexit
+import json
+import logging
+import logging.handlers
+import os
+import queue
+import random
+import re
+import sys
+from datetime import datetime, timezone
+
+REDACTED = '[REDACTED]'
+EMAIL_PATTERN = re.compile(r'[\w.+-]+@[\w-]+(\.[\w-]+)+')
+
+# Attributes every LogRecord has; anything else on a record came from ``extra=``.
+_RECORD_ATTRS = frozenset(logging.LogRecord('', 0, '', 0, '', (), None).__dict__) | {'message', 'asctime'}
+
+
+class RedactingFormatter(logging.Formatter):
+    """Formats in the listener thread, masking PII on the way out.
+
+    Values under any of ``redact`` keys are replaced wherever they appear in
+    the record's arguments or ``extra=`` fields, and email addresses are
+    masked in the final message.
+    """
+
+    def __init__(self, fmt=None, redact=(), **kwargs):
+        super().__init__(fmt, **kwargs)
+        self.redact_keys = frozenset(key.lower() for key in redact)
+
+    def redact(self, value):
+        if isinstance(value, dict):
+            return {key: REDACTED if str(key).lower() in self.redact_keys else self.redact(item)
+                    for key, item in value.items()}
+        if isinstance(value, (list, tuple)):
+            return type(value)(self.redact(item) for item in value)
+        return value
+
+    def message(self, record):
+        args = record.args
+        if isinstance(args, dict):
+            args = self.redact(args)
+        elif args:
+            args = tuple(self.redact(arg) for arg in args)
+        message = str(record.msg) % args if args else str(record.msg)
+        return EMAIL_PATTERN.sub(REDACTED, message)
+
+    def fields(self, record):
+        return {key: REDACTED if key.lower() in self.redact_keys else self.redact(value)
+                for key, value in record.__dict__.items() if key not in _RECORD_ATTRS}
+
+    def format(self, record):
+        record.message = self.message(record)
+        if self.usesTime():
+            record.asctime = self.formatTime(record, self.datefmt)
+        text = self.formatMessage(record)
+        if record.exc_info:
+            text = f'{text}\n{self.formatException(record.exc_info)}'
+        return text
+
+
+class JSONFormatter(RedactingFormatter):
+    """One JSON object per line; ``extra=`` fields become top-level keys."""
+
+    def format(self, record):
+        payload = {
+            'ts': datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec='milliseconds'),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': self.message(record),
+        }
+        payload.update(self.fields(record))
+        if record.exc_info:
+            payload['exception'] = self.formatException(record.exc_info)
+        return json.dumps(payload, default=str)
+
+
+class SamplingFilter(logging.Filter):
+    """Keeps a fraction of each logger's records below WARNING.
+
+    ``rates`` maps logger names to the share kept; the longest matching
+    prefix wins, so ``{'app': 0.1, 'app.outbox': 1.0}`` samples everything
+    except the outbox. Warnings and errors are always kept.
+    """
+
+    def __init__(self, rates):
+        super().__init__()
+        self.rates = dict(rates)
+        self._resolved = {}
+
+    def rate(self, name):
+        rate = self._resolved.get(name)
+        if rate is None:
+            rate, prefix = 1.0, name
+            while prefix:
+                if prefix in self.rates:
+                    rate = self.rates[prefix]
+                    break
+                prefix = prefix.rpartition('.')[0]
+            self._resolved[name] = rate
+        return rate
+
+    def filter(self, record):
+        if record.levelno >= logging.WARNING:
+            return True
+        rate = self.rate(record.name)
+        return rate >= 1 or random.random() < rate
+
+
+class _QueueHandler(logging.handlers.QueueHandler):
+    """Hands the record over as-is and never blocks the request thread.
+
+    The stock handler formats the message before queueing it; here that is
+    left to the listener. When the queue is full the record is counted and
+    dropped rather than waited on.
+    """
+
+    def __init__(self, log_queue, pipeline):
+        super().__init__(log_queue)
+        self.pipeline = pipeline
+
+    def prepare(self, record):
+        return record
+
+    def enqueue(self, record):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.pipeline.dropped += 1
+
+
+class _QueueListener(logging.handlers.QueueListener):
+
+    def enqueue_sentinel(self):
+        # The writer is still draining, so this waits for room at most briefly.
+        self.queue.put(self._sentinel)
+
+    def stop(self):
+        if self._thread is not None:
+            super().stop()
+
+
+class LogPipeline:
+    """Routes the ``app`` loggers through a queue to a background writer thread.
+
+    Request threads only create the record (and not even that below
+    LOG_LEVEL); filtering by sample rate is the only other work they do.
+    Formatting, redaction and I/O happen in the QueueListener's thread.
+    """
+
+    def __init__(self, app=None):
+        self.handler = None
+        self.listener = None
+        self.dropped = 0
+        self._forked_hook = False
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.stop()
+        config = app.config
+        redact = config['LOG_REDACT_FIELDS']
+        if config['LOG_FORMAT'] == 'json':
+            formatter = JSONFormatter(redact=redact)
+        else:
+            formatter = RedactingFormatter('%(asctime)s %(levelname)s %(name)s: %(message)s', redact=redact)
+        if config['LOG_FILE']:
+            target = logging.handlers.WatchedFileHandler(config['LOG_FILE'])
+        else:
+            target = logging.StreamHandler(sys.stderr)
+        target.setFormatter(formatter)
+
+        if config['LOG_ASYNC']:
+            self.queue = queue.Queue(config['LOG_QUEUE_SIZE'])
+            self.handler = _QueueHandler(self.queue, self)
+            self.listener = _QueueListener(self.queue, target, respect_handler_level=True)
+            self.listener.start()
+            if not self._forked_hook:
+                # The writer thread does not survive a fork; see lifecycle.preload.
+                os.register_at_fork(after_in_child=self._restart)
+                atexit.register(self.stop)
+                self._forked_hook = True
+        else:
+            self.handler = target
+        self.handler.addFilter(SamplingFilter(config['LOG_SAMPLING']))
+
+        logger = logging.getLogger(app.import_name)
+        logger.setLevel(config['LOG_LEVEL'])
+        logger.addHandler(self.handler)
+        logger.propagate = False
+        self.logger = logger
+        app.extensions['logs'] = self
+
+    def _restart(self):
+        if self.listener is None:
+            return
+        # The parent's queue lock may have been held mid-fork; start clean.
+        self.queue = queue.Queue(self.queue.maxsize)
+        self.handler.queue = self.queue
+        self.listener = _QueueListener(self.queue, *self.listener.handlers, respect_handler_level=True)
+        self.listener.start()
+
+    def stop(self):
+        """Flush queued records and detach from the logger."""
+        if self.listener is not None:
+            self.listener.stop()
+            for handler in self.listener.handlers:
+                handler.close()
+            self.listener = None
+        if self.handler is not None:
+            self.logger.removeHandler(self.handler)
+            self.handler.close()
+            self.handler = None
@@ -0,0 +1,209 @@
+# metrics.py
+import hmac
+import logging
+import re
+import threading
+import time
+from collections import Counter, defaultdict
+from flask import Response, current_app, g, has_request_context, request
+from flask.json.provider import JSONProvider
+from sqlalchemy import event
+
+logger = logging.getLogger(__name__)
+
+LATENCY_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+QUERY_COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50, 100)
+
+# Collapses "(?, ?, ?)" / "(%(p1)s, %(p2)s)" style expanded IN lists so that
+# statements differing only in list length share one shape.
+_PARAM_LIST = re.compile(r'(\?|%\([^)]*\)s|%s|:\w+)(\s*,\s*(\?|%\([^)]*\)s|%s|:\w+))+')
+
+
+class NPlusOneError(AssertionError):
+    """Raised (when METRICS_N_PLUS_ONE_RAISE is set) for repeated statement shapes."""
+
+
+def statement_shape(statement):
+    return _PARAM_LIST.sub(r'\1', ' '.join(statement.split()))
+
+
+class Histogram:
+
+    def __init__(self, buckets):
+        self.buckets = buckets
+        self.counts = [0] * len(buckets)
+        self.sum = 0.0
+        self.count = 0
+
+    def observe(self, value):
+        for i, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[i] += 1
+        self.sum += value
+        self.count += 1
+
+
+class _RequestStats:
+    __slots__ = ('started', 'queries', 'sql_time', 'serialization_time', 'shapes')
+
+    def __init__(self):
+        self.started = time.perf_counter()
+        self.queries = 0
+        self.sql_time = 0.0
+        self.serialization_time = 0.0
+        self.shapes = Counter()
+
+
+class _TimedJSONProvider(JSONProvider):
+    """Delegates to the app's JSON provider and times serialization."""
+
+    def __init__(self, app, inner):
+        super().__init__(app)
+        self.inner = inner
+
+    def _timed(self, fn, *args, **kwargs):
+        started = time.perf_counter()
+        try:
+            return fn(*args, **kwargs)
+        finally:
+            stats = g.get('_metrics') if has_request_context() else None
+            if stats is not None:
+                stats.serialization_time += time.perf_counter() - started
+
+    def dumps(self, obj, **kwargs):
+        return self._timed(self.inner.dumps, obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        return self.inner.loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        return self._timed(self.inner.response, *args, **kwargs)
+
+
+def _escape(value):
+    return str(value).replace('\\', '\\\\').replace('"', '\\"').replace('\n', '\\n')
+
+
+class Metrics:
+    """Per-endpoint request, SQL and serialization metrics for one process.
+
+    Hooks every SQLAlchemy engine and the Flask request lifecycle, and
+    serves the histograms in Prometheus text format at ``/metrics``.
+    """
+
+    HISTOGRAMS = (
+        ('request_duration_seconds', 'Total time spent handling the request.', LATENCY_BUCKETS),
+        ('sql_duration_seconds', 'Time spent executing SQL per request.', LATENCY_BUCKETS),
+        ('sql_queries_per_request', 'Number of SQL statements executed per request.', QUERY_COUNT_BUCKETS),
+        ('serialization_duration_seconds', 'Time spent serializing JSON per request.', LATENCY_BUCKETS),
+    )
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.reset()
+
+    def reset(self):
+        with self._lock:
+            self.histograms = {name: defaultdict(lambda buckets=buckets: Histogram(buckets))
+                               for name, _, buckets in self.HISTOGRAMS}
+            self.requests = Counter()
+            self.n_plus_one = Counter()
+
+    def init_app(self, app, db):
+        if not app.config['METRICS_ENABLED']:
+            return
+        app.extensions['metrics'] = self
+        app.json = _TimedJSONProvider(app, app.json)
+
+        with app.app_context():
+            for engine in db.engines.values():
+                event.listen(engine, 'before_cursor_execute', self._before_cursor_execute)
+                event.listen(engine, 'after_cursor_execute', self._after_cursor_execute)
+
+        app.before_request(self._before_request)
+        app.after_request(self._after_request)
+
+        if not app.config['METRICS_EXPOSE']:
+            return
+        expected = f"Bearer {app.config['METRICS_TOKEN']}".encode() if app.config['METRICS_TOKEN'] else None
+
+        def metrics_view():
+            if expected and not hmac.compare_digest(request.headers.get('Authorization', '').encode(), expected):
+                return {"error": "Unauthorized"}, 401
+            return self.render()
+        metrics_view.stateless = True
+        app.add_url_rule('/metrics', 'metrics', metrics_view)
+
+    # The start time lives on the statement's execution context, which is
+    # discarded with it: a statement that fails never reaches
+    # after_cursor_execute, and must not leave anything on the connection.
+    def _before_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        if context is not None:
+            context._metrics_query_start = time.perf_counter()
+
+    def _after_cursor_execute(self, conn, cursor, statement, parameters, context, executemany):
+        started = getattr(context, '_metrics_query_start', None)
+        if started is None:
+            return
+        elapsed = time.perf_counter() - started
+        stats = g.get('_metrics') if has_request_context() else None
+        if stats is not None:
+            stats.queries += 1
+            stats.sql_time += elapsed
+            stats.shapes[statement_shape(statement)] += 1
+
+    def _before_request(self):
+        if request.endpoint != 'metrics':
+            g._metrics = _RequestStats()
+
+    def _after_request(self, response):
+        stats = g.pop('_metrics', None)
+        if stats is None:
+            return response
+        endpoint = request.endpoint or 'unmatched'
+        total = time.perf_counter() - stats.started
+        with self._lock:
+            self.histograms['request_duration_seconds'][endpoint].observe(total)
+            self.histograms['sql_duration_seconds'][endpoint].observe(stats.sql_time)
+            self.histograms['sql_queries_per_request'][endpoint].observe(stats.queries)
+            self.histograms['serialization_duration_seconds'][endpoint].observe(stats.serialization_time)
+            self.requests[(endpoint, request.method, response.status_code)] += 1
+
+        threshold = current_app.config['METRICS_N_PLUS_ONE_THRESHOLD']
+        repeated = {shape: n for shape, n in stats.shapes.items() if n > threshold}
+        if repeated:
+            with self._lock:
+                self.n_plus_one[endpoint] += 1
+            shape, count = max(repeated.items(), key=lambda item: item[1])
+            message = f"Possible N+1 in {endpoint}: statement ran {count} times: {shape[:200]}"
+            if current_app.config['METRICS_N_PLUS_ONE_RAISE']:
+                raise NPlusOneError(message)
+            logger.warning(message)
+        return response
+
+    def render(self):
+        lines = []
+        with self._lock:
+            for name, help_text, _ in self.HISTOGRAMS:
+                metric = f'healthfin_{name}'
+                lines.append(f'# HELP {metric} {help_text}')
+                lines.append(f'# TYPE {metric} histogram')
+                for endpoint, histogram in sorted(self.histograms[name].items()):
+                    label = f'endpoint="{_escape(endpoint)}"'
+                    for bound, count in zip(histogram.buckets, histogram.counts):
+                        lines.append(f'{metric}_bucket{{{label},le="{bound}"}} {count}')
+                    lines.append(f'{metric}_bucket{{{label},le="+Inf"}} {histogram.count}')
+                    lines.append(f'{metric}_sum{{{label}}} {histogram.sum}')
+                    lines.append(f'{metric}_count{{{label}}} {histogram.count}')
+
+            lines.append('# HELP healthfin_requests_total Requests handled, by endpoint, method and status.')
+            lines.append('# TYPE healthfin_requests_total counter')
+            for (endpoint, method, status), count in sorted(self.requests.items()):
+                lines.append(f'healthfin_requests_total{{endpoint="{_escape(endpoint)}",'
+                             f'method="{method}",status="{status}"}} {count}')
+
+            lines.append('# HELP healthfin_n_plus_one_total Requests that repeated one statement shape too often.')
+            lines.append('# TYPE healthfin_n_plus_one_total counter')
+            for endpoint, count in sorted(self.n_plus_one.items()):
+                lines.append(f'healthfin_n_plus_one_total{{endpoint="{_escape(endpoint)}"}} {count}')
+        return Response('\n'.join(lines) + '\n', mimetype='text/plain; version=0.0.4')
@@ -11,20 +11,37 @@ class User(db.Model):
     loans = db.relationship('LoanApplication', backref='applicant', lazy=True)
     incomes = db.relationship('Income', backref='owner', lazy=True)
     expenses = db.relationship('Expense', backref='owner', lazy=True)
+    enrollments = db.relationship('SavingPlanEnrollment', backref='owner', lazy=True)
 
 class Income(db.Model):
+    __table_args__ = (
+        # (user_id, date, id) serves per-user listings ordered by date; amount
+        # is carried along so per-user SUM(amount) never touches the table.
+        db.Index('ix_income_user_id_date', 'user_id', 'date', 'id', 'amount'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    category = db.Column(db.String(64), nullable=True)
 
 class Expense(db.Model):
+    __table_args__ = (
+        db.Index('ix_expense_user_id_date', 'user_id', 'date', 'id', 'amount'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     amount = db.Column(db.Float, nullable=False)
     date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    category = db.Column(db.String(64), nullable=True)
 
 class Savings(db.Model):
+    __table_args__ = (
+        db.Index('ix_savings_user_id', 'user_id', unique=True),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     balance = db.Column(db.Float, nullable=False, default=0.0)
@@ -34,9 +51,33 @@ class SavingPlan(db.Model):
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(64), nullable=False)
     description = db.Column(db.String(128), nullable=False)
+    # Nominal annual rate, compounded monthly (0.05 = 5%).
+    annual_rate = db.Column(db.Float, nullable=False, default=0.0)
+    # How often the enrolled contribution is paid in: weekly, monthly, quarterly or yearly.
+    contribution_frequency = db.Column(db.String(16), nullable=False, default='monthly')
+    # Contributions stop after this many months; None means open-ended.
+    term_months = db.Column(db.Integer, nullable=True)
+    enrollments = db.relationship('SavingPlanEnrollment', backref='plan', lazy=True)
+
+
+class SavingPlanEnrollment(db.Model):
+    __tablename__ = 'saving_plan_enrollment'
+    __table_args__ = (
+        db.Index('ix_saving_plan_enrollment_user_id_plan_id', 'user_id', 'plan_id', unique=True),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
+    plan_id = db.Column(db.Integer, db.ForeignKey('saving_plan.id'), nullable=False)
+    contribution = db.Column(db.Float, nullable=False)
+    enrolled_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
     
 class Transaction(db.Model):
+    __table_args__ = (
+        db.Index('ix_transaction_user_id_timestamp', 'user_id', 'timestamp', 'id', 'type', 'amount'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     type = db.Column(db.String(50), nullable=False)
@@ -44,6 +85,11 @@ class Transaction(db.Model):
     timestamp = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
 
 class LoanApplication(db.Model):
+    __table_args__ = (
+        db.Index('ix_loan_application_user_id_application_date', 'user_id', 'application_date'),
+        db.Index('ix_loan_application_status_user_id', 'status', 'user_id'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     user_id = db.Column(db.Integer, db.ForeignKey('user.id'), nullable=False)
     first_name = db.Column(db.String(100), nullable=False)
@@ -54,11 +100,75 @@ class LoanApplication(db.Model):
     estimated_cost = db.Column(db.Float, nullable=False)
     healthcare_provider = db.Column(db.String(255), nullable=False)
     application_date = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    term_months = db.Column(db.Integer, nullable=False, default=12)
+    # pending until the scoring job (see loans.py) sets approved, review or declined.
+    status = db.Column(db.String(16), nullable=False, default='pending')
+    annual_rate = db.Column(db.Float, nullable=True)
+    monthly_payment = db.Column(db.Float, nullable=True)
+    total_interest = db.Column(db.Float, nullable=True)
+    affordability_ratio = db.Column(db.Float, nullable=True)
+    scored_at = db.Column(db.DateTime, nullable=True)
 
 
 class ContactMessage(db.Model):
+    # Serves the support inbox's newest-first listing; text search goes
+    # through the contact_message_fts index (see search.py).
+    __table_args__ = (
+        db.Index('ix_contact_message_timestamp', 'timestamp'),
+    )
+
     id = db.Column(db.Integer, primary_key=True)
     name = db.Column(db.String(50), nullable=False)
     email = db.Column(db.String(120), nullable=False)
     message = db.Column(db.Text, nullable=False)
     timestamp = db.Column(db.DateTime, nullable=False, default=db.func.now())  # New field
+
+
+class FinancialSummary(db.Model):
+    # One row per user, maintained in the same transaction as every income,
+    # expense and savings write (see rollups.py) so the dashboard is a single
+    # primary-key read.
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    total_income = db.Column(db.Float, nullable=False, default=0.0)
+    income_count = db.Column(db.Integer, nullable=False, default=0)
+    total_expenses = db.Column(db.Float, nullable=False, default=0.0)
+    expense_count = db.Column(db.Integer, nullable=False, default=0)
+    savings_balance = db.Column(db.Float, nullable=False, default=0.0)
+    last_activity_at = db.Column(db.DateTime, nullable=True)
+
+
+class DailyCashFlow(db.Model):
+    # Per-user, per-UTC-day income and expense totals, kept in step with every
+    # income/expense insert (see cashflow.py) so charts aggregate a few
+    # hundred buckets instead of every raw row.
+    __tablename__ = 'daily_cash_flow'
+
+    user_id = db.Column(db.Integer, db.ForeignKey('user.id'), primary_key=True)
+    day = db.Column(db.Date, primary_key=True)
+    income = db.Column(db.Float, nullable=False, default=0.0)
+    income_count = db.Column(db.Integer, nullable=False, default=0)
+    expenses = db.Column(db.Float, nullable=False, default=0.0)
+    expense_count = db.Column(db.Integer, nullable=False, default=0)
+
+
+class EmailOutbox(db.Model):
+    # Outgoing mail is written here in the same transaction as the row that
+    # triggered it and delivered later by the outbox workers (see outbox.py).
+    __table_args__ = (
+        db.Index('ix_email_outbox_status_next_attempt_at', 'status', 'next_attempt_at'),
+        db.Index('ix_email_outbox_claimed_by', 'claimed_by'),
+    )
+
+    id = db.Column(db.Integer, primary_key=True)
+    subject = db.Column(db.String(255), nullable=False)
+    sender = db.Column(db.String(120), nullable=False)
+    recipients = db.Column(db.JSON, nullable=False)
+    body = db.Column(db.Text, nullable=False)
+    status = db.Column(db.String(16), nullable=False, default='pending')
+    attempts = db.Column(db.Integer, nullable=False, default=0)
+    next_attempt_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    claimed_by = db.Column(db.String(32), nullable=True)
+    claimed_until = db.Column(db.DateTime, nullable=True)
+    last_error = db.Column(db.Text, nullable=True)
+    created_at = db.Column(db.DateTime, nullable=False, default=datetime.utcnow)
+    sent_at = db.Column(db.DateTime, nullable=True)
@@ -0,0 +1,192 @@
+# outbox.py
+import logging
+import smtplib
+import threading
+import uuid
+from datetime import datetime, timedelta
+from flask import current_app
+from flask_mail import Message
+from sqlalchemy import and_, case, or_, select, update
+from . import db, mail
+from .lifecycle import require
+from .models import EmailOutbox
+
+logger = logging.getLogger(__name__)
+
+PENDING = 'pending'
+SENDING = 'sending'
+SENT = 'sent'
+DEAD = 'dead'
+
+# Errors that mean the SMTP connection itself is unusable, as opposed to a
+# single message being rejected.
+CONNECTION_ERRORS = (smtplib.SMTPServerDisconnected, ConnectionError, TimeoutError)
+
+
+def enqueue(subject, sender, recipients, body):
+    """Add a message to the outbox in the current transaction (no commit)."""
+    message = EmailOutbox(subject=subject, sender=sender, recipients=list(recipients), body=body,
+                          status=PENDING, next_attempt_at=datetime.utcnow())
+    db.session.add(message)
+    return message
+
+
+def _expired(now):
+    # Rows claimed by a worker that died before finishing (its lease ran out).
+    return and_(EmailOutbox.status == SENDING, EmailOutbox.claimed_until < now)
+
+
+def _due(now):
+    # Pending rows whose backoff has elapsed, plus expired leases.
+    return or_(and_(EmailOutbox.status == PENDING, EmailOutbox.next_attempt_at <= now), _expired(now))
+
+
+def claim_batch(limit=None):
+    """Atomically lease up to ``limit`` due messages to this caller.
+
+    The claim is a single conditional UPDATE tagged with a fresh token, so
+    concurrent workers (threads or processes) never receive the same row.
+    An expired lease counts as a failed attempt: a message that crashes or
+    hangs its worker is dead-lettered like any other rather than retried
+    forever.
+    """
+    config = current_app.config
+    limit = limit or config['OUTBOX_BATCH_SIZE']
+    now = datetime.utcnow()
+    token = uuid.uuid4().hex
+
+    dead = db.session.execute(
+        update(EmailOutbox)
+        .where(_expired(now), EmailOutbox.attempts + 1 >= config['OUTBOX_MAX_ATTEMPTS'])
+        .values(status=DEAD, attempts=EmailOutbox.attempts + 1, last_error='Lease expired',
+                claimed_by=None, claimed_until=None)
+        .execution_options(synchronize_session=False)
+    )
+    if dead.rowcount:
+        logger.error("%s outbox message(s) dead-lettered after their lease expired", dead.rowcount)
+
+    candidates = select(EmailOutbox.id).where(_due(now)).order_by(EmailOutbox.id).limit(limit)
+    db.session.execute(
+        update(EmailOutbox)
+        .where(EmailOutbox.id.in_(candidates.scalar_subquery()), _due(now))
+        .values(status=SENDING, claimed_by=token,
+                claimed_until=now + timedelta(seconds=config['OUTBOX_LEASE_SECONDS']),
+                attempts=case((EmailOutbox.status == SENDING, EmailOutbox.attempts + 1),
+                              else_=EmailOutbox.attempts))
+        .execution_options(synchronize_session=False)
+    )
+    db.session.commit()
+    return EmailOutbox.query.filter_by(claimed_by=token, status=SENDING).order_by(EmailOutbox.id).all()
+
+
+def _record_failure(row, error, now):
+    config = current_app.config
+    row.attempts += 1
+    row.last_error = str(error)[:1000]
+    row.claimed_by = None
+    row.claimed_until = None
+    if row.attempts >= config['OUTBOX_MAX_ATTEMPTS']:
+        row.status = DEAD
+        logger.error("Outbox message %s dead-lettered after %s attempts: %s", row.id, row.attempts, error)
+        return
+    delay = min(config['OUTBOX_RETRY_MAX_SECONDS'],
+                config['OUTBOX_RETRY_BASE_SECONDS'] * 2 ** (row.attempts - 1))
+    row.status = PENDING
+    row.next_attempt_at = now + timedelta(seconds=delay)
+
+
+def fail_batch(rows, error):
+    """Record a failed attempt for every row of a batch that was not sent."""
+    now = datetime.utcnow()
+    for row in rows:
+        if row.status == SENDING:
+            _record_failure(row, error, now)
+    db.session.commit()
+
+
+def deliver(rows, connection):
+    """Send a claimed batch over an open connection and commit the outcome once.
+
+    A connection-level error aborts the batch and is re-raised so the caller
+    can reconnect; the unsent rows are charged one attempt each.
+    """
+    for row in rows:
+        try:
+            connection.send(Message(subject=row.subject, sender=row.sender,
+                                    recipients=row.recipients, body=row.body))
+        except CONNECTION_ERRORS as e:
+            fail_batch(rows, e)
+            raise
+        except Exception as e:
+            _record_failure(row, e, datetime.utcnow())
+        else:
+            row.status = SENT
+            row.sent_at = datetime.utcnow()
+            row.claimed_by = None
+            row.claimed_until = None
+    db.session.commit()
+
+
+def drain(stop=None):
+    """Deliver due messages until none are left (or ``stop`` is set).
+
+    One SMTP connection is opened per run of consecutive non-empty batches
+    and reused for all of them. Returns the number of messages handled.
+    """
+    handled = 0
+    rows = claim_batch()
+    if rows:
+        require('mail')
+    while rows:
+        try:
+            with mail.connect() as connection:
+                while rows:
+                    deliver(rows, connection)
+                    handled += len(rows)
+                    if stop is not None and stop.is_set():
+                        return handled
+                    rows = claim_batch()
+        except Exception as e:
+            # Connecting failed (refused, TLS or login error) or the connection
+            # dropped mid-batch; rows already sent or failed are left alone.
+            logger.exception("Outbox SMTP connection failed")
+            db.session.rollback()
+            fail_batch(rows, e)
+            return handled
+    return handled
+
+
+class OutboxWorkerPool:
+    """A set of threads that keep draining the outbox until stopped."""
+
+    def __init__(self, app, workers=None, poll_interval=None):
+        self.app = app
+        self.workers = workers or app.config['OUTBOX_WORKERS']
+        self.poll_interval = poll_interval if poll_interval is not None else app.config['OUTBOX_POLL_INTERVAL']
+        self._stop = threading.Event()
+        self._threads = []
+
+    def _run(self):
+        with self.app.app_context():
+            while not self._stop.is_set():
+                try:
+                    drain(self._stop)
+                except Exception:
+                    logger.exception("Outbox worker error")
+                    db.session.rollback()
+                finally:
+                    db.session.remove()
+                self._stop.wait(self.poll_interval)
+
+    def start(self):
+        for n in range(self.workers):
+            thread = threading.Thread(target=self._run, name=f'outbox-worker-{n}', daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self, timeout=None):
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout)
+        self._threads = []
@@ -0,0 +1,177 @@
+# pagination.py
+import base64
+import json
+from datetime import datetime
+from sqlalchemy import literal, null, select, tuple_, union_all
+from . import db
+from .models import Income, Expense, Transaction
+
+FINANCE_KINDS = ('income', 'expense', 'transaction')
+
+
+class PageParams:
+    """Parsed ``limit``/``before``/``after``/``type``/``start``/``end`` arguments.
+
+    Raises ValueError with a client-facing message on bad input.
+    """
+
+    def __init__(self, args, default_limit, max_limit):
+        try:
+            self.limit = int(args.get('limit', default_limit))
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if not 1 <= self.limit <= max_limit:
+            raise ValueError(f"limit must be between 1 and {max_limit}")
+
+        if args.get('before') and args.get('after'):
+            raise ValueError("before and after are mutually exclusive")
+        self.before = decode_cursor(args['before']) if args.get('before') else None
+        self.after = decode_cursor(args['after']) if args.get('after') else None
+
+        self.types = [t for t in args.get('type', '').split(',') if t] or None
+        self.start = parse_date(args.get('start'), 'start')
+        self.end = parse_date(args.get('end'), 'end')
+
+
+def parse_date(value, name):
+    if not value:
+        return None
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        raise ValueError(f"{name} must be an ISO 8601 date")
+
+
+def encode_cursor(*key):
+    raw = json.dumps([k.isoformat() if isinstance(k, datetime) else k for k in key])
+    return base64.urlsafe_b64encode(raw.encode()).decode().rstrip('=')
+
+
+def decode_key(cursor):
+    """The raw JSON key inside a cursor; raises ValueError if it is not one."""
+    raw = base64.urlsafe_b64decode(cursor + '=' * (-len(cursor) % 4))
+    key = json.loads(raw)
+    if not isinstance(key, list):
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def is_row_id(value):
+    """True for a JSON integer; ``true``/``false`` decode to bools, which are ints too."""
+    return isinstance(value, int) and not isinstance(value, bool)
+
+
+def decode_cursor(cursor):
+    try:
+        key = decode_key(cursor)
+        # Every page key is (date, id) or (date, id, kind); callers check the
+        # exact length. The parts are bound straight into SQL, so anything of
+        # the wrong type has to stop here rather than reach the driver.
+        if len(key) < 2 or not is_row_id(key[1]) or any(kind not in FINANCE_KINDS for kind in key[2:]):
+            raise ValueError("Invalid cursor")
+        return [datetime.fromisoformat(key[0])] + key[1:]
+    except (ValueError, TypeError):
+        raise ValueError("Invalid cursor")
+
+
+def _keyset_branch(columns, date_col, id_col, user_col, user_id, params, descending, per_branch_limit):
+    """One index-friendly SELECT over a single table.
+
+    The keyset bound here is inclusive on ``(date, id)``; the exact bound
+    (which may also involve the kind tie-breaker) is applied by the caller.
+    This keeps every branch a bounded range read on its (user_id, date, id)
+    index.
+    """
+    stmt = select(*columns).where(user_col == user_id)
+    if params.start is not None:
+        stmt = stmt.where(date_col >= params.start)
+    if params.end is not None:
+        stmt = stmt.where(date_col < params.end)
+    cursor = params.before if descending else params.after
+    if cursor is not None:
+        bound = tuple_(date_col, id_col)
+        key = tuple_(cursor[0], cursor[1])
+        stmt = stmt.where(bound <= key if descending else bound >= key)
+    order = (date_col.desc(), id_col.desc()) if descending else (date_col.asc(), id_col.asc())
+    return stmt.order_by(*order).limit(per_branch_limit)
+
+
+def _page(rows, params, descending, key_of):
+    has_more = len(rows) > params.limit
+    rows = rows[:params.limit]
+    if not descending:
+        rows.reverse()
+
+    next_cursor = prev_cursor = None
+    if rows:
+        if descending:
+            next_cursor = encode_cursor(*key_of(rows[-1])) if has_more else None
+            prev_cursor = encode_cursor(*key_of(rows[0])) if params.before else None
+        else:
+            next_cursor = encode_cursor(*key_of(rows[-1]))
+            prev_cursor = encode_cursor(*key_of(rows[0])) if has_more else None
+    return rows, next_cursor, prev_cursor
+
+
+def finances_page(user_id, params):
+    """Newest-first page over a user's income, expenses and transactions.
+
+    Rows are ordered by ``(date, id, kind)``; ``kind`` only breaks ties
+    between tables whose ids collide.
+    """
+    kinds = params.types or list(FINANCE_KINDS)
+    unknown = set(kinds) - set(FINANCE_KINDS)
+    if unknown:
+        raise ValueError(f"Unknown type: {', '.join(sorted(unknown))}")
+
+    descending = params.after is None
+    per_branch_limit = params.limit + 2
+    sources = {
+        'income': (Income, Income.date, null()),
+        'expense': (Expense, Expense.date, null()),
+        'transaction': (Transaction, Transaction.timestamp, Transaction.type),
+    }
+    branches = []
+    for kind in kinds:
+        model, date_col, type_col = sources[kind]
+        columns = (literal(kind).label('kind'), model.id.label('id'), model.amount.label('amount'),
+                   type_col.label('type'), date_col.label('date'))
+        branch = _keyset_branch(columns, date_col, model.id, model.user_id, user_id,
+                                params, descending, per_branch_limit)
+        branches.append(select(branch.subquery()))
+
+    combined = union_all(*branches).subquery() if len(branches) > 1 else branches[0].subquery()
+    key = tuple_(combined.c.date, combined.c.id, combined.c.kind)
+    stmt = select(combined)
+    cursor = params.before if descending else params.after
+    if cursor is not None:
+        if len(cursor) != 3:
+            raise ValueError("Invalid cursor")
+        bound = tuple_(*cursor)
+        stmt = stmt.where(key < bound if descending else key > bound)
+    if descending:
+        stmt = stmt.order_by(combined.c.date.desc(), combined.c.id.desc(), combined.c.kind.desc())
+    else:
+        stmt = stmt.order_by(combined.c.date.asc(), combined.c.id.asc(), combined.c.kind.asc())
+
+    rows = db.session.execute(stmt.limit(params.limit + 1)).all()
+    return _page(rows, params, descending, lambda row: (row.date, row.id, row.kind))
+
+
+def savings_history_page(user_id, params):
+    """Newest-first page over a user's savings transactions, keyed on ``(timestamp, id)``."""
+    descending = params.after is None
+    columns = (Transaction.id, Transaction.amount, Transaction.type, Transaction.timestamp)
+    stmt = _keyset_branch(columns, Transaction.timestamp, Transaction.id, Transaction.user_id,
+                          user_id, params, descending, params.limit + 2)
+    if params.types:
+        stmt = stmt.where(Transaction.type.in_(params.types))
+    cursor = params.before if descending else params.after
+    if cursor is not None:
+        if len(cursor) != 2:
+            raise ValueError("Invalid cursor")
+        key = tuple_(Transaction.timestamp, Transaction.id)
+        stmt = stmt.where(key < tuple_(*cursor) if descending else key > tuple_(*cursor))
+
+    rows = db.session.execute(stmt.limit(params.limit + 1)).all()
+    return _page(rows, params, descending, lambda row: (row.timestamp, row.id))
@@ -0,0 +1,66 @@
+# postings.py
+from datetime import datetime
+from sqlalchemy import select
+from . import db, rollups
+from .models import Savings, Transaction
+
+DEPOSIT = 'deposit'
+WITHDRAW = 'withdraw'
+
+
+class AccountNotFound(Exception):
+    pass
+
+
+class InsufficientFunds(Exception):
+    pass
+
+
+def deposit(user_id, amount, at=None):
+    """Credit a user's savings, creating the account on first deposit.
+
+    The balance change is a single upsert evaluated by the database
+    (``balance = balance + :amount``), so concurrent postings never lose an
+    update. The ledger row and rollup delta join the same transaction; the
+    caller commits.
+    """
+    table = Savings.__table__
+    insert = rollups.dialect_insert()
+    if insert is not None:
+        db.session.execute(
+            insert(table).values(user_id=user_id, balance=amount)
+            .on_conflict_do_update(index_elements=[table.c.user_id],
+                                   set_={'balance': table.c.balance + amount})
+        )
+    else:
+        result = db.session.execute(
+            table.update().where(table.c.user_id == user_id).values(balance=table.c.balance + amount))
+        if result.rowcount == 0:
+            db.session.execute(table.insert().values(user_id=user_id, balance=amount))
+    _record(user_id, DEPOSIT, amount, at)
+
+
+def withdraw(user_id, amount, at=None):
+    """Debit a user's savings if, and only if, the balance covers it.
+
+    The guard lives in the UPDATE's WHERE clause, so the check and the debit
+    are one atomic step. Raises AccountNotFound or InsufficientFunds when no
+    row was updated; the caller rolls back.
+    """
+    table = Savings.__table__
+    result = db.session.execute(
+        table.update()
+        .where(table.c.user_id == user_id, table.c.balance >= amount)
+        .values(balance=table.c.balance - amount)
+    )
+    if result.rowcount == 0:
+        exists = db.session.execute(select(table.c.id).where(table.c.user_id == user_id)).first()
+        raise InsufficientFunds() if exists else AccountNotFound()
+    _record(user_id, WITHDRAW, -amount, at)
+
+
+def _record(user_id, kind, signed_amount, at):
+    at = at or datetime.utcnow()
+    db.session.execute(Transaction.__table__.insert().values(
+        user_id=user_id, type=kind, amount=abs(signed_amount), timestamp=at))
+    rollups.apply_delta(user_id, savings=signed_amount, at=at)
@@ -0,0 +1,87 @@
+# projections.py
+import numpy as np
+from sqlalchemy import func, select
+from . import db
+from .models import SavingPlan, SavingPlanEnrollment, Savings
+
+PERIODS_PER_YEAR = {'weekly': 52, 'monthly': 12, 'quarterly': 4, 'yearly': 1}
+
+
+def contribution_schedule(contributions, frequencies, term_months, months):
+    """Amount paid in at the end of each month, shape ``(rows, months)``.
+
+    Weekly contributions are spread evenly over the months; quarterly and
+    yearly ones land every 3rd or 12th month. Nothing is paid in after a
+    plan's ``term_months``.
+    """
+    contributions = np.asarray(contributions, dtype=float)
+    per_year = np.array([PERIODS_PER_YEAR[frequency] for frequency in frequencies], dtype=float)
+    terms = np.array([months if term is None else term for term in term_months], dtype=float)
+    month = np.arange(1, months + 1)
+
+    every = np.maximum(12 // per_year, 1)
+    per_payment = np.where(per_year > 12, contributions * per_year / 12, contributions)
+    due = (month[None, :] % every[:, None] == 0) & (month[None, :] <= terms[:, None])
+    return np.where(due, per_payment[:, None], 0.0)
+
+
+def project(balances, annual_rates, schedule, rate_offsets):
+    """End-of-month balances, shape ``(rows, scenarios, months)``.
+
+    Each scenario shifts every row's annual rate by one of ``rate_offsets``.
+    Interest compounds monthly; with growth factor ``g`` the balance after
+    month ``t`` is ``g**t * (B0 + sum(c_k / g**k for k <= t))``, so a single
+    cumulative sum covers every horizon at once.
+    """
+    balances = np.asarray(balances, dtype=float)
+    monthly = (np.asarray(annual_rates, dtype=float)[:, None] + np.asarray(rate_offsets, dtype=float)[None, :]) / 12
+    if np.any(monthly <= -1):
+        raise ValueError("rates must stay above -100% a month")
+    months = schedule.shape[1]
+    growth = (1 + monthly)[:, :, None] ** np.arange(1, months + 1)
+    return growth * (balances[:, None, None] + np.cumsum(schedule[:, None, :] / growth, axis=-1))
+
+
+def user_projection(user_id, months, rate_offsets):
+    """Project the user's savings balance under each plan they are enrolled in."""
+    balance = db.session.execute(select(Savings.balance).filter_by(user_id=user_id)).scalar() or 0.0
+    rows = db.session.execute(
+        select(SavingPlan.id, SavingPlan.name, SavingPlan.annual_rate, SavingPlan.contribution_frequency,
+               SavingPlan.term_months, SavingPlanEnrollment.contribution)
+        .join(SavingPlanEnrollment, SavingPlanEnrollment.plan_id == SavingPlan.id)
+        .where(SavingPlanEnrollment.user_id == user_id)
+        .order_by(SavingPlan.id)
+    ).all()
+
+    curves = np.empty((0, len(rate_offsets), months))
+    if rows:
+        schedule = contribution_schedule([r.contribution for r in rows], [r.contribution_frequency for r in rows],
+                                         [r.term_months for r in rows], months)
+        curves = project([balance] * len(rows), [r.annual_rate for r in rows], schedule, rate_offsets)
+    return balance, [
+        {"plan_id": r.id, "name": r.name, "annual_rate": r.annual_rate, "contribution": r.contribution,
+         "contribution_frequency": r.contribution_frequency, "balances": np.round(curve, 2).tolist()}
+        for r, curve in zip(rows, curves)
+    ]
+
+
+def project_all(months, rate_offsets, chunk_size=2000):
+    """Project every enrollment in one streaming pass over the table.
+
+    Yields ``(user_ids, plan_ids, curves)`` per chunk of ``chunk_size``
+    enrollments, with ``curves`` shaped ``(chunk, scenarios, months)``;
+    memory stays bounded by the chunk, not the number of users.
+    """
+    stmt = (
+        select(SavingPlanEnrollment.user_id, SavingPlanEnrollment.plan_id, SavingPlanEnrollment.contribution,
+               SavingPlan.annual_rate, SavingPlan.contribution_frequency, SavingPlan.term_months,
+               func.coalesce(Savings.balance, 0.0))
+        .join(SavingPlan, SavingPlan.id == SavingPlanEnrollment.plan_id)
+        .outerjoin(Savings, Savings.user_id == SavingPlanEnrollment.user_id)
+        .order_by(SavingPlanEnrollment.id)
+        .execution_options(yield_per=chunk_size)
+    )
+    for chunk in db.session.execute(stmt).partitions():
+        user_ids, plan_ids, contributions, rates, frequencies, terms, balances = zip(*chunk)
+        schedule = contribution_schedule(contributions, frequencies, terms, months)
+        yield np.array(user_ids), np.array(plan_ids), project(balances, rates, schedule, rate_offsets)
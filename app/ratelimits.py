@@ -0,0 +1,177 @@
+# ratelimits.py
+import os
+import sqlite3
+import threading
+import time
+import urllib.parse
+from math import floor
+from flask import current_app
+from limits.errors import ConfigurationError
+from limits.storage import Storage
+from limits.storage.base import SlidingWindowCounterSupport, TimestampedSlidingWindow
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS ratelimit_counter (
+    key TEXT PRIMARY KEY,
+    count INTEGER NOT NULL,
+    expiry REAL NOT NULL
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS ix_ratelimit_counter_expiry ON ratelimit_counter (expiry);
+"""
+
+# Start a new count when the stored one has expired, otherwise add to it; the
+# expiry is only set by the hit that starts a window.
+_INCR = """
+INSERT INTO ratelimit_counter (key, count, expiry) VALUES (:key, :amount, :expiry)
+ON CONFLICT (key) DO UPDATE SET
+    count = CASE WHEN expiry <= :now THEN excluded.count ELSE count + excluded.count END,
+    expiry = CASE WHEN expiry <= :now THEN excluded.expiry ELSE expiry END
+RETURNING count
+"""
+
+
+class SQLiteStorage(Storage, SlidingWindowCounterSupport, TimestampedSlidingWindow):
+    """``limits`` storage in a WAL-mode SQLite file shared by every process on the host.
+
+    Selected with ``RATELIMIT_STORAGE_URI = 'sqlite:///path/to/ratelimit.db'``
+    (four slashes for an absolute path, as with SQLAlchemy). Each check runs
+    in one ``BEGIN IMMEDIATE`` transaction, so concurrent workers can never
+    both take the last slot of a window. Expired counters are deleted at most
+    every ``purge_interval`` seconds, which keeps keys from clients that went
+    quiet from piling up.
+    """
+
+    STORAGE_SCHEME = ['sqlite']
+
+    def __init__(self, uri, wrap_exceptions=False, timeout=5.0, purge_interval=60.0, **options):
+        path = urllib.parse.unquote(urllib.parse.urlparse(uri).path)[1:]
+        if not path or path == ':memory:':
+            raise ConfigurationError('The sqlite rate limit storage needs a file path, e.g. sqlite:///ratelimit.db')
+        self.path = path
+        self.timeout = float(timeout)
+        self.purge_interval = float(purge_interval)
+        self._next_purge = 0.0
+        self._local = threading.local()
+        super().__init__(uri, wrap_exceptions=wrap_exceptions, **options)
+
+    @property
+    def base_exceptions(self):
+        return sqlite3.Error
+
+    def _connection(self):
+        # sqlite3 connections must not cross threads or survive a fork, so
+        # each thread of each process opens its own.
+        conn = getattr(self._local, 'conn', None)
+        if conn is None or self._local.pid != os.getpid():
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            conn = sqlite3.connect(self.path, timeout=self.timeout, isolation_level=None)
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            conn.executescript(_SCHEMA)
+            self._local.conn, self._local.pid = conn, os.getpid()
+        return conn
+
+    def _transaction(self):
+        return _Immediate(self._connection())
+
+    def _get(self, conn, key, now):
+        row = conn.execute('SELECT count FROM ratelimit_counter WHERE key = ? AND expiry > ?',
+                           (key, now)).fetchone()
+        return row[0] if row else 0
+
+    def _incr(self, conn, key, expiry, amount, now):
+        if now >= self._next_purge:
+            conn.execute('DELETE FROM ratelimit_counter WHERE expiry <= ?', (now,))
+            self._next_purge = now + self.purge_interval
+        params = {'key': key, 'amount': amount, 'expiry': now + expiry, 'now': now}
+        return conn.execute(_INCR, params).fetchone()[0]
+
+    def incr(self, key, expiry, amount=1):
+        with self._transaction() as conn:
+            return self._incr(conn, key, expiry, amount, time.time())
+
+    def get(self, key):
+        return self._get(self._connection(), key, time.time())
+
+    def get_expiry(self, key):
+        now = time.time()
+        row = self._connection().execute(
+            'SELECT expiry FROM ratelimit_counter WHERE key = ? AND expiry > ?', (key, now)).fetchone()
+        return row[0] if row else now
+
+    def clear(self, key):
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM ratelimit_counter WHERE key = ?', (key,))
+
+    def check(self):
+        try:
+            self._connection().execute('SELECT 1').fetchone()
+            return True
+        except sqlite3.Error:
+            return False
+
+    def reset(self):
+        with self._transaction() as conn:
+            return conn.execute('DELETE FROM ratelimit_counter').rowcount
+
+    def purge(self):
+        """Delete every expired counter now; returns how many were removed."""
+        now = time.time()
+        with self._transaction() as conn:
+            self._next_purge = now + self.purge_interval
+            return conn.execute('DELETE FROM ratelimit_counter WHERE expiry <= ?', (now,)).rowcount
+
+    def acquire_sliding_window_entry(self, key, limit, expiry, amount=1):
+        if amount > limit:
+            return False
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        with self._transaction() as conn:
+            previous_count, previous_ttl, current_count, _ = self._sliding_window(
+                conn, previous_key, current_key, expiry, now)
+            weighted_count = previous_count * previous_ttl / expiry + current_count
+            if floor(weighted_count) + amount > limit:
+                return False
+            # The counter outlives its own window so it can be weighted as the
+            # previous one in the next.
+            self._incr(conn, current_key, 2 * expiry, amount, now)
+            return True
+
+    def get_sliding_window(self, key, expiry):
+        now = time.time()
+        previous_key, current_key = self.sliding_window_keys(key, expiry, now)
+        return self._sliding_window(self._connection(), previous_key, current_key, expiry, now)
+
+    def _sliding_window(self, conn, previous_key, current_key, expiry, now):
+        previous_count = self._get(conn, previous_key, now)
+        current_count = self._get(conn, current_key, now)
+        previous_ttl = (1 - (((now - expiry) / expiry) % 1)) * expiry if previous_count else 0.0
+        current_ttl = (1 - ((now / expiry) % 1)) * expiry + expiry
+        return previous_count, previous_ttl, current_count, current_ttl
+
+    def clear_sliding_window(self, key, expiry):
+        previous_key, current_key = self.sliding_window_keys(key, expiry, time.time())
+        with self._transaction() as conn:
+            conn.execute('DELETE FROM ratelimit_counter WHERE key IN (?, ?)', (previous_key, current_key))
+
+
+class _Immediate:
+    """Takes SQLite's write lock up front so a read-then-write check is atomic."""
+
+    def __init__(self, conn):
+        self.conn = conn
+
+    def __enter__(self):
+        self.conn.execute('BEGIN IMMEDIATE')
+        return self.conn
+
+    def __exit__(self, exc_type, exc, tb):
+        self.conn.execute('ROLLBACK' if exc_type else 'COMMIT')
+        return False
+
+
+def route_limit(name):
+    """A limit string for ``@limiter.limit`` that is read from config on each request."""
+    return lambda: current_app.config[name]
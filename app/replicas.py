@@ -0,0 +1,115 @@
+# replicas.py
+from functools import wraps
+from flask import current_app, g, has_app_context, has_request_context, request
+from flask_jwt_extended import get_jwt_identity
+from flask_sqlalchemy.session import Session
+from limits.storage import storage_from_string
+from sqlalchemy import event
+from sqlalchemy.sql.dml import UpdateBase
+
+REPLICA_BIND = 'replica'
+
+
+def _routed_to_replica():
+    return has_app_context() and g.get('_db_route') == REPLICA_BIND
+
+
+class RoutingSession(Session):
+    """Sends reads to the ``replica`` bind while a ``@replica_reads`` view runs.
+
+    Everything else - flushes, INSERT/UPDATE/DELETE statements, and any
+    request that did not opt in - uses the primary. Writes are noted in
+    ``session.info`` so a commit can open the writer's read-your-writes
+    window.
+    """
+
+    def get_bind(self, mapper=None, clause=None, bind=None, **kwargs):
+        if bind is None:
+            writing = self._flushing or isinstance(clause, UpdateBase)
+            if writing:
+                self.info['wrote'] = True
+            elif _routed_to_replica() and REPLICA_BIND in self._db.engines:
+                return self._db.engines[REPLICA_BIND]
+        return super().get_bind(mapper=mapper, clause=clause, bind=bind, **kwargs)
+
+
+@event.listens_for(RoutingSession, 'after_commit')
+def _after_commit(session):
+    if session.info.pop('wrote', False) and has_request_context():
+        router = current_app.extensions.get('read_router')
+        if router is not None:
+            router.note_write(_writer_identity())
+
+
+@event.listens_for(RoutingSession, 'after_rollback')
+def _after_rollback(session):
+    session.info.pop('wrote', None)
+
+
+def _writer_identity():
+    try:
+        return get_jwt_identity()
+    except RuntimeError:  # no token verified for this request
+        return None
+
+
+class ReadRouter:
+    """Decides per request whether reads may go to the replica.
+
+    A user who committed a write within READ_YOUR_WRITES_SECONDS keeps
+    reading from the primary so they never see replication lag on their own
+    data. The marks live in a ``limits`` storage so every worker sees them;
+    point READ_YOUR_WRITES_STORAGE_URI at shared storage when running more
+    than one process.
+    """
+
+    def __init__(self, app=None, db=None):
+        self.storage = None
+        if app is not None:
+            self.init_app(app, db)
+
+    def init_app(self, app, db):
+        # Flask-SQLAlchemy registers an empty MetaData for every bind key, and
+        # create_all()/drop_all() then expect that bind in every app. The
+        # replica mirrors the primary's schema, so it needs none of its own.
+        replica_metadata = db.metadatas.get(REPLICA_BIND)
+        if replica_metadata is not None and not replica_metadata.tables:
+            del db.metadatas[REPLICA_BIND]
+        self.window = app.config['READ_YOUR_WRITES_SECONDS']
+        uri = (app.config.get('READ_YOUR_WRITES_STORAGE_URI')
+               or app.config.get('RATELIMIT_STORAGE_URI') or 'memory://')
+        self.storage = storage_from_string(uri)
+        app.extensions['read_router'] = self
+
+    @staticmethod
+    def _key(identity):
+        return f'healthfin:read-your-writes:{identity}'
+
+    def note_write(self, identity):
+        if identity is not None and self.window > 0:
+            # Clearing first restarts the expiry, which incr() only sets on a new key.
+            self.storage.clear(self._key(identity))
+            self.storage.incr(self._key(identity), self.window)
+
+    def recently_wrote(self, identity):
+        return self.window > 0 and self.storage.get(self._key(identity)) > 0
+
+    def use_replica(self, identity):
+        return REPLICA_BIND in current_app.config.get('SQLALCHEMY_BINDS', {}) \
+            and not self.recently_wrote(identity)
+
+
+def replica_reads(view):
+    """Route the view's reads to the replica unless the caller just wrote.
+
+    Apply below ``@jwt_required()`` so the caller's identity is known. Only
+    GET and HEAD requests are routed.
+    """
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        router = current_app.extensions.get('read_router')
+        if request.method in ('GET', 'HEAD') and router is not None \
+                and router.use_replica(_writer_identity()):
+            g._db_route = REPLICA_BIND
+        return view(*args, **kwargs)
+    return wrapper
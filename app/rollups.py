@@ -0,0 +1,147 @@
+# rollups.py
+from datetime import datetime
+from sqlalchemy import case, func, select
+from sqlalchemy.dialects import postgresql, sqlite
+from . import db
+from .models import FinancialSummary, Income, Expense, Savings
+
+SUMMARY_FIELDS = ('total_income', 'income_count', 'total_expenses', 'expense_count', 'savings_balance')
+
+
+def dialect_insert():
+    """The dialect's INSERT construct if it supports ON CONFLICT upserts, else None."""
+    name = db.session.get_bind().dialect.name
+    if name == 'postgresql':
+        return postgresql.insert
+    if name == 'sqlite':
+        return sqlite.insert
+    return None
+
+
+def apply_delta(user_id, income=0.0, income_count=0, expenses=0.0, expense_count=0,
+                savings=0.0, at=None):
+    """Add deltas to a user's summary row inside the caller's transaction.
+
+    The caller commits; a failed write therefore rolls back the raw row and
+    the rollup together.
+    """
+    at = at or datetime.utcnow()
+    table = FinancialSummary.__table__
+    increments = {
+        'total_income': table.c.total_income + income,
+        'income_count': table.c.income_count + income_count,
+        'total_expenses': table.c.total_expenses + expenses,
+        'expense_count': table.c.expense_count + expense_count,
+        'savings_balance': table.c.savings_balance + savings,
+        'last_activity_at': case(
+            (table.c.last_activity_at.is_(None), at),
+            (table.c.last_activity_at < at, at),
+            else_=table.c.last_activity_at,
+        ),
+    }
+    values = {
+        'user_id': user_id,
+        'total_income': income,
+        'income_count': income_count,
+        'total_expenses': expenses,
+        'expense_count': expense_count,
+        'savings_balance': savings,
+        'last_activity_at': at,
+    }
+
+    insert = dialect_insert()
+    if insert is not None:
+        stmt = insert(table).values(**values)
+        db.session.execute(stmt.on_conflict_do_update(index_elements=[table.c.user_id], set_=increments))
+        return
+
+    result = db.session.execute(table.update().where(table.c.user_id == user_id).values(**increments))
+    if result.rowcount == 0:
+        db.session.execute(table.insert().values(**values))
+
+
+def get_summary(user_id):
+    summary = db.session.get(FinancialSummary, user_id)
+    if summary is None:
+        return {field: 0 for field in SUMMARY_FIELDS} | {'last_activity_at': None}
+    return {field: getattr(summary, field) for field in SUMMARY_FIELDS + ('last_activity_at',)}
+
+
+def _raw_totals(lo, hi):
+    """Recompute summaries for user ids in [lo, hi) from the raw tables."""
+    totals = {}
+
+    def merge(rows, fields):
+        for row in rows:
+            entry = totals.setdefault(row[0], {field: 0 for field in SUMMARY_FIELDS} | {'last_activity_at': None})
+            for field, value in zip(fields, row[1:]):
+                if field == 'last_activity_at':
+                    if value is not None and (entry[field] is None or value > entry[field]):
+                        entry[field] = value
+                else:
+                    entry[field] = value or 0
+
+    for model, total_field, count_field in ((Income, 'total_income', 'income_count'),
+                                           (Expense, 'total_expenses', 'expense_count')):
+        rows = db.session.execute(
+            select(model.user_id, func.sum(model.amount), func.count(model.id), func.max(model.date))
+            .where(model.user_id >= lo, model.user_id < hi)
+            .group_by(model.user_id)
+        )
+        merge(rows, (total_field, count_field, 'last_activity_at'))
+
+    rows = db.session.execute(
+        select(Savings.user_id, Savings.balance).where(Savings.user_id >= lo, Savings.user_id < hi)
+    )
+    merge(rows, ('savings_balance',))
+    return totals
+
+
+def _differs(expected, actual):
+    for field in SUMMARY_FIELDS:
+        if abs((expected[field] or 0) - (actual[field] or 0)) > 1e-6:
+            return True
+    return False
+
+
+def rebuild(chunk_size=1000, dry_run=False):
+    """Recompute every rollup from the raw rows, one user-id range at a time.
+
+    Returns a list of ``(user_id, stored, expected)`` tuples for the rows that
+    had drifted. Each chunk is committed on its own so a rebuild never holds a
+    long write transaction.
+    """
+    table = FinancialSummary.__table__
+    drift = []
+    max_id = max(
+        db.session.execute(select(func.max(model.user_id))).scalar() or 0
+        for model in (Income, Expense, Savings, FinancialSummary)
+    )
+
+    for lo in range(1, max_id + 1, chunk_size):
+        hi = lo + chunk_size
+        expected = _raw_totals(lo, hi)
+        stored = {
+            row.user_id: dict(row._mapping)
+            for row in db.session.execute(select(table).where(table.c.user_id >= lo, table.c.user_id < hi))
+        }
+
+        for user_id in sorted(expected.keys() | stored.keys()):
+            want = expected.get(user_id) or {field: 0 for field in SUMMARY_FIELDS} | {'last_activity_at': None}
+            have = stored.get(user_id)
+            if have is not None and not _differs(want, have):
+                continue
+            drift.append((user_id, have, want))
+            if dry_run:
+                continue
+            if have is None:
+                db.session.execute(table.insert().values(user_id=user_id, **want))
+            else:
+                db.session.execute(table.update().where(table.c.user_id == user_id).values(**want))
+
+        if dry_run:
+            db.session.rollback()
+        else:
+            db.session.commit()
+
+    return drift
@@ -1,75 +1,101 @@
 # routes.py
 
-from flask import Blueprint, jsonify, request
+from flask import Blueprint, Response, current_app, jsonify, request, stream_with_context
 from flask_jwt_extended import jwt_required, get_jwt_identity, create_access_token
 from flask_wtf.csrf import generate_csrf
-from werkzeug.security import generate_password_hash, check_password_hash
+from sqlalchemy.exc import IntegrityError
 import logging
+import math
+import time
+from functools import wraps
+from datetime import date, datetime, timedelta
 from .validators import validate_contact_form, validate_amount, validate_email, validate_phone_number
-from .services import send_contact_message
-from .models import ContactMessage, Savings, SavingPlan, Transaction, User, LoanApplication, Income, Expense
-from . import db, csrf
+from .services import queue_contact_message
+from . import cashflow, loans, postings, projections, rollups
+from .ingest import insert_entries, parse_entries
+from .export import EXPORT_FORMATS, iter_history
+from .pagination import PageParams, finances_page, savings_history_page
+from .search import SearchParams, SearchUnavailable, search_messages
+from .models import ContactMessage, Savings, SavingPlan, SavingPlanEnrollment, Transaction, User, LoanApplication, Income, Expense
+from . import db, csrf, limiter, password_hasher, content_registry
+from .classification import stateless
+from .ratelimits import route_limit
+from .replicas import replica_reads
+from .content import BUNDLE
+from .hashing import HashingBusy
 
 main_bp = Blueprint('main', __name__, url_prefix='/api')
 
-logging.basicConfig(level=logging.DEBUG)
 logger = logging.getLogger(__name__)
 
+
+def current_user_id():
+    # Tokens carry the user id as a string subject (PyJWT rejects anything else),
+    # so convert it back before it is compared against integer columns.
+    return int(get_jwt_identity())
+
+
+def admin_required(view):
+    """403 unless the caller's email is in ADMIN_EMAILS. Apply below ``@jwt_required()``."""
+    @wraps(view)
+    def wrapper(*args, **kwargs):
+        email = db.session.execute(db.select(User.email).filter_by(id=current_user_id())).scalar()
+        if email is None or email.lower() not in current_app.config['ADMIN_EMAILS']:
+            return jsonify({"error": "Forbidden"}), 403
+        return view(*args, **kwargs)
+    return wrapper
+
+
+def hashing_busy():
+    response = jsonify({"error": "Server busy, please retry"})
+    response.headers['Retry-After'] = '1'
+    return response, 503
+
+
+def wants_legacy_list():
+    if 'legacy' in request.args:
+        return request.args['legacy'].lower() in ('true', '1')
+    return current_app.config['LEGACY_LIST_RESPONSES']
+
+
+def page_params():
+    return PageParams(request.args, current_app.config['PAGE_SIZE_DEFAULT'], current_app.config['PAGE_SIZE_MAX'])
+
+
+def page_response(items, next_cursor, prev_cursor):
+    return jsonify({"items": items, "next_cursor": next_cursor, "prev_cursor": prev_cursor})
+
+# Static content is served from bytes prebuilt at startup (see content.py).
 @main_bp.route('/about-us', methods=['GET'])
+@stateless
 def get_about_us():
-    try:
-        content = {
-            "title": "ABOUT US",
-            "description": "Healthfin recognizes the burden of healthcare costs. We bridge the gap to affordability by offering flexible and affordable health insurance plans, along with expert advice and personalized support, aiming to provide value with competitive rates and flexible repayment options."
-        }
-        return jsonify(content)
-    except Exception as e:
-        logger.error(f"Error fetching about us content: {str(e)}")
-        return jsonify({"error": "Error fetching about us content"}), 500
+    return content_registry.response('about-us')
 
 @main_bp.route('/mission', methods=['GET'])
+@stateless
 def get_mission():
-    try:
-        content = {
-            "title": "OUR MISSION",
-            "description": "To champion well-being by providing accessible, comprehensive health insurance and fostering a culture of preventative care for a healthier and more vibrant future."
-        }
-        return jsonify(content)
-    except Exception as e:
-        logger.error(f"Error fetching mission content: {str(e)}")
-        return jsonify({"error": "Error fetching mission content"}), 500
+    return content_registry.response('mission')
 
 @main_bp.route('/vision', methods=['GET'])
+@stateless
 def get_vision():
-    try:
-        content = {
-            "title": "OUR VISION",
-            "description": "We envision a future where healthy living is accessible to all. By connecting people with affordable and comprehensive health services, we empower individuals to live healthier, more fulfilling lives."
-        }
-        return jsonify(content)
-    except Exception as e:
-        logger.error(f"Error fetching vision content: {str(e)}")
-        return jsonify({"error": "Error fetching vision content"}), 500
+    return content_registry.response('vision')
 
 @main_bp.route('/message', methods=['GET'])
+@stateless
 def get_message():
-    try:
-        content = {
-            "title": "OUR MESSAGE",
-            "description": "Healthfin is a health insurance company built on the foundation of empowering your well-being. We believe health insurance should be more than just a policy; it is the support you need to be an active partner in your journey to a healthier, happier you."
-        }
-        return jsonify(content)
-    except Exception as e:
-        logger.error(f"Error fetching message content: {str(e)}")
-        return jsonify({"error": "Error fetching message content"}), 500
-
+    return content_registry.response('message')
 
 @main_bp.route('/contact-info', methods=['GET'])
+@stateless
 def contact_info():
-    return jsonify({
-        "email": "email@gmail.com",
-        "phone": "+254712345678"
-    })
+    return content_registry.response('contact-info')
+
+@main_bp.route('/content', methods=['GET'])
+@stateless
+def get_content_bundle():
+    # Everything above in one response, for the landing page.
+    return content_registry.response(BUNDLE)
 
 @main_bp.route('/get-csrf-token', methods=['GET'])
 def get_csrf_token():
@@ -77,34 +103,34 @@ def get_csrf_token():
     return jsonify({"csrf_token": token})
 
 @main_bp.route('/send-message', methods=['POST'])
+@limiter.limit(route_limit('CONTACT_RATE_LIMIT'))
 def send_message():
     logger.debug("Received a request to send a message.")
     data = request.get_json()
-    logger.debug(f"Request data: {data}")
+    logger.debug("Request data: %s", data)
 
     errors = validate_contact_form(data)
     if errors:
-        logger.debug(f"Validation errors: {errors}")
+        logger.debug("Validation errors: %s", errors)
         return jsonify({"errors": errors}), 400
     
-    success, error_message = send_contact_message(data)
-    if not success:
-        logger.error(f"Failed to send message: {error_message}")
-        return jsonify({"error": error_message}), 500
-    
     new_message = ContactMessage(name=data['name'], email=data['email'], message=data['message'])
     try:
+        # The emails are queued in the same transaction and sent by the
+        # outbox workers, so SMTP latency never reaches this request.
         db.session.add(new_message)
+        queue_contact_message(data)
         db.session.commit()
         logger.debug("Message saved to database successfully.")
     except Exception as e:
-        logger.error(f"Database error: {str(e)}")
+        logger.error("Database error: %s", e)
         db.session.rollback()
         return jsonify({"error": "Failed to save message to database."}), 500
     
     return jsonify({"success": "Message sent"}), 200
 
 @main_bp.route('/register', methods=['POST'])
+@limiter.limit(route_limit('REGISTER_RATE_LIMIT'))
 def register():
     data = request.get_json()
     email = data.get('email')
@@ -113,7 +139,10 @@ def register():
     if User.query.filter_by(email=email).first():
         return jsonify({"error": "Email already registered"}), 400
 
-    hashed_password = generate_password_hash(password)
+    try:
+        hashed_password = password_hasher.hash(password)
+    except HashingBusy:
+        return hashing_busy()
     new_user = User(email=email, password_hash=hashed_password)
     db.session.add(new_user)
     db.session.commit()
@@ -121,6 +150,7 @@ def register():
     return jsonify({"message": "User registered successfully"}), 201
 
 @main_bp.route('/login', methods=['POST'])
+@limiter.limit(route_limit('LOGIN_RATE_LIMIT'))
 def login():
     data = request.get_json()
     email = data.get('email')
@@ -128,73 +158,125 @@ def login():
 
     user = User.query.filter_by(email=email).first()
 
-    if not user or not check_password_hash(user.password_hash, password):
-        return jsonify({"error": "Invalid credentials"}), 401
-
-    access_token = create_access_token(identity=user.id)
+    try:
+        if not user or not password_hasher.verify(user.password_hash, password):
+            return jsonify({"error": "Invalid credentials"}), 401
+
+        if password_hasher.needs_rehash(user.password_hash):
+            # Upgrade hashes made with an older method or cost while we
+            # still have the plaintext.
+            user.password_hash = password_hasher.hash(password)
+            db.session.commit()
+    except HashingBusy:
+        return hashing_busy()
+
+    access_token = create_access_token(identity=str(user.id))
     return jsonify({"token": access_token}), 200
 
 @main_bp.route('/dashboard', methods=['GET'])
+@stateless
 @jwt_required()
+@replica_reads
 def get_dashboard_data():
     try:
-        user_id = get_jwt_identity()
-        savings = Savings.query.filter_by(user_id=user_id).first()
-        income = db.session.query(db.func.sum(Income.amount)).filter_by(user_id=user_id).scalar() or 0
-        expenses = db.session.query(db.func.sum(Expense.amount)).filter_by(user_id=user_id).scalar() or 0
-
-        balance = savings.balance if savings else 0
+        user_id = current_user_id()
+        summary = rollups.get_summary(user_id)
 
         return jsonify({
-            "balance": balance,
-            "income": income,
-            "savings": balance,
-            "expenses": expenses
+            "balance": summary['savings_balance'],
+            "income": summary['total_income'],
+            "savings": summary['savings_balance'],
+            "expenses": summary['total_expenses']
         }), 200
     except Exception as e:
-        logger.error(f"Error fetching dashboard data: {str(e)}")
+        logger.error("Error fetching dashboard data: %s", e)
         return jsonify({"error": "Error fetching dashboard data"}), 500
 
 @main_bp.route('/finances', methods=['GET'])
+@stateless
 @jwt_required()
+@replica_reads
 def get_finances():
     try:
-        user_id = get_jwt_identity()
-        income = Income.query.filter_by(user_id=user_id).all()
-        expenses = Expense.query.filter_by(user_id=user_id).all()
-        transactions = Transaction.query.filter_by(user_id=user_id).all()
-
-        income_data = [{"id": i.id, "amount": i.amount} for i in income]
-        expenses_data = [{"id": e.id, "amount": e.amount} for e in expenses]
-        transactions_data = [{"id": t.id, "amount": t.amount, "type": t.type} for t in transactions]
-
-        return jsonify({
-            "income": income_data,
-            "expenses": expenses_data,
-            "transactions": transactions_data
-        }), 200
+        user_id = current_user_id()
+        if wants_legacy_list():
+            income = db.session.execute(db.select(Income.id, Income.amount).filter_by(user_id=user_id))
+            expenses = db.session.execute(db.select(Expense.id, Expense.amount).filter_by(user_id=user_id))
+            transactions = db.session.execute(
+                db.select(Transaction.id, Transaction.amount, Transaction.type).filter_by(user_id=user_id))
+
+            return jsonify({
+                "income": [{"id": i.id, "amount": i.amount} for i in income],
+                "expenses": [{"id": e.id, "amount": e.amount} for e in expenses],
+                "transactions": [{"id": t.id, "amount": t.amount, "type": t.type} for t in transactions]
+            }), 200
+
+        rows, next_cursor, prev_cursor = finances_page(user_id, page_params())
+        # Rows serialize as {"kind", "id", "amount", "type", "date"} (see serialization.py).
+        return page_response(rows, next_cursor, prev_cursor), 200
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
     except Exception as e:
-        logger.error(f"Error fetching finances data: {str(e)}")
+        logger.error("Error fetching finances data: %s", e)
         return jsonify({"error": "Error fetching finances data"}), 500
 
 @main_bp.route('/expenses/summary', methods=['GET'])
+@stateless
 @jwt_required()
+@replica_reads
 def get_expenses_summary():
     try:
-        user_id = get_jwt_identity()
-        expenses = Expense.query.filter_by(user_id=user_id).all()
-
-        total_expenses = sum([expense.amount for expense in expenses])
+        user_id = current_user_id()
+        # Summed inside the covering (user_id, date, id, amount) index.
+        total_expenses = db.session.execute(
+            db.select(db.func.coalesce(db.func.sum(Expense.amount), 0)).where(Expense.user_id == user_id)
+        ).scalar()
 
         return jsonify({
             "total_expenses": total_expenses
         }), 200
     except Exception as e:
-        logger.error(f"Error fetching expenses summary: {str(e)}")
+        logger.error("Error fetching expenses summary: %s", e)
         return jsonify({"error": "Error fetching expenses summary"}), 500
 
+@main_bp.route('/analytics/cash-flow', methods=['GET'])
+@stateless
+@jwt_required()
+@replica_reads
+def get_cash_flow():
+    granularity = request.args.get('granularity', 'month')
+    try:
+        end = datetime.fromisoformat(request.args['end']).date() if 'end' in request.args \
+            else datetime.utcnow().date()
+        start = datetime.fromisoformat(request.args['start']).date() if 'start' in request.args \
+            else end - timedelta(days=min(364, (end - date.min).days))
+    except ValueError:
+        return jsonify({"error": "start and end must be ISO dates (YYYY-MM-DD)"}), 400
+    max_days = current_app.config['CASH_FLOW_MAX_DAYS']
+    if (end - start).days >= max_days:
+        return jsonify({"error": f"Date range is limited to {max_days} days"}), 400
+
+    try:
+        periods = cashflow.cash_flow(current_user_id(), start, end, granularity)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    for period in periods:
+        period['period'] = period['period'].isoformat()
+    return jsonify({
+        "granularity": granularity,
+        "start": start.isoformat(),
+        "end": end.isoformat(),
+        "buckets": periods,
+        "totals": {
+            "income": sum(p['income'] for p in periods),
+            "expenses": sum(p['expenses'] for p in periods),
+            "net": sum(p['net'] for p in periods),
+        },
+    }), 200
+
 # Route to add income
 @main_bp.route('/income', methods=['POST'])
+@stateless
 @jwt_required()
 def add_income():
     data = request.get_json()
@@ -205,20 +287,23 @@ def add_income():
     if errors:
         return jsonify({"errors": errors}), 400
 
-    user_id = get_jwt_identity()
-    new_income = Income(user_id=user_id, amount=amount)
+    user_id = current_user_id()
+    new_income = Income(user_id=user_id, amount=float(amount), date=datetime.utcnow())
 
     try:
         db.session.add(new_income)
+        rollups.apply_delta(user_id, income=new_income.amount, income_count=1, at=new_income.date)
+        cashflow.add_entries(user_id, Income, [(new_income.date, new_income.amount)])
         db.session.commit()
         return jsonify({"message": "Income added successfully"}), 201
     except Exception as e:
-        logger.error(f"Error adding income: {str(e)}")
+        logger.error("Error adding income: %s", e)
         db.session.rollback()
         return jsonify({"error": "Failed to add income"}), 500
 
 # Route to add expense
 @main_bp.route('/expense', methods=['POST'])
+@stateless
 @jwt_required()
 def add_expense():
     data = request.get_json()
@@ -229,19 +314,58 @@ def add_expense():
     if errors:
         return jsonify({"errors": errors}), 400
 
-    user_id = get_jwt_identity()
-    new_expense = Expense(user_id=user_id, amount=amount)
+    user_id = current_user_id()
+    new_expense = Expense(user_id=user_id, amount=float(amount), date=datetime.utcnow())
 
     try:
         db.session.add(new_expense)
+        rollups.apply_delta(user_id, expenses=new_expense.amount, expense_count=1, at=new_expense.date)
+        cashflow.add_entries(user_id, Expense, [(new_expense.date, new_expense.amount)])
         db.session.commit()
         return jsonify({"message": "Expense added successfully"}), 201
     except Exception as e:
-        logger.error(f"Error adding expense: {str(e)}")
+        logger.error("Error adding expense: %s", e)
         db.session.rollback()
         return jsonify({"error": "Failed to add expense"}), 500
 
+def _add_batch(model, label):
+    data = request.get_json()
+    entries = data.get('entries') if isinstance(data, dict) else data
+    if not isinstance(entries, list) or not entries:
+        return jsonify({"error": "Expected a non-empty array of entries"}), 400
+    max_entries = current_app.config['BATCH_MAX_ENTRIES']
+    if len(entries) > max_entries:
+        return jsonify({"error": f"At most {max_entries} entries per batch"}), 400
+
+    rows, errors = parse_entries(entries)
+    if not rows:
+        return jsonify({"inserted": 0, "errors": errors}), 400
+
+    user_id = current_user_id()
+    try:
+        insert_entries(model, user_id, rows)
+        db.session.commit()
+        return jsonify({"inserted": len(rows), "errors": errors}), 201
+    except Exception as e:
+        logger.error("Error adding %s batch: %s", label, e)
+        db.session.rollback()
+        return jsonify({"error": f"Failed to add {label}"}), 500
+
+# Routes to add many income/expense entries in one request and one commit
+@main_bp.route('/income/batch', methods=['POST'])
+@stateless
+@jwt_required()
+def add_income_batch():
+    return _add_batch(Income, 'income')
+
+@main_bp.route('/expense/batch', methods=['POST'])
+@stateless
+@jwt_required()
+def add_expense_batch():
+    return _add_batch(Expense, 'expense')
+
 @main_bp.route('/savings/deposit', methods=['POST'])
+@stateless
 @jwt_required()
 def deposit_savings():
     data = request.get_json()
@@ -252,25 +376,21 @@ def deposit_savings():
     if errors:
         return jsonify({"errors": errors}), 400
 
-    user_id = get_jwt_identity()
-    savings = Savings.query.filter_by(user_id=user_id).first()
-
-    if not savings:
-        # Create a savings account for the user if it doesn't exist
-        savings = Savings(user_id=user_id, balance=0)
-        db.session.add(savings)
-
-    savings.balance += amount
+    user_id = current_user_id()
 
     try:
+        # Creates the savings account on first deposit.
+        postings.deposit(user_id, float(amount))
         db.session.commit()
         return jsonify({"message": "Savings deposited successfully"}), 200
     except Exception as e:
-        logger.error(f"Error depositing savings: {str(e)}")
+        logger.error("Error depositing savings: %s", e)
+        db.session.rollback()
         return jsonify({"error": "Failed to deposit savings"}), 500
 
 
 @main_bp.route('/savings/withdraw', methods=['POST'])
+@stateless
 @jwt_required()
 def withdraw_savings():
     data = request.get_json()
@@ -280,61 +400,294 @@ def withdraw_savings():
     if errors:
         return jsonify({"errors": errors}), 400
 
-    user_id = get_jwt_identity()
-    savings = Savings.query.filter_by(user_id=user_id).first()
-
-    if not savings:
-        return jsonify({"error": "Savings account not found"}), 404
-
-    if amount > savings.balance:
-        return jsonify({"error": "Insufficient funds"}), 400
-
-    savings.balance -= amount
+    user_id = current_user_id()
 
     try:
+        postings.withdraw(user_id, float(amount))
         db.session.commit()
         return jsonify({"message": "Savings withdrawn successfully"}), 200
+    except postings.AccountNotFound:
+        db.session.rollback()
+        return jsonify({"error": "Savings account not found"}), 404
+    except postings.InsufficientFunds:
+        db.session.rollback()
+        return jsonify({"error": "Insufficient funds"}), 400
     except Exception as e:
-        logger.error(f"Error withdrawing savings: {str(e)}")
+        logger.error("Error withdrawing savings: %s", e)
         db.session.rollback()
         return jsonify({"error": "Failed to withdraw savings"}), 500
 
+def saving_plan_data(plan, enrollment=None):
+    data = {
+        "id": plan.id,
+        "name": plan.name,
+        "description": plan.description,
+        "annual_rate": plan.annual_rate,
+        "contribution_frequency": plan.contribution_frequency,
+        "term_months": plan.term_months,
+    }
+    if enrollment is not None:
+        data["amount"] = enrollment.contribution
+        data["enrolled_at"] = enrollment.enrolled_at.isoformat()
+    return data
+
+@main_bp.route('/saving-plans/available', methods=['GET'])
+@stateless
+def get_available_saving_plans():
+    plans = db.session.execute(db.select(SavingPlan).order_by(SavingPlan.id)).scalars()
+    return jsonify([saving_plan_data(plan) for plan in plans]), 200
+
 @main_bp.route('/saving-plans', methods=['GET'])
+@stateless
 @jwt_required()
+@replica_reads
 def get_saving_plans():
-    user_id = get_jwt_identity()
-    saving_plans = SavingPlan.query.filter_by(user_id=user_id).all()
-    saving_plans_data = [{"id": plan.id, "name": plan.name, "amount": plan.amount} for plan in saving_plans]
+    user_id = current_user_id()
+    rows = db.session.execute(
+        db.select(SavingPlan, SavingPlanEnrollment)
+        .join(SavingPlanEnrollment, SavingPlanEnrollment.plan_id == SavingPlan.id)
+        .where(SavingPlanEnrollment.user_id == user_id)
+        .order_by(SavingPlan.id)
+    )
+    saving_plans_data = [saving_plan_data(plan, enrollment) for plan, enrollment in rows]
     return jsonify(saving_plans_data), 200
 
 @main_bp.route('/saving-plans/<int:id>', methods=['GET'])
+@stateless
 @jwt_required()
+@replica_reads
 def get_saving_plan(id):
-    user_id = get_jwt_identity()
-    saving_plan = SavingPlan.query.filter_by(user_id=user_id, id=id).first()
+    user_id = current_user_id()
+    row = db.session.execute(
+        db.select(SavingPlan, SavingPlanEnrollment)
+        .join(SavingPlanEnrollment, SavingPlanEnrollment.plan_id == SavingPlan.id)
+        .where(SavingPlanEnrollment.user_id == user_id, SavingPlan.id == id)
+    ).first()
+
+    if not row:
+        return jsonify({"error": "Saving plan not found"}), 404
+
+    return jsonify(saving_plan_data(*row)), 200
+
+@main_bp.route('/saving-plans/<int:id>/enroll', methods=['POST'])
+@stateless
+@jwt_required()
+def enroll_saving_plan(id):
+    data = request.get_json()
+    amount = data.get('amount')
 
-    if not saving_plan:
+    # Validate the amount
+    errors = validate_amount(amount)
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    user_id = current_user_id()
+    plan = db.session.get(SavingPlan, id)
+    if plan is None:
         return jsonify({"error": "Saving plan not found"}), 404
 
-    saving_plan_data = {
-        "id": saving_plan.id,
-        "name": saving_plan.name,
-        "amount": saving_plan.amount
-    }
-    return jsonify(saving_plan_data), 200
+    enrollment = SavingPlanEnrollment(user_id=user_id, plan_id=plan.id, contribution=float(amount))
+    try:
+        db.session.add(enrollment)
+        db.session.flush()
+        # Read before the commit expires it: a cancel may delete the row right after.
+        data = saving_plan_data(plan, enrollment)
+        db.session.commit()
+    except IntegrityError:
+        db.session.rollback()
+        return jsonify({"error": "Already enrolled in this saving plan"}), 409
+    return jsonify(data), 201
+
+@main_bp.route('/saving-plans/<int:id>/enroll', methods=['DELETE'])
+@stateless
+@jwt_required()
+def cancel_saving_plan(id):
+    user_id = current_user_id()
+    result = db.session.execute(
+        db.delete(SavingPlanEnrollment).where(SavingPlanEnrollment.user_id == user_id,
+                                              SavingPlanEnrollment.plan_id == id))
+    if result.rowcount == 0:
+        db.session.rollback()
+        return jsonify({"error": "Saving plan not found"}), 404
+    db.session.commit()
+    return jsonify({"message": "Enrollment cancelled"}), 200
+
+@main_bp.route('/saving-plans/projection', methods=['GET'])
+@stateless
+@jwt_required()
+@replica_reads
+def get_saving_plans_projection():
+    max_months = current_app.config['PROJECTION_MAX_MONTHS']
+    try:
+        months = int(request.args.get('months', 120))
+        if 'scenarios' in request.args:
+            offsets = [float(value) for value in request.args['scenarios'].split(',')]
+        else:
+            offsets = list(current_app.config['PROJECTION_SCENARIOS'])
+    except ValueError:
+        return jsonify({"error": "months must be an integer and scenarios comma-separated rates"}), 400
+    if not 1 <= months <= max_months:
+        return jsonify({"error": f"months must be between 1 and {max_months}"}), 400
+    if not 1 <= len(offsets) <= 10 or any(not math.isfinite(offset) or abs(offset) > 1 for offset in offsets):
+        return jsonify({"error": "Give 1 to 10 scenarios, each a rate offset between -1 and 1"}), 400
+
+    try:
+        balance, plans = projections.user_projection(current_user_id(), months, offsets)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return jsonify({"months": months, "starting_balance": balance, "scenarios": offsets, "plans": plans}), 200
 
 @main_bp.route('/savings/history', methods=['GET'])
+@stateless
 @jwt_required()
+@replica_reads
 def get_savings_history():
-    user_id = get_jwt_identity()
-    savings = Savings.query.filter_by(user_id=user_id).first()
+    user_id = current_user_id()
+    has_savings = db.session.execute(db.select(Savings.id).filter_by(user_id=user_id)).first()
 
-    if not savings:
+    if not has_savings:
         return jsonify({"error": "Savings account not found"}), 404
 
-    transactions = Transaction.query.filter_by(user_id=user_id).all()
-    transactions_data = [{"id": t.id, "amount": t.amount, "type": t.type} for t in transactions]
-    return jsonify(transactions_data), 200
+    if wants_legacy_list():
+        transactions = db.session.execute(
+            db.select(Transaction.id, Transaction.amount, Transaction.type).filter_by(user_id=user_id))
+        transactions_data = [{"id": t.id, "amount": t.amount, "type": t.type} for t in transactions]
+        return jsonify(transactions_data), 200
+
+    try:
+        rows, next_cursor, prev_cursor = savings_history_page(user_id, page_params())
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    return page_response(rows, next_cursor, prev_cursor), 200
+
+@main_bp.route('/export', methods=['GET'])
+@stateless
+@jwt_required()
+@replica_reads
+def export_history():
+    export_format = request.args.get('format', 'ndjson')
+    if export_format not in EXPORT_FORMATS:
+        return jsonify({"error": "format must be one of: " + ", ".join(EXPORT_FORMATS)}), 400
+
+    user_id = current_user_id()
+    mimetype, encode = EXPORT_FORMATS[export_format]
+    # stream_with_context keeps the request (and its db.session) alive while
+    # the WSGI server pulls chunks from the generator.
+    response = Response(stream_with_context(encode(iter_history(user_id))), mimetype=mimetype)
+    response.headers['Content-Disposition'] = f'attachment; filename=finances-{user_id}.{export_format}'
+    return response
+
+LOAN_TEXT_FIELDS = {
+    'first_name': 100,
+    'last_name': 100,
+    'required_treatment': 255,
+    'healthcare_provider': 255,
+}
+
+def loan_data(application, schedule=False):
+    data = {
+        "id": application.id,
+        "required_treatment": application.required_treatment,
+        "healthcare_provider": application.healthcare_provider,
+        "estimated_cost": application.estimated_cost,
+        "term_months": application.term_months,
+        "status": application.status,
+        "application_date": application.application_date.isoformat(),
+        "monthly_payment": application.monthly_payment,
+        "total_interest": application.total_interest,
+        "affordability_ratio": application.affordability_ratio,
+    }
+    if schedule and application.annual_rate is not None:
+        data["repayment_schedule"] = loans.repayment_schedule(
+            application.estimated_cost, application.annual_rate, application.term_months)
+    return data
+
+@main_bp.route('/loans', methods=['POST'])
+@stateless
+@jwt_required()
+def apply_for_loan():
+    data = request.get_json()
+    if not isinstance(data, dict):
+        return jsonify({"error": "Expected a JSON object"}), 400
+
+    errors = []
+    for field, max_length in LOAN_TEXT_FIELDS.items():
+        value = data.get(field)
+        if not isinstance(value, str) or not value.strip() or len(value) > max_length:
+            errors.append(f"Invalid {field.replace('_', ' ')}")
+    email = data.get('email_address')
+    if not validate_email(email):
+        errors.append("Invalid email address")
+    if not validate_phone_number(data.get('phone_number')):
+        errors.append("Invalid phone number")
+    errors.extend(validate_amount(data.get('estimated_cost')))
+    term_months = data.get('term_months', 12)
+    if term_months not in current_app.config['LOAN_TERM_CHOICES']:
+        errors.append("Invalid term")
+    if errors:
+        return jsonify({"errors": errors}), 400
+
+    application = LoanApplication(
+        user_id=current_user_id(),
+        first_name=data['first_name'].strip(),
+        last_name=data['last_name'].strip(),
+        email_address=email,
+        phone_number=data['phone_number'],
+        required_treatment=data['required_treatment'].strip(),
+        estimated_cost=float(data['estimated_cost']),
+        healthcare_provider=data['healthcare_provider'].strip(),
+        term_months=term_months,
+    )
+    try:
+        db.session.add(application)
+        db.session.commit()
+        return jsonify(loan_data(application)), 201
+    except Exception as e:
+        logger.error("Error submitting loan application: %s", e)
+        db.session.rollback()
+        return jsonify({"error": "Failed to submit loan application"}), 500
+
+@main_bp.route('/loans', methods=['GET'])
+@stateless
+@jwt_required()
+@replica_reads
+def get_loans():
+    applications = db.session.execute(
+        db.select(LoanApplication).filter_by(user_id=current_user_id())
+        .order_by(LoanApplication.application_date.desc(), LoanApplication.id.desc())
+    ).scalars()
+    return jsonify([loan_data(application) for application in applications]), 200
+
+@main_bp.route('/loans/<int:id>', methods=['GET'])
+@stateless
+@jwt_required()
+@replica_reads
+def get_loan(id):
+    application = db.session.execute(
+        db.select(LoanApplication).filter_by(user_id=current_user_id(), id=id)).scalar()
+    if application is None:
+        return jsonify({"error": "Loan application not found"}), 404
+    return jsonify(loan_data(application, schedule=True)), 200
+
+# Support inbox: ?q= full-text search ranked by relevance, or newest first
+# without one; start/end bound the message timestamp (see search.py).
+@main_bp.route('/admin/messages', methods=['GET'])
+@stateless
+@jwt_required()
+@replica_reads
+@admin_required
+def search_contact_messages():
+    try:
+        params = SearchParams(request.args, current_app.config['PAGE_SIZE_DEFAULT'],
+                              current_app.config['PAGE_SIZE_MAX'])
+        rows, next_cursor = search_messages(params)
+    except ValueError as e:
+        return jsonify({"error": str(e)}), 400
+    except SearchUnavailable:
+        return jsonify({"error": "Text search is not available on this database"}), 501
+    response = page_response(rows, next_cursor, None)
+    response.headers['Cache-Control'] = 'no-store'
+    return response, 200
 
 # Error handlers
 @main_bp.errorhandler(400)
@@ -349,6 +702,14 @@ def unauthorized(e):
 def not_found(e):
     return jsonify({"error": "Not found"}), 404
 
+@main_bp.errorhandler(429)
+def too_many_requests(e):
+    response = jsonify({"error": "Too many requests"})
+    limit = limiter.current_limit
+    if limit is not None:
+        response.headers['Retry-After'] = str(max(1, int(limit.reset_at - time.time())))
+    return response, 429
+
 @main_bp.errorhandler(500)
 def internal_server_error(e):
     return jsonify({"error": "Internal server error"}), 500
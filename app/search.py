@@ -0,0 +1,191 @@
+# search.py
+import re
+from sqlalchemy import DDL, column, event, func, literal_column, select, table, text, tuple_
+from . import db
+from .models import ContactMessage
+from .pagination import decode_cursor, decode_key, encode_cursor, is_row_id, parse_date
+
+FTS_TABLE = 'contact_message_fts'
+SORTS = ('rank', 'newest')
+MAX_TERMS = 16
+# bm25() column weights, in FTS_SCHEMA column order: a hit on the sender's
+# name or address says more about who wrote in than a word in the body.
+WEIGHTS = (4.0, 4.0, 1.0)
+# SQLite's FTS5 query parser can't take these even inside a quoted phrase.
+CONTROL_CHARACTERS = re.compile(r'[\x00-\x1f\x7f]')
+
+# An external-content index: the text lives only in contact_message and the
+# triggers keep the index in step with every write, ORM or not. The same
+# statements are in the add_contact_message_search migration.
+FTS_SCHEMA = (
+    f"CREATE VIRTUAL TABLE IF NOT EXISTS {FTS_TABLE} USING fts5("
+    "name, email, message, content='contact_message', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ai AFTER INSERT ON contact_message BEGIN "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, email, message) "
+    "VALUES (new.id, new.name, new.email, new.message); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_ad AFTER DELETE ON contact_message BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.message); END",
+    f"CREATE TRIGGER IF NOT EXISTS {FTS_TABLE}_au AFTER UPDATE OF name, email, message ON contact_message BEGIN "
+    f"INSERT INTO {FTS_TABLE}({FTS_TABLE}, rowid, name, email, message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.message); "
+    f"INSERT INTO {FTS_TABLE}(rowid, name, email, message) "
+    "VALUES (new.id, new.name, new.email, new.message); END",
+)
+
+for statement in FTS_SCHEMA:
+    event.listen(ContactMessage.__table__, 'after_create', DDL(statement).execute_if(dialect='sqlite'))
+event.listen(ContactMessage.__table__, 'before_drop',
+             DDL(f'DROP TABLE IF EXISTS {FTS_TABLE}').execute_if(dialect='sqlite'))
+
+
+class SearchUnavailable(Exception):
+    """Raised for a text query when the database has no full-text index.
+
+    The index only exists on SQLite, once the add_contact_message_search
+    migration (or create_all) has run.
+    """
+
+
+def index_available():
+    connection = db.session.connection()
+    if connection.dialect.name != 'sqlite':
+        return False
+    found = connection.execute(text("SELECT 1 FROM sqlite_master WHERE type = 'table' AND name = :name"),
+                               {'name': FTS_TABLE})
+    return found.first() is not None
+
+
+def include_name(name, type_, parent_names):
+    """Keep the index and its shadow tables out of Alembic's autogenerate."""
+    return not (type_ == 'table' and name.startswith(FTS_TABLE))
+
+
+def match_query(text):
+    """Turn what a person typed into an FTS5 query.
+
+    Every word must appear; each is quoted, so punctuation in addresses or
+    stray quotes are taken literally rather than as query syntax. A trailing
+    ``*`` keeps its prefix meaning (``jan*`` finds Jane and January).
+    """
+    terms = []
+    for word in CONTROL_CHARACTERS.sub(' ', text).split():
+        prefix = word.endswith('*')
+        word = word.rstrip('*')
+        if word:
+            terms.append('"{}"{}'.format(word.replace('"', '""'), '*' if prefix else ''))
+    if len(terms) > MAX_TERMS:
+        raise ValueError(f"q may have at most {MAX_TERMS} words")
+    return ' '.join(terms)
+
+
+class SearchParams:
+    """Parsed ``q``/``sort``/``limit``/``after``/``start``/``end`` arguments.
+
+    Raises ValueError with a client-facing message on bad input.
+    """
+
+    def __init__(self, args, default_limit, max_limit):
+        self.query = match_query(args.get('q', ''))
+        self.sort = args.get('sort') or ('rank' if self.query else 'newest')
+        if self.sort not in SORTS:
+            raise ValueError(f"sort must be one of: {', '.join(SORTS)}")
+        if self.sort == 'rank' and not self.query:
+            raise ValueError("sort=rank needs a q")
+
+        try:
+            self.limit = int(args.get('limit', default_limit))
+        except ValueError:
+            raise ValueError("limit must be an integer")
+        if not 1 <= self.limit <= max_limit:
+            raise ValueError(f"limit must be between 1 and {max_limit}")
+
+        self.after = _decode_after(args['after'], self.sort) if args.get('after') else None
+        self.start = parse_date(args.get('start'), 'start')
+        self.end = parse_date(args.get('end'), 'end')
+
+
+def _decode_after(cursor, sort):
+    if sort == 'newest':
+        key = decode_cursor(cursor)
+    else:
+        try:
+            key = decode_key(cursor)
+        except (ValueError, TypeError):
+            raise ValueError("Invalid cursor")
+        # (rank, id); decode_cursor makes the same checks on (timestamp, id).
+        if (len(key) != 2 or isinstance(key[0], bool) or not isinstance(key[0], (int, float))
+                or not is_row_id(key[1])):
+            raise ValueError("Invalid cursor")
+    if len(key) != 2:
+        raise ValueError("Invalid cursor")
+    return key
+
+
+def search_messages(params):
+    """One page of contact messages, best match or newest first.
+
+    With a query, messages are ranked by bm25 (lower is better) and keyed
+    on ``(rank, id)``; a rank depends on the whole index, so a page taken
+    after new messages arrive may repeat or skip a result near its edge.
+    ``sort=newest`` keys on ``(timestamp, id)`` and is exact. ``start`` and
+    ``end`` bound ``timestamp`` either way.
+
+    The page is picked first and the text fetched after, so snippets are
+    only built for the rows returned, not for every match.
+
+    Returns ``(rows, next_cursor)``; raises SearchUnavailable for a query
+    the database can't run.
+    """
+    if params.query and not index_available():
+        raise SearchUnavailable()
+
+    fts = table(FTS_TABLE, column('rowid'))
+    index = literal_column(FTS_TABLE)
+    matches = index.op('MATCH')(params.query)
+    rank = func.bm25(index, *WEIGHTS)
+    columns = (ContactMessage.id, ContactMessage.name, ContactMessage.email, ContactMessage.message,
+               ContactMessage.timestamp)
+
+    if params.sort == 'rank':
+        stmt = select(fts.c.rowid.label('id'), rank.label('rank')).where(matches)
+        if params.start is not None or params.end is not None:
+            stmt = stmt.join(ContactMessage, ContactMessage.id == fts.c.rowid)
+        if params.after is not None:
+            stmt = stmt.where(tuple_(rank, fts.c.rowid) > tuple_(*params.after))
+        stmt = stmt.order_by(rank, fts.c.rowid)
+    else:
+        # Only each match's timestamp is needed to pick the page.
+        if params.query:
+            stmt = (select(ContactMessage.id, ContactMessage.timestamp)
+                    .where(ContactMessage.id.in_(select(fts.c.rowid).where(matches))))
+        else:
+            stmt = select(*columns)
+        if params.after is not None:
+            stmt = stmt.where(tuple_(ContactMessage.timestamp, ContactMessage.id) < tuple_(*params.after))
+        stmt = stmt.order_by(ContactMessage.timestamp.desc(), ContactMessage.id.desc())
+    if params.start is not None:
+        stmt = stmt.where(ContactMessage.timestamp >= params.start)
+    if params.end is not None:
+        stmt = stmt.where(ContactMessage.timestamp < params.end)
+
+    keys = db.session.execute(stmt.limit(params.limit + 1)).all()
+    next_cursor = None
+    if len(keys) > params.limit:
+        last = keys[params.limit - 1]
+        next_cursor = encode_cursor(last.rank if params.sort == 'rank' else last.timestamp, last.id)
+    keys = keys[:params.limit]
+    if not params.query or not keys:
+        return keys, next_cursor
+
+    ids = [key.id for key in keys]
+    # FTS5 would run the whole query once per id for rowid IN (...); one
+    # pass over the page's rowid range, with the list (+0 hides it from
+    # FTS5) as a plain filter, is far cheaper for common words.
+    stmt = (select(*columns, func.snippet(index, 2, '[', ']', '…', 16).label('snippet'), rank.label('rank'))
+            .select_from(fts).join(ContactMessage, ContactMessage.id == fts.c.rowid)
+            .where(matches, fts.c.rowid.between(min(ids), max(ids)), (fts.c.rowid + 0).in_(ids)))
+    rows = {row.id: row for row in db.session.execute(stmt)}
+    # A message deleted in between simply drops out of the page.
+    return [rows[id_] for id_ in ids if id_ in rows], next_cursor
@@ -0,0 +1,171 @@
+# seeding.py
+import multiprocessing
+import random
+from concurrent.futures import ProcessPoolExecutor
+from datetime import datetime, timedelta
+from sqlalchemy import create_engine, func, select
+from . import db, password_hasher
+from .cashflow import daily_buckets
+from .models import (User, Savings, Income, Expense, Transaction, FinancialSummary, DailyCashFlow,
+                     SavingPlan, SavingPlanEnrollment)
+
+TEMPLATE_PASSWORD = 'password123'
+INCOME_CATEGORIES = ('salary', 'freelance', 'benefits', 'gift')
+EXPENSE_CATEGORIES = ('rent', 'groceries', 'health', 'transport', 'utilities', 'insurance')
+OPENING_BALANCE = 500.0
+PLAN_CATALOG = (
+    {'name': 'Monthly Deposit', 'description': 'Save monthly', 'annual_rate': 0.03,
+     'contribution_frequency': 'monthly', 'term_months': None},
+    {'name': 'Fixed Deposit', 'description': 'Save with fixed interest', 'annual_rate': 0.05,
+     'contribution_frequency': 'monthly', 'term_months': 24},
+    {'name': 'Yearly Deposit', 'description': 'Save yearly', 'annual_rate': 0.04,
+     'contribution_frequency': 'yearly', 'term_months': None},
+    {'name': 'Weekly Deposit', 'description': 'Save weekly', 'annual_rate': 0.025,
+     'contribution_frequency': 'weekly', 'term_months': None},
+)
+
+
+def _user_rows(user_id, seed, history_days, per_day, end):
+    """Generate one user's rows; the output depends only on the arguments.
+
+    Each user has its own RNG keyed on ``(seed, user_id)``, so the data is
+    identical whichever process or chunk a user lands in.
+    """
+    rng = random.Random(f'{seed}:{user_id}')
+    incomes, expenses, transactions = [], [], []
+    total_income = total_expenses = 0.0
+    balance = OPENING_BALANCE
+
+    # random() plus arithmetic is several times cheaper than randrange(),
+    # uniform() and choice(), which matters at tens of millions of rows.
+    draw = rng.random
+    for day in range(history_days, 0, -1):
+        midnight = end - timedelta(days=day)
+        for _ in range(per_day):
+            amount = round(20 + 2980 * draw(), 2)
+            incomes.append({'user_id': user_id, 'amount': amount,
+                            'date': midnight + timedelta(seconds=int(86400 * draw())),
+                            'category': INCOME_CATEGORIES[int(len(INCOME_CATEGORIES) * draw())]})
+            total_income += amount
+
+            amount = round(1 + 399 * draw(), 2)
+            expenses.append({'user_id': user_id, 'amount': amount,
+                             'date': midnight + timedelta(seconds=int(86400 * draw())),
+                             'category': EXPENSE_CATEGORIES[int(len(EXPENSE_CATEGORIES) * draw())]})
+            total_expenses += amount
+
+            amount = round(1 + 249 * draw(), 2)
+            kind = 'withdraw' if draw() < 0.4 and balance >= amount else 'deposit'
+            balance = round(balance + amount if kind == 'deposit' else balance - amount, 2)
+            transactions.append({'user_id': user_id, 'type': kind, 'amount': amount,
+                                 'timestamp': midnight + timedelta(seconds=int(86400 * draw()))})
+
+    summary = {
+        'user_id': user_id,
+        'total_income': total_income,
+        'income_count': len(incomes),
+        'total_expenses': total_expenses,
+        'expense_count': len(expenses),
+        'savings_balance': balance,
+        'last_activity_at': max((row['date'] for row in incomes + expenses), default=None),
+    }
+    return incomes, expenses, transactions, summary
+
+
+def ensure_plan_catalog():
+    """Create the default saving plans if there are none; returns the plan ids."""
+    if db.session.execute(select(func.count(SavingPlan.id))).scalar() == 0:
+        db.session.execute(db.insert(SavingPlan), [dict(plan) for plan in PLAN_CATALOG])
+        db.session.commit()
+    return tuple(db.session.execute(select(SavingPlan.id).order_by(SavingPlan.id)).scalars())
+
+
+def seed_range(engine, lo, hi, seed, history_days, per_day, end, chunk_size, plan_ids=()):
+    """Write history, savings, rollups, cash-flow buckets and plan enrollments for user ids in [lo, hi).
+
+    Rows are buffered per table and flushed as executemany Core inserts in
+    their own transaction once ``chunk_size`` rows are pending. Returns the
+    number of rows written.
+    """
+    buffers = {Income: [], Expense: [], Transaction: [], Savings: [], FinancialSummary: [], DailyCashFlow: [],
+               SavingPlanEnrollment: []}
+    written = 0
+
+    def flush():
+        nonlocal written
+        with engine.begin() as conn:
+            for model, rows in buffers.items():
+                if rows:
+                    conn.execute(model.__table__.insert(), rows)
+                    written += len(rows)
+                    rows.clear()
+
+    pending = 0
+    for user_id in range(lo, hi):
+        incomes, expenses, transactions, summary = _user_rows(user_id, seed, history_days, per_day, end)
+        buffers[Income].extend(incomes)
+        buffers[Expense].extend(expenses)
+        buffers[Transaction].extend(transactions)
+        buffers[Savings].append({'user_id': user_id, 'balance': summary['savings_balance']})
+        buffers[FinancialSummary].append(summary)
+        buckets = daily_buckets(user_id, Income, ((row['date'], row['amount']) for row in incomes))
+        daily_buckets(user_id, Expense, ((row['date'], row['amount']) for row in expenses), buckets)
+        buffers[DailyCashFlow].extend(buckets.values())
+        if plan_ids:
+            rng = random.Random(f'{seed}:{user_id}:plan')
+            buffers[SavingPlanEnrollment].append({'user_id': user_id, 'plan_id': rng.choice(plan_ids),
+                                                  'contribution': round(rng.uniform(10, 500), 2),
+                                                  'enrolled_at': end})
+        pending += len(incomes) + len(expenses) + len(transactions) + len(buckets) + 3
+        if pending >= chunk_size:
+            flush()
+            pending = 0
+    flush()
+    return written
+
+
+def _seed_range_in_process(url, *args):
+    # Slices write concurrently; on SQLite they queue on the file lock.
+    engine = create_engine(url, connect_args={'timeout': 300} if url.startswith('sqlite') else {})
+    try:
+        return seed_range(engine, *args)
+    finally:
+        engine.dispose()
+
+
+def seed(users, history_days, seed=0, per_day=1, end=None, chunk_size=20_000, processes=1):
+    """Append ``users`` synthetic users with ``history_days`` of history each.
+
+    New users get ids after the current maximum, share a single
+    precomputed password hash (``TEMPLATE_PASSWORD``) and are each enrolled
+    in one plan from the catalog (created from ``PLAN_CATALOG`` if empty). With ``processes > 1``
+    the id range is split into contiguous slices generated by a spawned
+    process pool; the data is the same either way. Returns
+    ``(first_user_id, rows_written)``.
+    """
+    if processes > 1 and db.engine.url.get_backend_name() == 'sqlite' \
+            and db.engine.url.database in (None, '', ':memory:'):
+        raise ValueError('an in-memory SQLite database cannot be shared with worker processes')
+    end = end or datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+    first = (db.session.execute(select(func.max(User.id))).scalar() or 0) + 1
+    password_hash = password_hasher.hash(TEMPLATE_PASSWORD)
+
+    for lo in range(first, first + users, chunk_size):
+        hi = min(lo + chunk_size, first + users)
+        db.session.execute(db.insert(User), [
+            {'id': user_id, 'email': f'user{user_id}@example.com', 'password_hash': password_hash}
+            for user_id in range(lo, hi)
+        ])
+        db.session.commit()
+
+    args = (seed, history_days, per_day, end, chunk_size, ensure_plan_catalog())
+    processes = max(1, min(processes, users))
+    if processes == 1:
+        return first, users + seed_range(db.engine, first, first + users, *args)
+
+    step = -(-users // processes)
+    bounds = [(lo, min(lo + step, first + users)) for lo in range(first, first + users, step)]
+    url = db.engine.url.render_as_string(hide_password=False)
+    with ProcessPoolExecutor(len(bounds), mp_context=multiprocessing.get_context('spawn')) as pool:
+        written = sum(pool.map(_seed_range_in_process, *zip(*[(url, lo, hi) + args for lo, hi in bounds])))
+    return first, users + written
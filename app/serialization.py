@@ -0,0 +1,96 @@
+# serialization.py
+import dataclasses
+import decimal
+import uuid
+from datetime import date, datetime, time
+from flask.json.provider import DefaultJSONProvider
+from sqlalchemy.engine import Row, RowMapping
+
+try:
+    import orjson
+except ImportError:  # optional: the stdlib encoder is used instead
+    orjson = None
+
+ENCODERS = ('auto', 'orjson', 'stdlib')
+
+
+def _default(obj):
+    """Types neither encoder handles on its own, the same way for both."""
+    if isinstance(obj, Row):
+        return dict(zip(obj._fields, obj))
+    if isinstance(obj, RowMapping):
+        return dict(obj)
+    if isinstance(obj, (datetime, date, time)):
+        return obj.isoformat()
+    if isinstance(obj, decimal.Decimal):
+        return str(obj)
+    if isinstance(obj, uuid.UUID):
+        return str(obj)
+    if dataclasses.is_dataclass(obj) and not isinstance(obj, type):
+        return dataclasses.asdict(obj)
+    if hasattr(obj, '__html__'):
+        return str(obj.__html__())
+    raise TypeError(f'Object of type {type(obj).__name__} is not JSON serializable')
+
+
+class FastJSONProvider(DefaultJSONProvider):
+    """Flask's JSON provider, encoding with orjson when it is installed.
+
+    Query rows can be returned as-is: ``Row`` objects become dicts keyed by
+    column label, datetimes ISO 8601 strings (the format the API already
+    used) and Decimals strings, whichever encoder runs. Responses are
+    encoded straight to bytes. Anything orjson refuses, such as integers
+    wider than 64 bits, is encoded by the stdlib instead.
+    """
+
+    default = staticmethod(_default)
+
+    def __init__(self, app, encoder='auto'):
+        super().__init__(app)
+        if encoder not in ENCODERS:
+            raise ValueError(f"JSON_ENCODER must be one of {', '.join(ENCODERS)}")
+        if encoder == 'orjson' and orjson is None:
+            raise RuntimeError('JSON_ENCODER is orjson but orjson is not installed')
+        self.use_orjson = orjson is not None and encoder != 'stdlib'
+
+    def _options(self, indent=False):
+        option = orjson.OPT_NON_STR_KEYS
+        if self.sort_keys:
+            option |= orjson.OPT_SORT_KEYS
+        if indent:
+            option |= orjson.OPT_INDENT_2
+        return option
+
+    def dumps(self, obj, **kwargs):
+        if self.use_orjson and not kwargs:
+            try:
+                return orjson.dumps(obj, default=self.default, option=self._options()).decode()
+            except TypeError:
+                pass
+        return super().dumps(obj, **kwargs)
+
+    def loads(self, s, **kwargs):
+        if self.use_orjson and not kwargs:
+            return orjson.loads(s)
+        return super().loads(s, **kwargs)
+
+    def response(self, *args, **kwargs):
+        if not self.use_orjson:
+            return super().response(*args, **kwargs)
+        obj = self._prepare_response_obj(args, kwargs)
+        indent = (self.compact is None and self._app.debug) or self.compact is False
+        try:
+            body = orjson.dumps(obj, default=self.default, option=self._options(indent) | orjson.OPT_APPEND_NEWLINE)
+        except TypeError:
+            layout = {'indent': 2} if indent else {'separators': (',', ':')}
+            body = f'{super().dumps(obj, **layout)}\n'
+        return self._app.response_class(body, mimetype=self.mimetype)
+
+
+def configure_json(app):
+    """Install the provider chosen by JSON_ENCODER on ``app``.
+
+    Must run before anything wraps ``app.json`` (metrics times whichever
+    provider it finds).
+    """
+    app.json = FastJSONProvider(app, app.config['JSON_ENCODER'])
@@ -1,30 +1,27 @@
 import logging
-from flask_mail import Message
-from . import mail
+from .outbox import enqueue
 
 logger = logging.getLogger(__name__)
 
-def send_contact_message(data):
-    try:
-        msg = Message(
-            subject="New Contact Message",
-            sender=data['email'],
-            recipients=["example@example.com"],
-            body=f"Name: {data['name']}\nEmail: {data['email']}\nMessage: {data['message']}"
-        )
-        mail.send(msg)
-        
-        # Send confirmation email to the sender
-        confirmation_msg = Message(
-            subject="Your Message Received",
-            sender="noreply@yourdomain.com",
-            recipients=[data['email']],
-            body="Thank you for contacting us. We have received your message and will get back to you shortly."
-        )
-        mail.send(confirmation_msg)
-        
-        logger.debug("Emails sent successfully.")
-        return True, ""
-    except Exception as e:
-        logger.error(f"Email sending error: {str(e)}")
-        return False, str(e)
+def queue_contact_message(data):
+    """Queue the notification and confirmation emails for a contact message.
+
+    The rows are only added to the session; the caller commits them together
+    with the ContactMessage so neither can exist without the other. Delivery
+    happens out of band (``flask outbox work``).
+    """
+    enqueue(
+        subject="New Contact Message",
+        sender=data['email'],
+        recipients=["example@example.com"],
+        body=f"Name: {data['name']}\nEmail: {data['email']}\nMessage: {data['message']}"
+    )
+
+    # Confirmation email to the sender
+    enqueue(
+        subject="Your Message Received",
+        sender="noreply@yourdomain.com",
+        recipients=[data['email']],
+        body="Thank you for contacting us. We have received your message and will get back to you shortly."
+    )
+    logger.debug("Emails queued.")
@@ -0,0 +1,100 @@
+"""A tiny in-process SMTP server for exercising real SMTP delivery.
+
+Used by the test suite and the outbox benchmark; nothing in the app
+imports it.
+
+It speaks just enough of RFC 5321 for smtplib: every accepted message is
+kept in ``messages``; ``delay`` slows each handshake and message down, and
+``fail_next`` makes the next N messages fail with a transient 451.
+"""
+import email
+import socketserver
+import threading
+import time
+
+
+class _Handler(socketserver.StreamRequestHandler):
+
+    def _reply(self, line):
+        self.wfile.write(line.encode() + b'\r\n')
+
+    def handle(self):
+        stub = self.server.stub
+        with stub.lock:
+            stub.connections += 1
+        time.sleep(stub.delay)
+        self._reply('220 stub ESMTP')
+        envelope_from, recipients = None, []
+        while True:
+            line = self.rfile.readline()
+            if not line:
+                return
+            command = line.decode().strip()
+            verb = command.split(' ', 1)[0].upper()
+            if verb in ('EHLO', 'HELO'):
+                self._reply('250 stub')
+            elif verb == 'MAIL':
+                envelope_from, recipients = command.split(':', 1)[1].strip(), []
+                self._reply('250 OK')
+            elif verb == 'RCPT':
+                recipients.append(command.split(':', 1)[1].strip())
+                self._reply('250 OK')
+            elif verb == 'DATA':
+                self._reply('354 End data with <CR><LF>.<CR><LF>')
+                data = []
+                for raw in iter(self.rfile.readline, b''):
+                    if raw in (b'.\r\n', b'.\n'):
+                        break
+                    data.append(raw[1:] if raw.startswith(b'..') else raw)
+                time.sleep(stub.delay)
+                with stub.lock:
+                    failing = stub.fail_next > 0
+                    if failing:
+                        stub.fail_next -= 1
+                    else:
+                        stub.messages.append((envelope_from, recipients, email.message_from_bytes(b''.join(data))))
+                self._reply('451 Try again later' if failing else '250 Queued')
+            elif verb in ('RSET', 'NOOP'):
+                self._reply('250 OK')
+            elif verb == 'QUIT':
+                self._reply('221 Bye')
+                return
+            else:
+                self._reply('502 Command not implemented')
+
+
+class SMTPStub:
+
+    def __init__(self, delay=0.0):
+        self.delay = delay
+        self.fail_next = 0
+        self.messages = []
+        self.connections = 0
+        self.lock = threading.Lock()
+        self._server = None
+
+    def start(self):
+        self._server = socketserver.ThreadingTCPServer(('127.0.0.1', 0), _Handler)
+        self._server.daemon_threads = True
+        self._server.stub = self
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+        return self
+
+    @property
+    def port(self):
+        return self._server.server_address[1]
+
+    def mail_config(self):
+        return {
+            'MAIL_SERVER': '127.0.0.1',
+            'MAIL_PORT': self.port,
+            'MAIL_USE_TLS': False,
+            'MAIL_USE_SSL': False,
+            'MAIL_USERNAME': None,
+            'MAIL_PASSWORD': None,
+            'MAIL_SUPPRESS_SEND': False,
+        }
+
+    def stop(self):
+        self._server.shutdown()
+        self._server.server_close()
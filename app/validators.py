@@ -1,5 +1,13 @@
+import math
 import re
-from email_validator import validate_email as validate_email_validator, EmailNotValidError
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from typing import NamedTuple, Optional
+from email_validator import validate_email as validate_email_validator, EmailNotValidError, EmailUndeliverableError
+from email_validator.deliverability import validate_email_deliverability
+from flask import current_app, has_app_context
 
 # def validate_amount(amount):
 #     try:
@@ -14,23 +22,166 @@ def validate_amount(amount):
     errors = []
     try:
         value = float(amount)
-        if value <= 0:
+        if not math.isfinite(value):
+            errors.append("Amount must be a finite number")
+        elif value <= 0:
             errors.append("Amount must be greater than 0")
-    except ValueError:
+    except (TypeError, ValueError):
         errors.append("Invalid amount format")
     return errors
 
 
-def validate_email(email):
-    try:
-        validate_email_validator(email)
-        return True
-    except EmailNotValidError:
-        return False
+PHONE_NUMBER_PATTERN = re.compile(r'^\+?254\d{9}$')
+
+
+class EmailCheck(NamedTuple):
+    email: str
+    valid: bool
+    normalized: Optional[str] = None
+    reason: Optional[str] = None
+
+
+class DomainCache:
+    """Thread-safe LRU of per-domain results, each with its own expiry."""
+
+    def __init__(self, maxsize=4096):
+        self.maxsize = maxsize
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, domain):
+        """The cached value, or None if missing or expired."""
+        with self._lock:
+            entry = self._entries.get(domain)
+            if entry is None:
+                return None
+            expires_at, value = entry
+            if expires_at <= time.monotonic():
+                del self._entries[domain]
+                return None
+            self._entries.move_to_end(domain)
+            return value
+
+    def set(self, domain, value, ttl):
+        with self._lock:
+            self._entries[domain] = (time.monotonic() + ttl, value)
+            self._entries.move_to_end(domain)
+            while len(self._entries) > self.maxsize:
+                self._entries.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class EmailChecker:
+    """Email validation without DNS on the hot path.
+
+    Syntax is always checked locally. With EMAIL_CHECK_DELIVERABILITY the
+    domain's MX/A records are looked up too, bounded by EMAIL_DNS_TIMEOUT and
+    cached per domain: definite answers for EMAIL_DOMAIN_CACHE_TTL seconds,
+    "could not tell" (timeouts, resolver failures) for
+    EMAIL_DOMAIN_FAILURE_TTL seconds. Addresses whose domain could not be
+    checked are accepted.
+    """
+
+    def __init__(self, app=None):
+        self.check_deliverability = True
+        self.timeout = 2.0
+        self.ttl = 3600
+        self.failure_ttl = 60
+        self.cache = DomainCache()
+        if app is not None:
+            self.init_app(app)
+
+    def init_app(self, app):
+        self.check_deliverability = app.config['EMAIL_CHECK_DELIVERABILITY']
+        self.timeout = app.config['EMAIL_DNS_TIMEOUT']
+        self.ttl = app.config['EMAIL_DOMAIN_CACHE_TTL']
+        self.failure_ttl = app.config['EMAIL_DOMAIN_FAILURE_TTL']
+        self.cache = DomainCache(app.config['EMAIL_DOMAIN_CACHE_SIZE'])
+        app.extensions['email_checker'] = self
+
+    def _syntax(self, email):
+        if not isinstance(email, str):
+            return EmailCheck(email, False, reason="Email must be a string"), None
+        try:
+            result = validate_email_validator(email, check_deliverability=False)
+        except EmailNotValidError as e:
+            return EmailCheck(email, False, reason=str(e)), None
+        return EmailCheck(email, True, normalized=result.normalized), result
+
+    def _lookup(self, domain, domain_i18n):
+        """``None`` if deliverable or unknown, else the reason; cached."""
+        cached = self.cache.get(domain)
+        if cached is not None:
+            return cached[0]
+        try:
+            info = validate_email_deliverability(domain, domain_i18n, timeout=self.timeout)
+            reason, ttl = None, (self.failure_ttl if 'unknown-deliverability' in info else self.ttl)
+        except EmailUndeliverableError as e:
+            reason, ttl = str(e), self.ttl
+        except Exception:  # resolver misconfigured or unavailable: treat as unknown
+            reason, ttl = None, self.failure_ttl
+        self.cache.set(domain, (reason,), ttl)
+        return reason
+
+    def check(self, email, check_deliverability=None):
+        check, parsed = self._syntax(email)
+        deliverability = self.check_deliverability if check_deliverability is None else check_deliverability
+        if parsed is None or not deliverability:
+            return check
+        reason = self._lookup(parsed.ascii_domain, parsed.domain)
+        return check if reason is None else check._replace(valid=False, reason=reason)
+
+    def check_many(self, emails, check_deliverability=None, max_workers=8):
+        """Validate many addresses, looking each distinct domain up once.
+
+        Uncached domains are resolved concurrently on up to ``max_workers``
+        threads; results come back in input order.
+        """
+        parsed = [self._syntax(email) for email in emails]
+        deliverability = self.check_deliverability if check_deliverability is None else check_deliverability
+        if not deliverability:
+            return [check for check, _ in parsed]
+
+        domains = {result.ascii_domain: result.domain for _, result in parsed if result is not None}
+        if domains:
+            with ThreadPoolExecutor(min(max_workers, len(domains))) as pool:
+                reasons = dict(zip(domains, pool.map(self._lookup, domains, domains.values())))
+        return [
+            check if result is None or reasons[result.ascii_domain] is None
+            else check._replace(valid=False, reason=reasons[result.ascii_domain])
+            for check, result in parsed
+        ]
+
+
+_default_checker = EmailChecker()
+
+
+def current_email_checker():
+    """The app's EmailChecker, or a module default outside an app."""
+    if has_app_context():
+        checker = current_app.extensions.get('email_checker')
+        if checker is not None:
+            return checker
+    return _default_checker
+
+
+def validate_email(email, check_deliverability=None):
+    """True if ``email`` is valid; deliverability follows the app's config unless given."""
+    return current_email_checker().check(email, check_deliverability).valid
+
+
+def validate_emails(emails, check_deliverability=None):
+    """Batch form of ``validate_email``: a list of ``EmailCheck`` in input order."""
+    return current_email_checker().check_many(emails, check_deliverability)
+
 
 def validate_phone_number(phone_number):
-    pattern = re.compile(r'^\+?254\d{9}$')
-    return bool(pattern.match(phone_number))
+    if not isinstance(phone_number, str):
+        return False
+    return bool(PHONE_NUMBER_PATTERN.match(phone_number))
 
 def validate_contact_form(data):
     errors = []
@@ -40,9 +191,7 @@ def validate_contact_form(data):
         errors.append("Invalid name")
     
     email = data.get('email')
-    try:
-        validate_email(email)
-    except EmailNotValidError:
+    if not validate_email(email):
         errors.append("Invalid email")
     
     message = data.get('message')
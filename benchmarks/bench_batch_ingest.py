@@ -0,0 +1,42 @@
+"""Compare one-request-per-row income inserts with the batch endpoint on SQLite.
+
+    python -m benchmarks.bench_batch_ingest --rows 2000 --batch-size 500
+"""
+import argparse
+from app import db
+from app.models import Income
+from .common import Timer, auth_headers, create_user, make_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000)
+    parser.add_argument('--batch-size', type=int, default=500)
+    args = parser.parse_args()
+
+    app = make_app()
+    client = app.test_client()
+    headers = auth_headers(app, create_user(app))
+
+    with Timer() as single:
+        for n in range(args.rows):
+            client.post('/api/income', json={'amount': n + 1}, headers=headers)
+
+    with Timer() as batch:
+        for start in range(0, args.rows, args.batch_size):
+            entries = [{'amount': n + 1, 'category': 'salary'}
+                       for n in range(start, min(start + args.batch_size, args.rows))]
+            response = client.post('/api/income/batch', json=entries, headers=headers)
+            assert response.status_code == 201, response.get_data(as_text=True)
+
+    with app.app_context():
+        assert db.session.query(Income).count() == 2 * args.rows
+
+    print(f"single inserts: {args.rows / single.elapsed:10.1f} rows/s ({single.elapsed:.2f}s)")
+    print(f"batch inserts:  {args.rows / batch.elapsed:10.1f} rows/s ({batch.elapsed:.2f}s, "
+          f"{args.batch_size} per request)")
+    print(f"speed-up:       {single.elapsed / batch.elapsed:10.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,53 @@
+"""CPU spent compressing responses against the bytes it saves, per level.
+
+Payloads are real response bodies for a seeded user: a full /api/finances
+page, a /api/savings/history page and the whole NDJSON export. Each is
+compressed the way the middleware does it, once per encoding and level.
+"Time" is per response; the last column is compression throughput over
+the uncompressed size.
+
+    python -m benchmarks.bench_compression --repeat 50
+"""
+import argparse
+import time
+from app import seeding
+from app.compression import brotli, encode
+from flask_jwt_extended import create_access_token
+from .common import make_app
+
+SETTINGS = [('gzip', level) for level in (1, 3, 6, 9)] + [('deflate', 6)]
+if brotli is not None:
+    SETTINGS += [('br', quality) for quality in (1, 4, 9)]
+
+
+def payloads(app):
+    with app.app_context():
+        first, _ = seeding.seed(1, 200, per_day=3)
+        headers = {'Authorization': f'Bearer {create_access_token(identity=str(first))}'}
+    client = app.test_client()
+    paths = {'finances (500)': '/api/finances?limit=500',
+             'savings/history (500)': '/api/savings/history?limit=500',
+             'export.ndjson': '/api/export?format=ndjson'}
+    return {name: client.get(path, headers=headers).get_data() for name, path in paths.items()}
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--repeat', type=int, default=50)
+    args = parser.parse_args()
+
+    app = make_app(COMPRESS_ENABLED=False)
+    for name, data in payloads(app).items():
+        print(f"{name:<22} identity {len(data) / 1024:9.1f}KiB")
+        for encoding, level in SETTINGS:
+            started = time.perf_counter()
+            for _ in range(args.repeat):
+                size = len(encode(data, encoding, level, level))
+            per_response = (time.perf_counter() - started) / args.repeat
+            label = f'{encoding} {level}'
+            print(f"{'':<22} {label:<9}{size / 1024:9.1f}KiB  saved {1 - size / len(data):6.1%} "
+                  f"{per_response * 1000:8.2f}ms {len(data) / per_response / 2 ** 20:7.1f}MiB/s")
+
+
+if __name__ == '__main__':
+    main()
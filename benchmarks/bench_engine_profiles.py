@@ -0,0 +1,100 @@
+"""Concurrent readers and writers against one SQLite file, per engine profile.
+
+Each profile gets a freshly seeded database and a set of worker processes,
+each with its own app and connection pool, the way a multi-worker server
+would run. Writers post income, readers page /api/finances and load the
+dashboard; lock errors and 5xx responses are counted as errors.
+
+    python -m benchmarks.bench_engine_profiles --writers 4 --readers 4 --duration 10
+"""
+import argparse
+import logging
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from app import seeding
+from .common import auth_headers, make_app, summarize
+
+READS = ('/api/finances?limit=50', '/api/dashboard')
+
+
+def worker(uri, profile, role, threads, users, duration, seed_value):
+    logging.disable(logging.CRITICAL)
+    app = make_app(uri, DB_ENGINE_PROFILE=profile, METRICS_ENABLED=False)
+    headers = [auth_headers(app, user_id) for user_id in range(1, users + 1)]
+    latencies, errors, lock = [], [0], threading.Lock()
+    deadline = time.perf_counter() + duration
+
+    def loop(n):
+        rng = random.Random(seed_value * 1000 + n)
+        client = app.test_client()
+        local, failed = [], 0
+        while time.perf_counter() < deadline:
+            user_headers = rng.choice(headers)
+            started = time.perf_counter()
+            try:
+                if role == 'write':
+                    response = client.post('/api/income', json={'amount': 10}, headers=user_headers)
+                else:
+                    response = client.get(rng.choice(READS), headers=user_headers)
+                ok = response.status_code < 500
+            except Exception:  # "database is locked" propagates under TESTING
+                ok = False
+            local.append(time.perf_counter() - started)
+            failed += not ok
+        with lock:
+            latencies.extend(local)
+            errors[0] += failed
+
+    pool = [threading.Thread(target=loop, args=(n,)) for n in range(threads)]
+    for thread in pool:
+        thread.start()
+    for thread in pool:
+        thread.join()
+    return role, latencies, errors[0]
+
+
+def run(profile, args):
+    handle, path = tempfile.mkstemp(suffix='.db', prefix=f'healthfin-{profile}-')
+    os.close(handle)
+    uri = f'sqlite:///{path}'
+    app = make_app(uri, DB_ENGINE_PROFILE=profile)
+    with app.app_context():
+        seeding.seed(args.users, args.history, seed=0)
+
+    jobs = [(uri, profile, 'write', args.threads, args.users, args.duration, n) for n in range(args.writers)]
+    jobs += [(uri, profile, 'read', args.threads, args.users, args.duration, 100 + n) for n in range(args.readers)]
+    with multiprocessing.get_context('spawn').Pool(len(jobs)) as pool:
+        results = pool.starmap(worker, jobs)
+
+    for role in ('write', 'read'):
+        samples = [s for r, latencies, _ in results if r == role for s in latencies]
+        errors = sum(e for r, _, e in results if r == role)
+        if samples:
+            summarize(f"{profile:<8} {role}s", samples, args.duration)
+            print(f"{'':<28} errors={errors}")
+    for suffix in ('', '-wal', '-shm'):
+        if os.path.exists(path + suffix):
+            os.remove(path + suffix)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--profiles', nargs='+', default=['default', 'sqlite'], choices=['default', 'sqlite'])
+    parser.add_argument('--writers', type=int, default=4, help='writer processes')
+    parser.add_argument('--readers', type=int, default=4, help='reader processes')
+    parser.add_argument('--threads', type=int, default=2, help='threads per process')
+    parser.add_argument('--users', type=int, default=50)
+    parser.add_argument('--history', type=int, default=200, help='days of seeded history per user')
+    parser.add_argument('--duration', type=float, default=10.0, help='seconds per profile')
+    args = parser.parse_args()
+
+    for profile in args.profiles:
+        run(profile, args)
+
+
+if __name__ == '__main__':
+    main()
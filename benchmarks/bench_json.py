@@ -0,0 +1,55 @@
+"""JSON serialization of finance list pages: stdlib vs orjson, dicts vs rows.
+
+Pages come from the real keyset queries over a seeded user, so the payloads
+have the same shapes and value types as /api/finances and
+/api/savings/history. "dicts" builds a dict per row with isoformat() dates
+first, as the handlers used to; "rows" hands the query rows straight to the
+provider.
+
+    python -m benchmarks.bench_json --limit 500 --repeat 500
+"""
+import argparse
+import time
+from werkzeug.datastructures import MultiDict
+from app import db, seeding
+from app.pagination import PageParams, finances_page, savings_history_page
+from app.serialization import FastJSONProvider
+from .common import make_app
+
+
+def as_dicts(rows):
+    return [{key: value.isoformat() if hasattr(value, 'isoformat') else value
+             for key, value in row._mapping.items()} for row in rows]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--limit', type=int, default=500, help='rows per page')
+    parser.add_argument('--repeat', type=int, default=500)
+    args = parser.parse_args()
+
+    app = make_app(PAGE_SIZE_MAX=args.limit)
+    with app.app_context():
+        first, _ = seeding.seed(1, max(30, args.limit // 2), per_day=3)
+        params = PageParams(MultiDict({'limit': args.limit}), args.limit, args.limit)
+        pages = {'finances': finances_page(first, params)[0],
+                 'savings/history': savings_history_page(first, params)[0]}
+
+        for name, rows in pages.items():
+            baseline = None
+            for encoder in ('stdlib', 'orjson'):
+                provider = FastJSONProvider(app, encoder)
+                for shape in ('dicts', 'rows'):
+                    started = time.perf_counter()
+                    for _ in range(args.repeat):
+                        items = as_dicts(rows) if shape == 'dicts' else rows
+                        size = len(provider.response({'items': items, 'next_cursor': None,
+                                                      'prev_cursor': None}).get_data())
+                    per_page = (time.perf_counter() - started) / args.repeat
+                    baseline = baseline or per_page
+                    print(f"{name:<16} {encoder:<7} {shape:<6} {len(rows):5} rows {size / 1024:7.1f}KiB "
+                          f"{per_page * 1e6:9.1f}us/page  {baseline / per_page:5.1f}x")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,58 @@
+"""Throughput of the batch loan scorer over a seeded database.
+
+Seeds users with cash-flow history, files ``--applications`` pending loan
+applications spread over them, then scores everything once per worker
+count, resetting the applications to pending between runs.
+
+    python -m benchmarks.bench_loan_scoring --applications 100000 --workers 0 2 4
+"""
+import argparse
+import random
+import time
+from datetime import datetime
+from app import db, loans, seeding
+from app.models import LoanApplication
+from .common import make_app
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--applications', type=int, default=100_000)
+    parser.add_argument('--users', type=int, default=20_000)
+    parser.add_argument('--history', type=int, default=30, help='days of seeded history per user')
+    parser.add_argument('--chunk-size', type=int, default=5000)
+    parser.add_argument('--workers', type=int, nargs='+', default=[0, 2, 4])
+    args = parser.parse_args()
+
+    app = make_app()
+    with app.app_context():
+        started = time.perf_counter()
+        end = datetime.utcnow().replace(hour=0, minute=0, second=0, microsecond=0)
+        seeding.seed(args.users, args.history, end=end)
+        rng = random.Random(0)
+        rows = [{
+            'user_id': rng.randint(1, args.users), 'first_name': 'Jane', 'last_name': 'Doe',
+            'email_address': 'jane@example.com', 'phone_number': '+254712345678',
+            'required_treatment': 'Surgery', 'healthcare_provider': 'Clinic',
+            'estimated_cost': round(rng.uniform(100, 20_000), 2), 'term_months': rng.choice([6, 12, 24, 36]),
+            'application_date': end, 'status': loans.PENDING,
+        } for _ in range(args.applications)]
+        for lo in range(0, len(rows), 20_000):
+            db.session.execute(db.insert(LoanApplication), rows[lo:lo + 20_000])
+        db.session.commit()
+        print(f"seeded {args.users} users and {args.applications} applications "
+              f"in {time.perf_counter() - started:.1f}s")
+
+        for workers in args.workers:
+            db.session.execute(db.update(LoanApplication).values(status=loans.PENDING))
+            db.session.commit()
+            started = time.perf_counter()
+            counts = loans.score_pending(chunk_size=args.chunk_size, workers=workers)
+            elapsed = time.perf_counter() - started
+            total = sum(counts.values())
+            print(f"workers={workers:<3} {total} scored in {elapsed:6.2f}s {total / elapsed:10.0f} apps/s  "
+                  + ' '.join(f"{status}={count}" for status, count in sorted(counts.items())))
+
+
+if __name__ == '__main__':
+    main()
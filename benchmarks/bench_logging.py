@@ -0,0 +1,50 @@
+"""Request overhead of logging at each level, queued vs written inline.
+
+Posts an invalid contact form, which logs three DEBUG records and touches no
+table, so the difference between rows is the logging itself. Records go to a
+throwaway file.
+
+    python -m benchmarks.bench_logging --requests 3000
+"""
+import argparse
+import os
+import tempfile
+import time
+from app import log_pipeline
+from .common import make_app, summarize
+
+INVALID = {'name': '', 'email': 'jane@example.com', 'message': 'My knee hurts'}
+
+
+def run(level, asynchronous, requests, path):
+    app = make_app(LOG_LEVEL=level, LOG_ASYNC=asynchronous, LOG_FILE=path, METRICS_ENABLED=False)
+    client = app.test_client()
+    for _ in range(50):
+        client.post('/api/send-message', json=INVALID)
+    samples = []
+    started = time.perf_counter()
+    for _ in range(requests):
+        before = time.perf_counter()
+        client.post('/api/send-message', json=INVALID)
+        samples.append(time.perf_counter() - before)
+    total = time.perf_counter() - started
+    log_pipeline.stop()
+    return samples, total
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000)
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        path = os.path.join(directory, 'app.log')
+        for level in ('DEBUG', 'INFO', 'WARNING', 'ERROR'):
+            for asynchronous in (False, True):
+                samples, total = run(level, asynchronous, args.requests, path)
+                summarize(f"{level} {'queued' if asynchronous else 'inline'}", samples, total)
+        print(f"{'':<28} {os.path.getsize(path) / 1024:.0f} KiB written")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Tail latency of a cheap endpoint while a login spike is in progress.
+
+Requests are served by a fixed number of worker threads, as a threaded
+WSGI server would. The same mixed burst of /api/login and /api/about-us
+requests is replayed with inline hashing and with the bounded hashing pool.
+
+    python -m benchmarks.bench_login_mix --logins 200 --static 400 --server-threads 4
+"""
+import argparse
+import random
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from app import password_hasher
+from .common import make_app, summarize
+
+CREDENTIALS = {'email': 'spike@example.com', 'password': 'correct horse battery staple'}
+
+
+def run(label, args, **hash_config):
+    app = make_app(PASSWORD_HASH_METHOD=args.method, **hash_config)
+    password_hasher.init_app(app)
+    app.test_client().post('/api/register', json=CREDENTIALS)
+
+    local = threading.local()
+
+    def serve(path, submitted):
+        client = getattr(local, 'client', None) or app.test_client()
+        local.client = client
+        if path == '/api/login':
+            status = client.post(path, json=CREDENTIALS).status_code
+        else:
+            status = client.get(path).status_code
+        return path, status, time.perf_counter() - submitted
+
+    burst = ['/api/login'] * args.logins + ['/api/about-us'] * args.static
+    random.Random(0).shuffle(burst)
+    with ThreadPoolExecutor(args.server_threads) as server:
+        started = time.perf_counter()
+        futures = [server.submit(serve, path, time.perf_counter()) for path in burst]
+        results = [f.result() for f in futures]
+        total = time.perf_counter() - started
+    password_hasher.shutdown()
+
+    static = [elapsed for path, _, elapsed in results if path == '/api/about-us']
+    logins = [elapsed for path, status, elapsed in results if path == '/api/login' and status == 200]
+    shed = sum(1 for path, status, _ in results if path == '/api/login' and status == 503)
+    print(f"--- {label}")
+    summarize('/api/about-us', static, total)
+    if logins:
+        summarize('/api/login (200)', logins, total)
+    print(f"{'':<28} {shed} login(s) shed with 503")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--logins', type=int, default=200)
+    parser.add_argument('--static', type=int, default=400)
+    parser.add_argument('--server-threads', type=int, default=4)
+    parser.add_argument('--method', default='scrypt:32768:8:1')
+    parser.add_argument('--pool-workers', type=int, default=2)
+    parser.add_argument('--queue-size', type=int, default=2)
+    args = parser.parse_args()
+
+    run('inline hashing on the request thread', args,
+        PASSWORD_HASH_WORKERS=0, PASSWORD_HASH_QUEUE_SIZE=args.logins + args.static)
+    run(f'process pool ({args.pool_workers} workers, queue {args.queue_size})', args,
+        PASSWORD_HASH_WORKERS=args.pool_workers, PASSWORD_HASH_QUEUE_SIZE=args.queue_size)
+
+
+if __name__ == '__main__':
+    main()
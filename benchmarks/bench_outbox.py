@@ -0,0 +1,69 @@
+"""Show that /api/send-message latency no longer depends on SMTP latency.
+
+For each simulated SMTP delay, client threads post contact messages while
+an outbox worker pool delivers them to a local SMTP stand-in.
+
+    python -m benchmarks.bench_outbox --requests 200 --delays 0 0.1 0.5
+"""
+import argparse
+import threading
+import time
+from app import db
+from app.models import EmailOutbox
+from app.outbox import OutboxWorkerPool, SENT
+from app.testing import SMTPStub
+from .common import make_app, summarize
+
+CONTACT = {'name': 'Bench', 'email': 'bench@example.com', 'message': 'Load test message'}
+
+
+def run(delay, requests, threads, workers):
+    smtp = SMTPStub(delay=delay).start()
+    app = make_app(**smtp.mail_config())
+    pool = OutboxWorkerPool(app, workers=workers, poll_interval=0.05).start()
+    latencies, lock = [], threading.Lock()
+
+    def client_thread(count):
+        client = app.test_client()
+        for _ in range(count):
+            started = time.perf_counter()
+            response = client.post('/api/send-message', json=CONTACT)
+            elapsed = time.perf_counter() - started
+            assert response.status_code == 200, response.get_data(as_text=True)
+            with lock:
+                latencies.append(elapsed)
+
+    started = time.perf_counter()
+    clients = [threading.Thread(target=client_thread, args=(requests // threads,)) for _ in range(threads)]
+    for thread in clients:
+        thread.start()
+    for thread in clients:
+        thread.join()
+    accepted = time.perf_counter() - started
+
+    expected = 2 * len(latencies)
+    with app.app_context():
+        while EmailOutbox.query.filter_by(status=SENT).count() < expected:
+            time.sleep(0.05)
+    delivered = time.perf_counter() - started
+    pool.stop()
+    smtp.stop()
+
+    summarize(f"smtp delay {delay * 1000:.0f}ms", latencies, accepted)
+    print(f"{'':<28} {expected} emails delivered after {delivered:.2f}s over "
+          f"{smtp.connections} SMTP connection(s)")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=200)
+    parser.add_argument('--threads', type=int, default=4)
+    parser.add_argument('--workers', type=int, default=2)
+    parser.add_argument('--delays', type=float, nargs='+', default=[0.0, 0.1, 0.5])
+    args = parser.parse_args()
+    for delay in args.delays:
+        run(delay, args.requests, args.threads, args.workers)
+
+
+if __name__ == '__main__':
+    main()
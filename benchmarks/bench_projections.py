@@ -0,0 +1,73 @@
+"""Vectorised savings projections against a naive month-by-month loop.
+
+    python -m benchmarks.bench_projections --rows 2000 --months 360 --scenarios 3
+    python -m benchmarks.bench_projections --users 5000   # also time the batch pass over a seeded DB
+"""
+import argparse
+import random
+import time
+import numpy as np
+from app import seeding
+from app.projections import PERIODS_PER_YEAR, contribution_schedule, project, project_all
+from .common import make_app
+
+
+def naive(rows, offsets, months):
+    curves = []
+    for balance, rate, contribution, frequency, term in rows:
+        per_year = PERIODS_PER_YEAR[frequency]
+        for offset in offsets:
+            value, curve = balance, []
+            for month in range(1, months + 1):
+                value *= 1 + (rate + offset) / 12
+                if term is None or month <= term:
+                    if per_year > 12:
+                        value += contribution * per_year / 12
+                    elif month % (12 // per_year) == 0:
+                        value += contribution
+                curve.append(value)
+            curves.append(curve)
+    return np.array(curves).reshape(len(rows), len(offsets), months)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--rows', type=int, default=2000, help='enrollments to project')
+    parser.add_argument('--months', type=int, default=360)
+    parser.add_argument('--scenarios', type=int, default=3)
+    parser.add_argument('--users', type=int, default=0, help='seed this many users and time project_all')
+    args = parser.parse_args()
+
+    rng = random.Random(0)
+    rows = [(rng.uniform(0, 5000), rng.uniform(0, 0.08), rng.uniform(10, 500),
+             rng.choice(list(PERIODS_PER_YEAR)), rng.choice([None, 24, 60])) for _ in range(args.rows)]
+    offsets = list(np.linspace(-0.01, 0.01, args.scenarios))
+    cells = args.rows * args.scenarios * args.months
+
+    started = time.perf_counter()
+    expected = naive(rows, offsets, args.months)
+    naive_seconds = time.perf_counter() - started
+
+    started = time.perf_counter()
+    balances, rates, contributions, frequencies, terms = zip(*rows)
+    curves = project(balances, rates, contribution_schedule(contributions, frequencies, terms, args.months), offsets)
+    vector_seconds = time.perf_counter() - started
+
+    np.testing.assert_allclose(curves, expected, rtol=1e-9)
+    print(f"{args.rows} rows x {args.scenarios} scenarios x {args.months} months = {cells:,} balances")
+    print(f"naive loop   {naive_seconds * 1000:10.1f}ms  {cells / naive_seconds:14,.0f} balances/s")
+    print(f"numpy        {vector_seconds * 1000:10.1f}ms  {cells / vector_seconds:14,.0f} balances/s"
+          f"  ({naive_seconds / vector_seconds:.0f}x)")
+
+    if args.users:
+        app = make_app()
+        with app.app_context():
+            seeding.seed(args.users, 1)
+            started = time.perf_counter()
+            projected = sum(len(user_ids) for user_ids, _, _ in project_all(args.months, offsets))
+            elapsed = time.perf_counter() - started
+        print(f"project_all  {elapsed * 1000:10.1f}ms  {projected} enrollments from the database")
+
+
+if __name__ == '__main__':
+    main()
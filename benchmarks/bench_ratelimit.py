@@ -0,0 +1,64 @@
+"""Per-check overhead of the rate limit storages.
+
+Times one sliding-window hit (what each limited request pays) against the
+in-process memory storage and the shared SQLite file, optionally with several
+processes checking the same file at once.
+
+    python -m benchmarks.bench_ratelimit --checks 20000 --clients 500
+    python -m benchmarks.bench_ratelimit --processes 4
+"""
+import argparse
+import multiprocessing
+import os
+import tempfile
+import time
+from limits import parse
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+import app  # noqa: F401 - registers the sqlite:// storage
+from .common import summarize
+
+
+def run_checks(uri, checks, clients, limit):
+    limiter = SlidingWindowCounterRateLimiter(storage_from_string(uri))
+    item = parse(limit)
+    samples, allowed = [], 0
+    started = time.perf_counter()
+    for n in range(checks):
+        before = time.perf_counter()
+        allowed += limiter.hit(item, f'10.0.{n % clients // 256}.{n % clients % 256}')
+        samples.append(time.perf_counter() - before)
+    return samples, allowed, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--checks', type=int, default=20000, help='hits per process')
+    parser.add_argument('--clients', type=int, default=500, help='distinct client addresses')
+    parser.add_argument('--limit', default='10 per minute')
+    parser.add_argument('--processes', type=int, default=1, help='processes sharing the SQLite file')
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as directory:
+        sqlite_uri = f"sqlite:///{os.path.join(directory, 'ratelimit.db')}"
+        for label, uri in (('memory://', 'memory://'), ('sqlite (1 process)', sqlite_uri)):
+            samples, allowed, total = run_checks(uri, args.checks, args.clients, args.limit)
+            summarize(label, samples, total)
+        storage_from_string(sqlite_uri).reset()
+
+        if args.processes > 1:
+            context = multiprocessing.get_context('spawn')
+            job = (sqlite_uri, args.checks, args.clients, args.limit)
+            started = time.perf_counter()
+            with context.Pool(args.processes) as pool:
+                results = pool.starmap(run_checks, [job] * args.processes)
+            total = time.perf_counter() - started
+            samples = [sample for result in results for sample in result[0]]
+            summarize(f'sqlite ({args.processes} processes)', samples, total)
+            allowed = sum(result[1] for result in results)
+            expected = args.clients * parse(args.limit).amount
+            print(f"{'':<28} {allowed} hits allowed (limit allows {min(expected, len(samples))})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,44 @@
+"""Per-request overhead saved by the stateless fast path.
+
+Runs the same token-authenticated and public requests with
+STATELESS_FAST_PATH on and off and reports the difference.
+
+    python -m benchmarks.bench_request_overhead --requests 3000
+"""
+import argparse
+import time
+from .common import auth_headers, create_user, make_app, summarize
+
+
+def measure(fast_path, requests):
+    app = make_app(STATELESS_FAST_PATH=fast_path)
+    headers = auth_headers(app, create_user(app))
+    client = app.test_client()
+    means = {}
+    for label, path, request_headers in (('/api/dashboard', '/api/dashboard', headers),
+                                         ('/api/about-us', '/api/about-us', {})):
+        client.get(path, headers=request_headers)
+        samples = []
+        for _ in range(requests):
+            started = time.perf_counter()
+            client.get(path, headers=request_headers)
+            samples.append(time.perf_counter() - started)
+        summarize(f"{label} fast_path={'on' if fast_path else 'off'}", samples)
+        means[label] = sum(samples) / len(samples)
+    return means
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--requests', type=int, default=3000)
+    args = parser.parse_args()
+
+    slow = measure(False, args.requests)
+    fast = measure(True, args.requests)
+    for label in slow:
+        saved = slow[label] - fast[label]
+        print(f"{label:<28} saves {saved * 1e6:8.1f}us per request ({saved / slow[label]:.0%})")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,68 @@
+"""Hammer one savings account from many threads and check the final balance.
+
+    python -m benchmarks.bench_savings_postings --threads 16 --postings 100
+"""
+import argparse
+import random
+import threading
+import time
+from app import db
+from app.models import Savings, Transaction
+from .common import auth_headers, create_user, make_app, summarize
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--threads', type=int, default=16)
+    parser.add_argument('--postings', type=int, default=100, help='postings per thread')
+    parser.add_argument('--opening-balance', type=float, default=1000.0)
+    args = parser.parse_args()
+
+    app = make_app()
+    headers = auth_headers(app, create_user(app))
+    client = app.test_client()
+    client.post('/api/savings/deposit', json={'amount': args.opening_balance}, headers=headers)
+
+    latencies, results, lock = [], {'deposit': 0, 'withdraw': 0, 'rejected': 0, 'errors': 0}, threading.Lock()
+
+    def hammer(seed):
+        rng = random.Random(seed)
+        client = app.test_client()
+        for _ in range(args.postings):
+            kind = rng.choice(('deposit', 'withdraw'))
+            started = time.perf_counter()
+            response = client.post(f'/api/savings/{kind}', json={'amount': 25}, headers=headers)
+            elapsed = time.perf_counter() - started
+            with lock:
+                latencies.append(elapsed)
+                if response.status_code == 200:
+                    results[kind] += 1
+                elif response.status_code == 400:
+                    results['rejected'] += 1
+                else:
+                    results['errors'] += 1
+
+    threads = [threading.Thread(target=hammer, args=(n,)) for n in range(args.threads)]
+    started = time.perf_counter()
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    total = time.perf_counter() - started
+
+    expected = args.opening_balance + 25 * (results['deposit'] - results['withdraw'])
+    with app.app_context():
+        balance = db.session.execute(db.select(Savings.balance)).scalar_one()
+        ledger_rows = db.session.query(Transaction).count()
+
+    summarize(f"{args.threads} threads, hot account", latencies, total)
+    print(f"deposits={results['deposit']} withdrawals={results['withdraw']} "
+          f"insufficient={results['rejected']} errors={results['errors']}")
+    print(f"final balance {balance:.2f}, expected {expected:.2f}; "
+          f"ledger rows {ledger_rows}, expected {1 + results['deposit'] + results['withdraw']}")
+    if balance != expected or ledger_rows != 1 + results['deposit'] + results['withdraw']:
+        raise SystemExit("LOST UPDATE: balance does not match the accepted postings")
+
+
+if __name__ == '__main__':
+    main()
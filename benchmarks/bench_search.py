@@ -0,0 +1,111 @@
+"""Support inbox search: the FTS5 index against LIKE scans.
+
+Fills contact_message with synthetic messages (Zipf-distributed words, so
+some terms are in most messages and others in a handful) and times one page
+of results per query: FTS5 ranked by bm25, FTS5 newest first, and the
+``LIKE '%word%'`` over name, email and message that support used to run
+by hand. Inserts go through the sync triggers, so the load rate includes
+the cost of indexing.
+
+    python -m benchmarks.bench_search --messages 1000000
+    # reuse a filled database between runs
+    python -m benchmarks.bench_search --db /tmp/inbox.db
+"""
+import argparse
+import itertools
+import os
+import random
+import tempfile
+import time
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, select
+from werkzeug.datastructures import MultiDict
+from app import db
+from app.models import ContactMessage
+from app.search import SearchParams, search_messages
+from .common import make_app, summarize
+
+TOPICS = ['loan', 'payment', 'savings', 'knee', 'dental', 'invoice', 'refund', 'appointment',
+          'insurance', 'surgery', 'balance', 'account', 'plan', 'interest', 'clinic', 'password']
+VOCABULARY = TOPICS + [f'term{n}' for n in range(20_000)]
+CUM_WEIGHTS = list(itertools.accumulate(1 / (rank + 1) for rank in range(len(VOCABULARY))))
+START = datetime(2020, 1, 1)
+
+QUERIES = [
+    ('common word', 'loan'),
+    ('two words', 'knee payment'),
+    ('rare word', 'term15432'),
+    ('prefix', 'term1543*'),
+    ('email', 'user4242@example.com'),
+]
+
+
+def fill(app, messages, chunk_size=20_000):
+    rng = random.Random(0)
+    table = ContactMessage.__table__
+    started = time.perf_counter()
+    with app.app_context():
+        for lo in range(0, messages, chunk_size):
+            db.session.execute(table.insert(), [{
+                'name': f'User {n}',
+                'email': f'user{n}@example.com',
+                'message': ' '.join(rng.choices(VOCABULARY, cum_weights=CUM_WEIGHTS, k=rng.randint(8, 40))),
+                'timestamp': START + timedelta(minutes=n),
+            } for n in range(lo, min(lo + chunk_size, messages))])
+            db.session.commit()
+    elapsed = time.perf_counter() - started
+    print(f"{'insert (with triggers)':<28} {messages} messages in {elapsed:.1f}s {messages / elapsed:10.1f}/s")
+
+
+def like_page(text, limit):
+    conditions = []
+    for word in text.split():
+        word = word.rstrip('*')
+        conditions.append(or_(ContactMessage.name.contains(word, autoescape=True),
+                              ContactMessage.email.contains(word, autoescape=True),
+                              ContactMessage.message.contains(word, autoescape=True)))
+    stmt = (select(ContactMessage.id, ContactMessage.name, ContactMessage.email, ContactMessage.message,
+                   ContactMessage.timestamp)
+            .where(and_(*conditions))
+            .order_by(ContactMessage.timestamp.desc(), ContactMessage.id.desc())
+            .limit(limit))
+    return db.session.execute(stmt).all()
+
+
+def time_query(label, run, repeat):
+    run()  # warm the page cache
+    samples = []
+    for _ in range(repeat):
+        before = time.perf_counter()
+        rows = run()
+        samples.append(time.perf_counter() - before)
+    summarize(f'{label} ({len(rows)})', samples)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--messages', type=int, default=1_000_000)
+    parser.add_argument('--limit', type=int, default=50)
+    parser.add_argument('--repeat', type=int, default=5)
+    parser.add_argument('--db', help='SQLite file to fill once and reuse')
+    args = parser.parse_args()
+
+    path = args.db or os.path.join(tempfile.mkdtemp(prefix='healthfin-search-'), 'inbox.db')
+    app = make_app(f'sqlite:///{path}')
+    with app.app_context():
+        existing = db.session.execute(select(func.count()).select_from(ContactMessage)).scalar()
+    if not existing:
+        fill(app, args.messages)
+
+    with app.app_context():
+        for name, text in QUERIES:
+            print(f'-- {name}: {text}')
+            for sort in ('rank', 'newest'):
+                params = SearchParams(MultiDict({'q': text, 'sort': sort, 'limit': args.limit}),
+                                      args.limit, args.limit)
+                time_query(f'  fts5 {sort}', lambda: search_messages(params)[0], args.repeat)
+            time_query('  like newest', lambda: like_page(text, args.limit), args.repeat)
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,112 @@
+"""App factory cold start and per-worker memory, development vs production mode.
+
+Boot time is measured in fresh interpreters (imports plus ``create_app``)
+against a migrated SQLite file. Memory is measured the way a pre-forking
+server runs: ``preload`` builds the app once in the master and forks the
+workers, ``per-worker`` forks first and has every worker build its own. Each
+worker serves a few requests and reports its RSS and PSS (resident memory
+with shared pages split between the processes sharing them).
+
+    python -m benchmarks.bench_startup --boots 10 --workers 4
+"""
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+
+BOOT = """
+import sys, time
+started = time.perf_counter()
+from app import config, create_app
+create_app(getattr(config, sys.argv[1]))
+print(time.perf_counter() - started)
+"""
+
+WORKERS = """
+import json, logging, multiprocessing, os, sys
+mode, workers = sys.argv[1], int(sys.argv[2])
+logging.disable(logging.CRITICAL)
+
+def build():
+    from app import create_app, db
+    from app.config import ProductionConfig
+    return create_app(ProductionConfig), db
+
+def memory():
+    fields = {}
+    with open('/proc/self/smaps_rollup') as rollup:
+        for line in rollup:
+            name, _, value = line.partition(':')
+            if value.strip().endswith('kB'):
+                fields[name] = int(value.split()[0])
+    return fields['Rss'], fields['Pss']
+
+def serve(app, barrier, out):
+    client = app.test_client()
+    for _ in range(20):
+        client.get('/api/about-us')
+        client.get('/api/dashboard')
+    barrier.wait()  # measure while every sibling is alive and sharing
+    os.write(out, (json.dumps(memory()) + '\\n').encode())
+    barrier.wait()
+
+context = multiprocessing.get_context('fork')
+barrier = context.Barrier(workers)
+read, write = os.pipe()
+if mode == 'preload':
+    from app.lifecycle import preload
+    app = preload(*build())
+children = []
+for _ in range(workers):
+    pid = os.fork()
+    if pid == 0:
+        if mode != 'preload':
+            app, _db = build()
+        serve(app, barrier, write)
+        os._exit(0)
+    children.append(pid)
+for pid in children:
+    os.waitpid(pid, 0)
+os.close(write)
+with os.fdopen(read) as results:
+    print(json.dumps([json.loads(line) for line in results]))
+"""
+
+
+def run(code, *args, env):
+    return subprocess.run([sys.executable, '-c', code, *map(str, args)], env=env, check=True,
+                          capture_output=True, text=True).stdout
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--boots', type=int, default=10, help='cold starts per mode')
+    parser.add_argument('--workers', type=int, default=4)
+    args = parser.parse_args()
+
+    root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+    with tempfile.TemporaryDirectory() as directory:
+        env = dict(os.environ, PYTHONPATH=root, JWT_SECRET_KEY='bench', EMAIL_CHECK_DELIVERABILITY='false',
+                   DATABASE_URL=f"sqlite:///{os.path.join(directory, 'app.db')}",
+                   RATELIMIT_STORAGE_URI=f"sqlite:///{os.path.join(directory, 'ratelimit.db')}")
+        subprocess.run([sys.executable, '-m', 'flask', '--app', 'wsgi', 'db', 'upgrade'], cwd=root, env=env,
+                       check=True, capture_output=True)
+
+        for mode in ('Config', 'ProductionConfig'):
+            samples = [float(run(BOOT, mode, env=env)) for _ in range(args.boots)]
+            print(f"boot {mode:<24} p50={statistics.median(samples) * 1000:8.1f}ms "
+                  f"min={min(samples) * 1000:8.1f}ms")
+
+        for mode in ('per-worker', 'preload'):
+            workers = json.loads(run(WORKERS, mode, args.workers, env=env))
+            rss = statistics.mean(w[0] for w in workers) / 1024
+            pss = statistics.mean(w[1] for w in workers) / 1024
+            print(f"{mode:<10} x{args.workers} workers   rss={rss:7.1f}MiB  pss={pss:7.1f}MiB per worker "
+                  f"(total pss {pss * args.workers:7.1f}MiB)")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,72 @@
+"""Shared helpers for the scripts in this package.
+
+Each benchmark is a plain script: ``python -m benchmarks.<name> --help``.
+"""
+import os
+import statistics
+import tempfile
+import time
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User
+
+
+def make_app(database_uri=None, **overrides):
+    """Boot the real app factory against a throwaway SQLite file by default."""
+    if database_uri is None:
+        handle, path = tempfile.mkstemp(suffix='.db', prefix='healthfin-bench-')
+        os.close(handle)
+        database_uri = f'sqlite:///{path}'
+
+    class BenchmarkConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = database_uri
+
+    # The scripts drive /login, /register and /send-message far past the
+    # per-client limits; bench_ratelimit measures the limiter on its own.
+    overrides.setdefault('RATELIMIT_ENABLED', False)
+    for key, value in overrides.items():
+        setattr(BenchmarkConfig, key, value)
+
+    app = create_app(BenchmarkConfig)
+    with app.app_context():
+        db.create_all()
+    return app
+
+
+def create_user(app, email='bench@example.com'):
+    with app.app_context():
+        user = User(email=email, password_hash='x')
+        db.session.add(user)
+        db.session.commit()
+        return user.id
+
+
+def auth_headers(app, user_id):
+    with app.app_context():
+        return {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+
+
+def percentile(samples, pct):
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, max(0, round(pct / 100 * len(ordered)) - 1))
+    return ordered[index]
+
+
+def summarize(label, samples, total_seconds=None, count=None):
+    """Print one aligned line of latency stats (samples are seconds)."""
+    count = count if count is not None else len(samples)
+    line = (f"{label:<28} n={count:<7} p50={percentile(samples, 50) * 1000:8.3f}ms "
+            f"p99={percentile(samples, 99) * 1000:8.3f}ms mean={statistics.mean(samples) * 1000:8.3f}ms")
+    if total_seconds:
+        line += f" {count / total_seconds:10.1f}/s"
+    print(line)
+
+
+class Timer:
+    def __enter__(self):
+        self.start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc):
+        self.elapsed = time.perf_counter() - self.start
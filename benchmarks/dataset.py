@@ -0,0 +1,38 @@
+"""Deterministic seeded datasets for the benchmark suite.
+
+Sizes are the approximate total number of income, expense and transaction
+rows; every user gets about ``ROWS_PER_USER`` of them. Generation is done
+by ``app.seeding``, the same code behind ``flask seed``; each user also
+leaves one contact message in the support inbox.
+"""
+import random
+from datetime import datetime, timedelta
+from app import db, seeding
+from app.models import ContactMessage
+
+SIZES = {'1k': 1_000, '100k': 100_000, '10m': 10_000_000}
+ROWS_PER_USER = 1_000
+PASSWORD = seeding.TEMPLATE_PASSWORD
+END = datetime(2024, 1, 1)
+# Words for the support inbox that /api/admin/messages searches.
+INBOX_WORDS = ('loan', 'payment', 'savings', 'knee', 'dental', 'invoice', 'refund', 'appointment',
+               'insurance', 'surgery', 'balance', 'account', 'plan', 'interest', 'clinic', 'password')
+
+
+def user_count(size):
+    return max(1, SIZES[size] // ROWS_PER_USER)
+
+
+def seed(app, size, seed_value=0, processes=1):
+    """Fill the app's (empty) database; returns the number of users."""
+    users = user_count(size)
+    with app.app_context():
+        seeding.seed(users, ROWS_PER_USER // 3, seed=seed_value, end=END, processes=processes)
+        rng = random.Random(f'{seed_value}:inbox')
+        db.session.execute(ContactMessage.__table__.insert(), [{
+            'name': f'User {user_id}', 'email': f'user{user_id}@example.com',
+            'message': ' '.join(rng.choices(INBOX_WORDS, k=rng.randint(5, 30))),
+            'timestamp': END - timedelta(minutes=user_id),
+        } for user_id in range(1, users + 1)])
+        db.session.commit()
+    return users
@@ -0,0 +1,285 @@
+"""Reproducible endpoint benchmark suite with regression thresholds.
+
+Boots ``create_app`` against a seeded SQLite database for each requested
+size, drives every /api route (token-authenticated ones included) through
+the test client, first sequentially and then from a multi-threaded load
+generator, and records p50/p99 latency and throughput per route.
+
+    # record a baseline
+    python -m benchmarks.suite --sizes 1k 100k --output baseline.json
+    # compare a change against it (exit status 1 on regression)
+    python -m benchmarks.suite --sizes 1k 100k --baseline baseline.json --threshold 0.25
+
+Seeded databases are cached in ``--db-dir`` (one file per size) so large
+sizes such as 10m are only generated once.
+"""
+import argparse
+import itertools
+import json
+import os
+import random
+import sys
+import threading
+import time
+import uuid
+from sqlalchemy import func, insert, select
+from app import db
+from app.models import LoanApplication, SavingPlan, SavingPlanEnrollment
+from .common import make_app, percentile
+from . import dataset
+
+
+def _json(method, path, body=None, auth=True, user=None, setup=None, undo=None):
+    """One benchmarked request.
+
+    ``path`` may name the caller's ``{plan}`` (the one it is enrolled in),
+    ``{other_plan}`` or ``{loan}``; ``user`` pins the caller (e.g. an admin).
+    ``setup`` and ``undo`` are untimed ``(method, body)`` requests to the same
+    path, sent before or after, so a state-changing call succeeds every time
+    it is timed.
+    """
+    return {'method': method, 'path': path, 'body': body, 'auth': auth, 'user': user,
+            'setup': setup, 'undo': undo}
+
+
+ADMIN_USER = 1
+LOAN_APPLICATION = {
+    'first_name': 'Bench', 'last_name': 'User', 'email_address': 'bench@example.com',
+    'phone_number': '+254712345678', 'required_treatment': 'Knee surgery', 'estimated_cost': 1200,
+    'healthcare_provider': 'Nairobi Hospital', 'term_months': 12,
+}
+
+
+ROUTES = {
+    'about-us': _json('GET', '/api/about-us', auth=False),
+    'mission': _json('GET', '/api/mission', auth=False),
+    'vision': _json('GET', '/api/vision', auth=False),
+    'message': _json('GET', '/api/message', auth=False),
+    'contact-info': _json('GET', '/api/contact-info', auth=False),
+    'content': _json('GET', '/api/content', auth=False),
+    'get-csrf-token': _json('GET', '/api/get-csrf-token', auth=False),
+    'send-message': _json('POST', '/api/send-message',
+                          {'name': 'Bench', 'email': 'bench@example.com', 'message': 'Hello'}, auth=False),
+    'login': _json('POST', '/api/login', 'login', auth=False),
+    'register': _json('POST', '/api/register', 'register', auth=False),
+    'dashboard': _json('GET', '/api/dashboard'),
+    'finances': _json('GET', '/api/finances?limit=50'),
+    'finances-filtered': _json('GET', '/api/finances?type=expense&start=2021-01-01&end=2022-01-01&limit=50'),
+    'expenses-summary': _json('GET', '/api/expenses/summary'),
+    'savings-history': _json('GET', '/api/savings/history?limit=50'),
+    'cash-flow-month': _json('GET', '/api/analytics/cash-flow?granularity=month&start=2023-01-01&end=2023-12-31'),
+    'cash-flow-day': _json('GET', '/api/analytics/cash-flow?granularity=day&start=2023-01-01&end=2023-12-31'),
+    'saving-plans': _json('GET', '/api/saving-plans'),
+    'saving-plans-available': _json('GET', '/api/saving-plans/available', auth=False),
+    'saving-plan': _json('GET', '/api/saving-plans/{plan}'),
+    'saving-plan-enroll': _json('POST', '/api/saving-plans/{other_plan}/enroll', {'amount': 50},
+                                undo=('DELETE', None)),
+    'saving-plan-cancel': _json('DELETE', '/api/saving-plans/{other_plan}/enroll', setup=('POST', {'amount': 50})),
+    'saving-plans-projection': _json('GET', '/api/saving-plans/projection?months=360'),
+    'income': _json('POST', '/api/income', {'amount': 12.5}),
+    'expense': _json('POST', '/api/expense', {'amount': 7.25}),
+    'income-batch': _json('POST', '/api/income/batch', [{'amount': n + 1} for n in range(50)]),
+    'expense-batch': _json('POST', '/api/expense/batch', [{'amount': n + 1} for n in range(50)]),
+    'savings-deposit': _json('POST', '/api/savings/deposit', {'amount': 5}),
+    'savings-withdraw': _json('POST', '/api/savings/withdraw', {'amount': 1}),
+    'export': _json('GET', '/api/export?format=ndjson'),
+    'loans-apply': _json('POST', '/api/loans', LOAN_APPLICATION),
+    'loans': _json('GET', '/api/loans'),
+    'loan': _json('GET', '/api/loans/{loan}'),
+    'admin-messages': _json('GET', '/api/admin/messages?limit=50', user=ADMIN_USER),
+    'admin-messages-search': _json('GET', '/api/admin/messages?q=loan&limit=50', user=ADMIN_USER),
+}
+
+
+class Driver:
+    """Issues benchmark requests for a pool of seeded users."""
+
+    def __init__(self, app, users, seed_value):
+        self.app = app
+        self.users = users
+        self.rng = random.Random(seed_value)
+        self.tokens = {}
+        from flask_jwt_extended import create_access_token
+        with app.app_context():
+            for user_id in range(1, min(users, 100) + 1):
+                self.tokens[user_id] = create_access_token(identity=str(user_id))
+            self.fixtures = self._fixtures()
+        self.local = threading.local()
+
+    def _fixtures(self):
+        """Per-user ids for the path placeholders; gives each user a loan application."""
+        user_ids = sorted(self.tokens)
+        plans = db.session.execute(select(SavingPlan.id).order_by(SavingPlan.id)).scalars().all()
+        enrolled = dict(db.session.execute(
+            select(SavingPlanEnrollment.user_id, func.min(SavingPlanEnrollment.plan_id))
+            .where(SavingPlanEnrollment.user_id.in_(user_ids)).group_by(SavingPlanEnrollment.user_id)).all())
+
+        def first_loans():
+            return dict(db.session.execute(
+                select(LoanApplication.user_id, func.min(LoanApplication.id))
+                .where(LoanApplication.user_id.in_(user_ids)).group_by(LoanApplication.user_id)).all())
+
+        loans = first_loans()
+        missing = [user_id for user_id in user_ids if user_id not in loans]
+        if missing:
+            db.session.execute(insert(LoanApplication), [dict(LOAN_APPLICATION, user_id=user_id) for user_id in missing])
+            db.session.commit()
+            loans = first_loans()
+        return {user_id: {'plan': enrolled[user_id], 'loan': loans[user_id],
+                          'other_plan': next(plan for plan in plans if plan != enrolled[user_id])}
+                for user_id in user_ids}
+
+    def _client(self):
+        client = getattr(self.local, 'client', None)
+        if client is None:
+            client = self.local.client = self.app.test_client()
+        return client
+
+    def call(self, route, user_id):
+        spec = ROUTES[route]
+        user_id = spec['user'] or user_id
+        headers = {'Authorization': f'Bearer {self.tokens[user_id]}'} if spec['auth'] else {}
+        path = spec['path'].format(**self.fixtures[user_id])
+        body = spec['body']
+        if body == 'login':
+            body = {'email': f'user{user_id}@example.com', 'password': dataset.PASSWORD}
+        elif body == 'register':
+            # Registered users stay in the cached database, so never reuse an address.
+            body = {'email': f'bench-{uuid.uuid4().hex}@example.com', 'password': dataset.PASSWORD}
+        client = self._client()
+        if spec['setup']:
+            method, setup_body = spec['setup']
+            client.open(path, method=method, json=setup_body, headers=headers).get_data()
+        started = time.perf_counter()
+        response = client.open(path, method=spec['method'], json=body, headers=headers)
+        response.get_data()
+        elapsed = time.perf_counter() - started
+        if spec['undo']:
+            method, undo_body = spec['undo']
+            client.open(path, method=method, json=undo_body, headers=headers).get_data()
+        if response.status_code >= 500:
+            raise RuntimeError(f"{route} returned {response.status_code}: {response.get_data(as_text=True)[:200]}")
+        return elapsed
+
+
+def run_sequential(driver, route, requests):
+    user_ids = itertools.cycle(sorted(driver.tokens))
+    samples = [driver.call(route, next(user_ids)) for _ in range(requests)]
+    total = sum(samples)
+    return {
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'throughput_rps': len(samples) / total,
+    }
+
+
+def run_concurrent(driver, route, threads, requests):
+    if ROUTES[route]['setup'] or ROUTES[route]['undo']:
+        # Threads sharing a user would undo each other's setup.
+        threads = min(threads, len(driver.tokens))
+    samples, lock = [], threading.Lock()
+    per_thread = max(1, requests // threads)
+
+    def worker(n):
+        user_ids = itertools.cycle(sorted(driver.tokens)[n::threads] or sorted(driver.tokens))
+        local = [driver.call(route, next(user_ids)) for _ in range(per_thread)]
+        with lock:
+            samples.extend(local)
+
+    workers = [threading.Thread(target=worker, args=(n,)) for n in range(threads)]
+    started = time.perf_counter()
+    for thread in workers:
+        thread.start()
+    for thread in workers:
+        thread.join()
+    wall = time.perf_counter() - started
+    return {
+        'p50_ms': percentile(samples, 50) * 1000,
+        'p99_ms': percentile(samples, 99) * 1000,
+        'throughput_rps': len(samples) / wall,
+    }
+
+
+def prepare(size, db_dir, seed_value):
+    path = os.path.join(db_dir, f'healthfin-bench-{size}-seed{seed_value}.db')
+    fresh = not os.path.exists(path)
+    app = make_app(f'sqlite:///{path}', METRICS_ENABLED=False, OUTBOX_WORKERS=0,
+                   ADMIN_EMAILS=[f'user{ADMIN_USER}@example.com'])
+    if fresh:
+        started = time.perf_counter()
+        try:
+            users = dataset.seed(app, size, seed_value)
+        except BaseException:
+            os.remove(path)
+            raise
+        print(f"[{size}] seeded {users} users in {time.perf_counter() - started:.1f}s", file=sys.stderr)
+    # Not a count of the user table: the register route adds to it on every run.
+    return app, dataset.user_count(size)
+
+
+def compare(results, baseline, threshold):
+    """Return human-readable regressions of ``results`` against ``baseline``."""
+    regressions = []
+    for size, modes in results.items():
+        for mode, routes in modes.items():
+            for route, current in routes.items():
+                previous = baseline.get(size, {}).get(mode, {}).get(route)
+                if previous is None:
+                    continue
+                for metric in ('p50_ms', 'p99_ms'):
+                    if current[metric] > previous[metric] * (1 + threshold):
+                        regressions.append(f"{size} {mode} {route}: {metric} "
+                                           f"{previous[metric]:.3f} -> {current[metric]:.3f}")
+                if current['throughput_rps'] < previous['throughput_rps'] * (1 - threshold):
+                    regressions.append(f"{size} {mode} {route}: throughput_rps "
+                                       f"{previous['throughput_rps']:.1f} -> {current['throughput_rps']:.1f}")
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument('--sizes', nargs='+', choices=sorted(dataset.SIZES), default=['1k'])
+    parser.add_argument('--routes', nargs='+', choices=sorted(ROUTES), default=sorted(ROUTES))
+    parser.add_argument('--requests', type=int, default=200, help='requests per route and mode')
+    parser.add_argument('--threads', type=int, default=8, help='load generator threads')
+    parser.add_argument('--seed', type=int, default=0)
+    parser.add_argument('--db-dir', default=os.environ.get('TMPDIR', '/tmp'))
+    parser.add_argument('--output', help='write results as JSON (use as a future --baseline)')
+    parser.add_argument('--baseline', help='JSON results to compare against')
+    parser.add_argument('--threshold', type=float, default=0.20,
+                        help='allowed relative regression before failing (default 0.20 = 20%%)')
+    args = parser.parse_args(argv)
+
+    results = {}
+    for size in args.sizes:
+        app, users = prepare(size, args.db_dir, args.seed)
+        driver = Driver(app, users, args.seed)
+        results[size] = {'sequential': {}, 'concurrent': {}}
+        for route in args.routes:
+            driver.call(route, 1)  # warm-up
+            sequential = run_sequential(driver, route, args.requests)
+            concurrent = run_concurrent(driver, route, args.threads, args.requests)
+            results[size]['sequential'][route] = sequential
+            results[size]['concurrent'][route] = concurrent
+            print(f"[{size}] {route:<24} seq p50={sequential['p50_ms']:8.3f}ms p99={sequential['p99_ms']:8.3f}ms "
+                  f"| {args.threads} threads p50={concurrent['p50_ms']:8.3f}ms p99={concurrent['p99_ms']:8.3f}ms "
+                  f"{concurrent['throughput_rps']:9.1f} req/s")
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(results, f, indent=2, sort_keys=True)
+
+    if args.baseline:
+        with open(args.baseline) as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions:
+            print(f"{len(regressions)} regression(s) beyond {args.threshold:.0%}:")
+            for line in regressions:
+                print(f"  {line}")
+            return 1
+        print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,57 @@
+"""add contact message search
+
+Revision ID: 9b3e7d15c2a8
+Revises: f4c1a8e3b527
+Create Date: 2026-10-17 21:04:18.350127
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '9b3e7d15c2a8'
+down_revision = 'f4c1a8e3b527'
+branch_labels = None
+depends_on = None
+
+# External-content FTS5 index over contact_message, kept in sync by
+# triggers (the same statements as app/search.py's FTS_SCHEMA).
+FTS_SCHEMA = (
+    "CREATE VIRTUAL TABLE IF NOT EXISTS contact_message_fts USING fts5("
+    "name, email, message, content='contact_message', content_rowid='id', "
+    "tokenize='unicode61 remove_diacritics 2')",
+    "CREATE TRIGGER IF NOT EXISTS contact_message_fts_ai AFTER INSERT ON contact_message BEGIN "
+    "INSERT INTO contact_message_fts(rowid, name, email, message) "
+    "VALUES (new.id, new.name, new.email, new.message); END",
+    "CREATE TRIGGER IF NOT EXISTS contact_message_fts_ad AFTER DELETE ON contact_message BEGIN "
+    "INSERT INTO contact_message_fts(contact_message_fts, rowid, name, email, message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.message); END",
+    "CREATE TRIGGER IF NOT EXISTS contact_message_fts_au AFTER UPDATE OF name, email, message ON contact_message BEGIN "
+    "INSERT INTO contact_message_fts(contact_message_fts, rowid, name, email, message) "
+    "VALUES ('delete', old.id, old.name, old.email, old.message); "
+    "INSERT INTO contact_message_fts(rowid, name, email, message) "
+    "VALUES (new.id, new.name, new.email, new.message); END",
+)
+
+
+def upgrade():
+    with op.batch_alter_table('contact_message', schema=None) as batch_op:
+        batch_op.create_index('ix_contact_message_timestamp', ['timestamp'], unique=False)
+
+    if op.get_bind().dialect.name == 'sqlite':
+        for statement in FTS_SCHEMA:
+            op.execute(statement)
+        # Index the messages written before the triggers existed.
+        op.execute("INSERT INTO contact_message_fts(contact_message_fts) VALUES ('rebuild')")
+
+
+def downgrade():
+    if op.get_bind().dialect.name == 'sqlite':
+        # Dropping the table drops the shadow tables; the triggers go by name.
+        for trigger in ('ai', 'ad', 'au'):
+            op.execute(f'DROP TRIGGER IF EXISTS contact_message_fts_{trigger}')
+        op.execute('DROP TABLE IF EXISTS contact_message_fts')
+
+    with op.batch_alter_table('contact_message', schema=None) as batch_op:
+        batch_op.drop_index('ix_contact_message_timestamp')
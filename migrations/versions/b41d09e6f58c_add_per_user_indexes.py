@@ -0,0 +1,42 @@
+"""add per-user indexes
+
+Revision ID: b41d09e6f58c
+Revises: 7c2f4e91a3b6
+Create Date: 2026-10-17 09:31:07.886120
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'b41d09e6f58c'
+down_revision = '7c2f4e91a3b6'
+branch_labels = None
+depends_on = None
+
+
+INDEXES = [
+    ('ix_income_user_id_date', 'income', ['user_id', 'date', 'id', 'amount'], False),
+    ('ix_expense_user_id_date', 'expense', ['user_id', 'date', 'id', 'amount'], False),
+    ('ix_savings_user_id', 'savings', ['user_id'], True),
+    ('ix_transaction_user_id_timestamp', 'transaction', ['user_id', 'timestamp', 'id', 'type', 'amount'], False),
+    ('ix_loan_application_user_id_application_date', 'loan_application', ['user_id', 'application_date'], False),
+]
+
+
+def upgrade():
+    # CREATE INDEX CONCURRENTLY cannot run inside a transaction block, so the
+    # builds happen in autocommit mode; on PostgreSQL this keeps the tables
+    # writable while each index is built. SQLite ignores the flag.
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in INDEXES:
+            op.create_index(name, table, columns, unique=unique,
+                            if_not_exists=True, postgresql_concurrently=True)
+
+
+def downgrade():
+    with op.get_context().autocommit_block():
+        for name, table, columns, unique in reversed(INDEXES):
+            op.drop_index(name, table_name=table, if_exists=True,
+                          postgresql_concurrently=True)
@@ -0,0 +1,81 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User, Income, Expense, FinancialSummary
+
+
+class TestBatchIngest(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='batch@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_valid_entries_are_inserted_and_invalid_ones_reported(self):
+        entries = [
+            {'amount': 10, 'date': '2024-03-01T09:00:00', 'category': 'salary'},
+            {'amount': -5},
+            {'amount': 'abc', 'date': 'not-a-date'},
+            {'date': '2024-03-02'},
+            {'amount': 2.5},
+        ]
+        response = self.client.post('/api/income/batch', json=entries, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['inserted'], 2)
+        self.assertEqual([e['index'] for e in response.json['errors']], [1, 2, 3])
+        self.assertEqual(response.json['errors'][1]['errors'], ['Invalid amount format', 'Invalid date format'])
+
+        with self.app.app_context():
+            incomes = Income.query.order_by(Income.id).all()
+            self.assertEqual([(i.amount, i.category) for i in incomes], [(10.0, 'salary'), (2.5, None)])
+            summary = db.session.get(FinancialSummary, self.user_id)
+            self.assertEqual((summary.total_income, summary.income_count), (12.5, 2))
+
+    def test_offset_dates_are_stored_as_utc_and_non_finite_amounts_rejected(self):
+        entries = [
+            {'amount': 1, 'date': '2026-01-01T00:00:00+02:00'},
+            {'amount': 2, 'date': '2026-01-02T00:00:00'},
+            {'amount': 'nan'},
+            {'amount': 'inf'},
+        ]
+        response = self.client.post('/api/income/batch', json=entries, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json['inserted'], 2)
+        self.assertEqual([e['errors'] for e in response.json['errors']],
+                         [['Amount must be a finite number']] * 2)
+        with self.app.app_context():
+            dates = [i.date for i in Income.query.order_by(Income.id)]
+            self.assertEqual([d.isoformat() for d in dates], ['2025-12-31T22:00:00', '2026-01-02T00:00:00'])
+
+    def test_expense_batch_accepts_entries_object(self):
+        response = self.client.post('/api/expense/batch', json={'entries': [{'amount': 3}, {'amount': 4}]},
+                                    headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        with self.app.app_context():
+            self.assertEqual(Expense.query.count(), 2)
+            self.assertEqual(db.session.get(FinancialSummary, self.user_id).total_expenses, 7.0)
+
+    def test_rejected_batches(self):
+        self.app.config['BATCH_MAX_ENTRIES'] = 2
+        for body in ([], {'entries': 'nope'}, [{'amount': 1}] * 3, [{'amount': 0}]):
+            with self.subTest(body=body):
+                response = self.client.post('/api/income/batch', json=body, headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+        with self.app.app_context():
+            self.assertEqual(Income.query.count(), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,102 @@
+import unittest
+from datetime import date, datetime
+from flask_jwt_extended import create_access_token
+from app import create_app, db, cashflow
+from app.config import TestConfig
+from app.models import User, DailyCashFlow
+
+
+class TestCashFlow(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='flow@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def post_batch(self, kind, entries):
+        response = self.client.post(f'/api/{kind}/batch', json=entries, headers=self.headers)
+        self.assertEqual(response.status_code, 201, response.get_json())
+
+    def cash_flow(self, **params):
+        response = self.client.get('/api/analytics/cash-flow', query_string=params, headers=self.headers)
+        return response.status_code, response.get_json()
+
+    def test_inserts_update_daily_buckets(self):
+        self.post_batch('income', [
+            {'amount': 100, 'date': '2024-01-01T08:00:00'},
+            {'amount': 50, 'date': '2024-01-01T21:00:00'},
+            {'amount': 25, 'date': '2024-01-09T12:00:00'},
+        ])
+        self.post_batch('expense', [{'amount': 30, 'date': '2024-01-01T09:30:00'}])
+        self.client.post('/api/expense', json={'amount': 5}, headers=self.headers)
+
+        with self.app.app_context():
+            bucket = db.session.get(DailyCashFlow, (self.user_id, date(2024, 1, 1)))
+            self.assertEqual((bucket.income, bucket.income_count, bucket.expenses, bucket.expense_count),
+                             (150.0, 2, 30.0, 1))
+            today = db.session.get(DailyCashFlow, (self.user_id, datetime.utcnow().date()))
+            self.assertEqual((today.expenses, today.expense_count), (5.0, 1))
+
+            # Incremental buckets agree with a rebuild from the raw rows.
+            before = db.session.execute(db.select(*DailyCashFlow.__table__.c).order_by(DailyCashFlow.day)).all()
+            cashflow.rebuild()
+            after = db.session.execute(db.select(*DailyCashFlow.__table__.c).order_by(DailyCashFlow.day)).all()
+            self.assertEqual(before, after)
+
+    def test_rolls_up_by_granularity(self):
+        self.post_batch('income', [
+            {'amount': 100, 'date': '2024-01-01T08:00:00'},  # Monday
+            {'amount': 40, 'date': '2024-01-07T08:00:00'},   # Sunday, same ISO week
+            {'amount': 25, 'date': '2024-02-15T12:00:00'},
+        ])
+        self.post_batch('expense', [{'amount': 30, 'date': '2024-01-08T09:30:00'}])
+
+        status, body = self.cash_flow(granularity='month', start='2024-01-01', end='2024-03-31')
+        self.assertEqual(status, 200)
+        self.assertEqual([(b['period'], b['income'], b['expenses'], b['net']) for b in body['buckets']], [
+            ('2024-01-01', 140.0, 30.0, 110.0),
+            ('2024-02-01', 25.0, 0.0, 25.0),
+            ('2024-03-01', 0.0, 0.0, 0.0),
+        ])
+        self.assertEqual(body['totals'], {'income': 165.0, 'expenses': 30.0, 'net': 135.0})
+
+        status, body = self.cash_flow(granularity='week', start='2024-01-01', end='2024-01-14')
+        self.assertEqual([(b['period'], b['income'], b['expenses']) for b in body['buckets']], [
+            ('2024-01-01', 140.0, 0.0),
+            ('2024-01-08', 0.0, 30.0),
+        ])
+
+        status, body = self.cash_flow(granularity='day', start='2024-01-06', end='2024-01-08')
+        self.assertEqual([(b['period'], b['income_count'], b['expense_count']) for b in body['buckets']], [
+            ('2024-01-06', 0, 0), ('2024-01-07', 1, 0), ('2024-01-08', 0, 1),
+        ])
+
+    def test_ranges_at_the_ends_of_the_calendar(self):
+        status, body = self.cash_flow(start='9999-12-01', end='9999-12-31')
+        self.assertEqual((status, [b['period'] for b in body['buckets']]), (200, ['9999-12-01']))
+        status, body = self.cash_flow(granularity='week', start='9999-12-20', end='9999-12-31')
+        self.assertEqual((status, [b['period'] for b in body['buckets']]), (200, ['9999-12-20', '9999-12-27']))
+        status, body = self.cash_flow(granularity='day', end='0001-01-05')
+        self.assertEqual((status, body['start'], len(body['buckets'])), (200, '0001-01-01', 5))
+
+    def test_rejects_bad_parameters(self):
+        self.assertEqual(self.cash_flow(granularity='hour')[0], 400)
+        self.assertEqual(self.cash_flow(start='2024-13-01')[0], 400)
+        self.assertEqual(self.cash_flow(start='2024-02-01', end='2024-01-01')[0], 400)
+        self.assertEqual(self.cash_flow(start='2000-01-01', end='2024-01-01')[0], 400)
+        self.assertEqual(self.client.get('/api/analytics/cash-flow').status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
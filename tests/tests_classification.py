@@ -0,0 +1,66 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User
+
+
+class CSRFConfig(TestConfig):
+    WTF_CSRF_ENABLED = True
+
+
+class TestRequestClassification(unittest.TestCase):
+
+    def _make_app(self, **overrides):
+        config = type('Config', (CSRFConfig,), overrides)
+        self.app = create_app(config)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='classy@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def test_token_routes_skip_session_and_csrf(self):
+        self._make_app()
+        response = self.client.post('/api/income', json={'amount': 5}, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        self.assertNotIn('Set-Cookie', response.headers)
+        self.assertNotIn('Vary', response.headers)
+
+        unauthorized = self.client.get('/api/dashboard')
+        self.assertEqual(unauthorized.status_code, 401)
+        self.assertNotIn('Set-Cookie', unauthorized.headers)
+
+        self.assertNotIn('Set-Cookie', self.client.get('/api/about-us').headers)
+
+    def test_browser_routes_keep_csrf(self):
+        self._make_app()
+        response = self.client.post('/api/send-message', json={'name': 'a', 'email': 'a@example.com', 'message': 'hi'})
+        self.assertEqual(response.status_code, 400)
+
+        token = self.client.get('/api/get-csrf-token')
+        self.assertIn('csrf_token=', token.headers['Set-Cookie'])
+        response = self.client.post('/api/send-message', json={'name': 'a', 'email': 'a@example.com', 'message': 'hi'},
+                                    headers={'X-CSRFToken': token.json['csrf_token']})
+        self.assertEqual(response.status_code, 200)
+
+    def test_configuration_overrides(self):
+        self._make_app(STATEFUL_ENDPOINTS=['main.add_income'])
+        self.assertEqual(self.client.post('/api/income', json={'amount': 5}, headers=self.headers).status_code, 400)
+        self.assertNotIn('Set-Cookie', self.client.post('/api/expense', json={'amount': 5}, headers=self.headers).headers)
+
+        self._make_app(STATELESS_FAST_PATH=False)
+        response = self.client.get('/api/dashboard', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        self.assertIn('csrf_token=', response.headers['Set-Cookie'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,130 @@
+import gzip
+import json
+import unittest
+import zlib
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.compression import encode
+from app.config import TestConfig
+from app.models import User, Income
+
+
+class TestCompression(unittest.TestCase):
+
+    def _make_app(self, **overrides):
+        config = type('CompressConfig', (TestConfig,), overrides)
+        self.app = create_app(config)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='squeeze@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.flush()
+            base = datetime(2020, 1, 1)
+            db.session.execute(Income.__table__.insert(), [
+                {'user_id': user.id, 'amount': 10.5, 'date': base + timedelta(hours=n)} for n in range(200)])
+            db.session.commit()
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _get(self, path, encoding=None):
+        headers = dict(self.headers)
+        if encoding is not None:
+            headers['Accept-Encoding'] = encoding
+        response = self.client.get(path, headers=headers)
+        self.assertEqual(response.status_code, 200)
+        return response
+
+    def test_large_json_is_gzipped(self):
+        self._make_app()
+        plain = self._get('/api/finances?limit=200')
+        self.assertNotIn('Content-Encoding', plain.headers)
+        self.assertEqual(plain.headers['Vary'], 'Accept-Encoding')
+
+        response = self._get('/api/finances?limit=200', 'gzip, deflate')
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertIn('Accept-Encoding', response.headers['Vary'])
+        self.assertEqual(int(response.headers['Content-Length']), len(response.data))
+        self.assertLess(len(response.data), len(plain.data) // 4)
+        self.assertEqual(gzip.decompress(response.data), plain.data)
+
+    def test_small_responses_are_left_alone(self):
+        self._make_app()
+        response = self._get('/api/finances?limit=1', 'gzip')
+        self.assertNotIn('Content-Encoding', response.headers)
+        self.assertNotIn('Vary', response.headers)
+        self.assertEqual(len(response.json['items']), 1)
+
+    def test_negotiation(self):
+        self._make_app()
+        plain = self._get('/api/finances?limit=200').data
+        deflated = self._get('/api/finances?limit=200', 'deflate')
+        self.assertEqual(deflated.headers['Content-Encoding'], 'deflate')
+        self.assertEqual(zlib.decompress(deflated.data), plain)
+        preferred = self._get('/api/finances?limit=200', 'gzip;q=0.5, deflate;q=0.9')
+        self.assertEqual(preferred.headers['Content-Encoding'], 'deflate')
+        refused = self._get('/api/finances?limit=200', 'identity, gzip;q=0')
+        self.assertNotIn('Content-Encoding', refused.headers)
+        self.assertEqual(refused.data, plain)
+
+    def test_already_encoded_content_is_untouched(self):
+        self._make_app()
+        response = self.client.get('/api/about-us', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        # Compressed once, by the content registry, and not again on the way out.
+        self.assertIsInstance(json.loads(gzip.decompress(response.data)), dict)
+
+    def test_streamed_export_is_compressed_incrementally(self):
+        self._make_app()
+        plain = self._get('/api/export?format=ndjson').get_data()
+        response = self._get('/api/export?format=ndjson', 'gzip')
+        self.assertTrue(response.is_streamed)
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertNotIn('Content-Length', response.headers)
+        self.assertEqual(gzip.decompress(response.get_data()), plain)
+        self.assertEqual(len(plain.splitlines()), 200)
+
+    def test_each_streamed_chunk_is_flushed(self):
+        self._make_app()
+        pulled = []
+
+        @self.app.route('/slow-stream')
+        def slow_stream():
+            def rows():
+                for n in range(3):
+                    pulled.append(n)
+                    yield json.dumps({'row': n, 'padding': 'x' * 600}) + '\n'
+            return self.app.response_class(rows(), mimetype='application/x-ndjson')
+
+        response = self.client.get('/slow-stream', headers={'Accept-Encoding': 'gzip'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        body = iter(response.response)
+        decoder = zlib.decompressobj(zlib.MAX_WBITS | 16)
+        first = decoder.decompress(next(body))
+        # The first row decodes in full before the app is asked for the second.
+        self.assertEqual(json.loads(first)['row'], 0)
+        self.assertEqual(pulled, [0])
+        rest = b''.join(decoder.decompress(piece) for piece in body) + decoder.flush()
+        self.assertEqual([json.loads(line)['row'] for line in rest.splitlines()], [1, 2])
+        self.assertTrue(decoder.eof)
+
+    def test_level_is_configurable(self):
+        self._make_app(COMPRESS_LEVEL=1)
+        plain = self._get('/api/finances?limit=200').data
+        fast = self._get('/api/finances?limit=200', 'gzip').data
+        self.assertEqual(fast, encode(plain, 'gzip', level=1))
+        self.assertNotEqual(fast, encode(plain, 'gzip', level=9))
+
+    def test_disabled(self):
+        self._make_app(COMPRESS_ENABLED=False)
+        response = self._get('/api/finances?limit=200', 'gzip')
+        self.assertNotIn('Content-Encoding', response.headers)
+
+
+if __name__ == '__main__':
+    unittest.main()
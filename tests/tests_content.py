@@ -0,0 +1,62 @@
+import gzip
+import json
+import unittest
+from app import create_app
+from app.config import TestConfig
+from app.content import CONTENT
+
+CONTENT_ROUTES = {
+    '/api/about-us': 'about-us',
+    '/api/mission': 'mission',
+    '/api/vision': 'vision',
+    '/api/message': 'message',
+    '/api/contact-info': 'contact-info',
+}
+
+
+class TestContentRegistry(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+
+    def test_payloads_and_caching_headers(self):
+        for path, name in CONTENT_ROUTES.items():
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(response.json, CONTENT[name])
+                self.assertEqual(response.mimetype, 'application/json')
+                self.assertEqual(response.headers['Cache-Control'], 'public, max-age=3600')
+                self.assertEqual(response.headers['Vary'], 'Accept-Encoding')
+                self.assertNotIn('Content-Encoding', response.headers)
+
+    def test_bundle(self):
+        self.assertEqual(self.client.get('/api/content').json, CONTENT)
+
+    def test_gzip_negotiation(self):
+        plain = self.client.get('/api/about-us')
+        response = self.client.get('/api/about-us', headers={'Accept-Encoding': 'gzip, deflate'})
+        self.assertEqual(response.headers['Content-Encoding'], 'gzip')
+        self.assertEqual(json.loads(gzip.decompress(response.data)), CONTENT['about-us'])
+        self.assertNotEqual(response.headers['ETag'], plain.headers['ETag'])
+
+    def test_conditional_requests(self):
+        etag = self.client.get('/api/mission').headers['ETag']
+        response = self.client.get('/api/mission', headers={'If-None-Match': etag})
+        self.assertEqual(response.status_code, 304)
+        self.assertEqual(response.data, b'')
+        self.assertEqual(response.headers['ETag'], etag)
+
+        # A tag from the gzip representation also validates the identity one.
+        gzip_etag = self.client.get('/api/mission', headers={'Accept-Encoding': 'gzip'}).headers['ETag']
+        self.assertEqual(self.client.get('/api/mission', headers={'If-None-Match': gzip_etag}).status_code, 304)
+
+        stale = self.client.get('/api/mission', headers={'If-None-Match': '"deadbeef"'})
+        self.assertEqual(stale.status_code, 200)
+        other = self.client.get('/api/vision', headers={'If-None-Match': etag})
+        self.assertEqual(other.status_code, 200)
+
+
+if __name__ == '__main__':
+    unittest.main()
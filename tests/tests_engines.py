@@ -0,0 +1,72 @@
+import os
+import tempfile
+import unittest
+from app import create_app, db
+from app.config import TestConfig
+from app.engines import engine_options
+
+
+def file_config(path, **overrides):
+    class FileConfig(TestConfig):
+        SQLALCHEMY_DATABASE_URI = f'sqlite:///{path}'
+    for key, value in overrides.items():
+        setattr(FileConfig, key, value)
+    return FileConfig
+
+
+class TestEngineProfiles(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+    def tearDown(self):
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(self.path + suffix):
+                os.remove(self.path + suffix)
+
+    def pragmas(self, app, *names):
+        with app.app_context():
+            with db.engine.connect() as conn:
+                values = tuple(conn.exec_driver_sql(f'PRAGMA {name}').scalar() for name in names)
+            db.engine.dispose()
+        return values
+
+    def test_sqlite_profile_applies_pragmas(self):
+        app = create_app(file_config(self.path))
+        self.assertEqual(
+            self.pragmas(app, 'journal_mode', 'synchronous', 'busy_timeout', 'temp_store', 'cache_size', 'mmap_size'),
+            ('wal', 1, 5000, 2, -64000, 256 * 1024 * 1024),
+        )
+
+    def test_default_profile_leaves_sqlite_alone(self):
+        app = create_app(file_config(self.path, DB_ENGINE_PROFILE='default'))
+        self.assertEqual(self.pragmas(app, 'journal_mode', 'synchronous', 'temp_store'), ('delete', 2, 0))
+
+    def test_in_memory_database_skips_file_pragmas(self):
+        app = create_app(TestConfig)
+        self.assertEqual(self.pragmas(app, 'journal_mode', 'busy_timeout'), ('memory', 5000))
+
+    def test_server_profile_pool_options(self):
+        config = {key: getattr(TestConfig, key) for key in dir(TestConfig) if key.isupper()}
+        config['SQLALCHEMY_DATABASE_URI'] = 'postgresql://user@db.example.com/healthfin'
+        self.assertEqual(engine_options(config), {
+            'pool_size': 10, 'max_overflow': 20, 'pool_timeout': 30,
+            'pool_recycle': 1800, 'pool_pre_ping': True,
+        })
+        config['DB_ENGINE_PROFILE'] = 'bogus'
+        with self.assertRaises(ValueError):
+            engine_options(config)
+
+    def test_explicit_engine_options_win(self):
+        app = create_app(file_config(self.path, DB_ENGINE_PROFILE='server', DB_POOL_SIZE=3,
+                                     SQLALCHEMY_ENGINE_OPTIONS={'pool_pre_ping': False}))
+        self.assertEqual(app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_size'], 3)
+        self.assertFalse(app.config['SQLALCHEMY_ENGINE_OPTIONS']['pool_pre_ping'])
+        with app.app_context():
+            self.assertEqual(db.engine.pool.size(), 3)
+            db.engine.dispose()
+
+
+if __name__ == '__main__':
+    unittest.main()
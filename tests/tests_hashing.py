@@ -0,0 +1,113 @@
+import os
+import threading
+import time
+import unittest
+from app import create_app, db, password_hasher
+from app.config import TestConfig
+from app.hashing import HashingBusy, PasswordHasher, canonical_method
+from app.models import User
+
+
+class TestPasswordHashing(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _stored_hash(self, email):
+        with self.app.app_context():
+            return User.query.filter_by(email=email).one().password_hash
+
+    def test_login_rehashes_outdated_parameters(self):
+        credentials = {'email': 'old@example.com', 'password': 's3cret'}
+        self.client.post('/api/register', json=credentials)
+        self.assertTrue(self._stored_hash('old@example.com').startswith('pbkdf2:sha256:1000$'))
+
+        self.app.config['PASSWORD_HASH_METHOD'] = 'pbkdf2:sha256:2000'
+        password_hasher.init_app(self.app)
+        self.assertEqual(self.client.post('/api/login', json=credentials).status_code, 200)
+        upgraded = self._stored_hash('old@example.com')
+        self.assertTrue(upgraded.startswith('pbkdf2:sha256:2000$'))
+
+        # Already current: nothing is rewritten.
+        self.client.post('/api/login', json=credentials)
+        self.assertEqual(self._stored_hash('old@example.com'), upgraded)
+
+        wrong = {'email': 'old@example.com', 'password': 'nope'}
+        self.assertEqual(self.client.post('/api/login', json=wrong).status_code, 401)
+
+    def test_full_queue_fails_fast_with_503(self):
+        self.client.post('/api/register', json={'email': 'busy@example.com', 'password': 'pw'})
+        self.app.config['PASSWORD_HASH_QUEUE_SIZE'] = 1
+        password_hasher.init_app(self.app)
+        password_hasher._slots.acquire()
+        try:
+            response = self.client.post('/api/login', json={'email': 'busy@example.com', 'password': 'pw'})
+        finally:
+            password_hasher._slots.release()
+        self.assertEqual(response.status_code, 503)
+        self.assertEqual(response.headers['Retry-After'], '1')
+
+    def test_process_pool(self):
+        hasher = PasswordHasher()
+        self.app.config.update(PASSWORD_HASH_WORKERS=2, PASSWORD_HASH_QUEUE_SIZE=4)
+        hasher.init_app(self.app)
+        try:
+            hashes, errors = [], []
+
+            def work():
+                try:
+                    hashes.append(hasher.hash('pw'))
+                except Exception as e:
+                    errors.append(e)
+
+            threads = [threading.Thread(target=work) for _ in range(4)]
+            for thread in threads:
+                thread.start()
+            for thread in threads:
+                thread.join()
+            self.assertEqual(errors, [])
+            self.assertTrue(all(hasher.verify(h, 'pw') for h in hashes))
+        finally:
+            hasher.shutdown()
+
+    def test_timeouts_and_a_broken_pool_are_busy(self):
+        hasher = PasswordHasher()
+        self.app.config.update(PASSWORD_HASH_WORKERS=1, PASSWORD_HASH_QUEUE_SIZE=1, PASSWORD_HASH_TIMEOUT=30)
+        hasher.init_app(self.app)
+        try:
+            hasher.hash('warm up the worker')
+            hasher.timeout = 0.2
+            with self.assertRaises(HashingBusy):
+                hasher._run(time.sleep, 1)
+            # The sleeping hash still holds the only slot until it is done.
+            with self.assertRaises(HashingBusy):
+                hasher.hash('pw')
+            self.assertTrue(hasher._slots.acquire(timeout=10))
+            hasher._slots.release()
+
+            hasher.timeout = 30
+            self.assertTrue(hasher.verify(hasher.hash('pw'), 'pw'))
+            with self.assertRaises(HashingBusy):
+                hasher._run(os._exit, 1)
+            # A fresh pool replaces the broken one.
+            self.assertTrue(hasher.verify(hasher.hash('pw'), 'pw'))
+        finally:
+            hasher.shutdown()
+
+    def test_canonical_method(self):
+        self.assertEqual(canonical_method('scrypt'), 'scrypt:32768:8:1')
+        self.assertEqual(canonical_method('scrypt:16384'), 'scrypt:16384:8:1')
+        self.assertTrue(canonical_method('pbkdf2').startswith('pbkdf2:sha256:'))
+        self.assertEqual(canonical_method('pbkdf2:sha512:5000'), 'pbkdf2:sha512:5000')
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,125 @@
+import gc
+import os
+import tempfile
+import unittest
+from datetime import date, datetime
+from alembic.autogenerate import compare_metadata
+from alembic.migration import MigrationContext
+from flask_migrate import upgrade
+from sqlalchemy import inspect, select, text
+from app import cashflow, create_app, db, rollups
+from app.config import ProductionConfig, TestConfig
+from app.lifecycle import preload, require
+from app.models import DailyCashFlow
+
+MIGRATIONS = os.path.join(os.path.dirname(os.path.dirname(__file__)), 'migrations')
+
+
+class TestProductionFactory(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class Production(ProductionConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.path}'
+            JWT_SECRET_KEY = TestConfig.JWT_SECRET_KEY
+            RATELIMIT_STORAGE_URI = 'memory://'
+            PASSWORD_HASH_WORKERS = 0
+
+        self.config = Production
+
+    def tearDown(self):
+        os.remove(self.path)
+
+    def test_schema_is_left_to_migrations(self):
+        app = create_app(self.config)
+        with app.app_context():
+            self.assertEqual(inspect(db.engine).get_table_names(), [])
+
+    def test_migrations_build_the_models_schema(self):
+        self.config.LAZY_EXTENSIONS = False
+        app = create_app(self.config)
+        with app.app_context():
+            upgrade(directory=MIGRATIONS)
+            with db.engine.connect() as conn:
+                # The options `flask db migrate` runs with (which leave out the search index).
+                context = MigrationContext.configure(conn, opts=app.extensions['migrate'].configure_args)
+                self.assertEqual(compare_metadata(context, db.metadata), [])
+
+    def test_migrations_backfill_rollups_and_cash_flow(self):
+        self.config.LAZY_EXTENSIONS = False
+        app = create_app(self.config)
+        with app.app_context():
+            # Rows written before financial_summary existed.
+            upgrade(directory=MIGRATIONS, revision='b41d09e6f58c')
+            db.session.execute(text(
+                "INSERT INTO user (id, email, password_hash) VALUES "
+                "(1, 'a@example.com', 'x'), (2, 'b@example.com', 'x'), (3, 'c@example.com', 'x')"))
+            db.session.execute(text(
+                "INSERT INTO income (user_id, amount, date) VALUES "
+                "(1, 100.0, '2026-01-05 09:00:00.000000'), (1, 50.0, '2026-01-05 18:00:00.000000'), "
+                "(2, 10.0, '2026-02-01 00:00:00.000000')"))
+            db.session.execute(text(
+                "INSERT INTO expense (user_id, amount, date) VALUES "
+                "(1, 30.0, '2026-01-06 12:00:00.000000'), (3, 5.0, '2026-03-01 08:00:00.000000')"))
+            db.session.execute(text("INSERT INTO savings (user_id, balance) VALUES (1, 250.0), (3, 0.0)"))
+            db.session.commit()
+
+            upgrade(directory=MIGRATIONS)
+            self.assertEqual(rollups.rebuild(dry_run=True), [])
+            self.assertEqual(rollups.get_summary(1), {
+                'total_income': 150.0, 'income_count': 2, 'total_expenses': 30.0, 'expense_count': 1,
+                'savings_balance': 250.0, 'last_activity_at': datetime(2026, 1, 6, 12)})
+
+            buckets = db.session.execute(select(DailyCashFlow.__table__).order_by('user_id', 'day')).all()
+            self.assertEqual([tuple(row) for row in buckets], [
+                (1, date(2026, 1, 5), 150.0, 2, 0.0, 0), (1, date(2026, 1, 6), 0.0, 0, 30.0, 1),
+                (2, date(2026, 2, 1), 10.0, 1, 0.0, 0), (3, date(2026, 3, 1), 0.0, 0, 5.0, 1)])
+            cashflow.rebuild()
+            self.assertEqual(db.session.execute(select(DailyCashFlow.__table__).order_by('user_id', 'day')).all(),
+                             buckets)
+
+    def test_mail_and_migrate_are_initialized_on_first_use(self):
+        app = create_app(self.config)
+        self.assertNotIn('mail', app.extensions)
+        self.assertNotIn('migrate', app.extensions)
+        with app.app_context():
+            require('mail')
+            require('mail')
+        self.assertIn('mail', app.extensions)
+        require('migrate', app)
+        self.assertIn('migrate', app.extensions)
+        self.assertEqual(app.extensions['deferred'], {})
+
+    def test_preloaded_app_gives_each_worker_fresh_connections(self):
+        app = create_app(self.config)
+        with app.app_context():
+            db.session.execute(text('SELECT 1'))
+            db.session.remove()
+        self.addCleanup(gc.unfreeze)
+        preload(app, db)
+        with app.app_context():
+            self.assertEqual(db.engine.pool.checkedin(), 0)
+            db.session.execute(text('SELECT 1'))
+            db.session.remove()
+            inherited = db.engine.pool.checkedin()
+        self.assertGreater(gc.get_freeze_count(), 0)
+
+        pid = os.fork()
+        if pid == 0:  # pragma: no cover - the child reports through its exit code
+            ok = False
+            try:
+                with app.app_context():
+                    ok = db.engine.pool.checkedin() == 0
+                    ok = ok and db.session.execute(text('SELECT 1')).scalar() == 1
+            finally:
+                os._exit(0 if ok else 1)
+        _, status = os.waitpid(pid, 0)
+        self.assertEqual(os.waitstatus_to_exitcode(status), 0)
+        with app.app_context():
+            self.assertEqual(db.engine.pool.checkedin(), inherited)
+
+
+if __name__ == '__main__':
+    unittest.main()
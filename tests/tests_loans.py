@@ -0,0 +1,132 @@
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import cashflow, create_app, db, loans
+from app.config import TestConfig
+from app.models import DailyCashFlow, User, LoanApplication
+
+
+def application(**overrides):
+    data = {
+        'first_name': 'Jane',
+        'last_name': 'Doe',
+        'email_address': 'jane@example.com',
+        'phone_number': '+254712345678',
+        'required_treatment': 'Knee surgery',
+        'estimated_cost': 1200,
+        'healthcare_provider': 'Nairobi Hospital',
+        'term_months': 12,
+    }
+    data.update(overrides)
+    return data
+
+
+class TestRepaymentMath(unittest.TestCase):
+
+    def test_monthly_payment(self):
+        self.assertAlmostEqual(float(loans.monthly_payment(1200, 0.0, 12)), 100.0)
+        self.assertAlmostEqual(float(loans.monthly_payment(1000, 0.12, 12)), 88.8488, places=4)
+
+    def test_schedule_repays_principal(self):
+        schedule = loans.repayment_schedule(1000, 0.12, 12)
+        self.assertEqual(len(schedule), 12)
+        self.assertEqual(schedule[0], {'month': 1, 'payment': 88.85, 'interest': 10.0,
+                                       'principal': 78.85, 'balance': 921.15})
+        self.assertEqual(schedule[-1]['balance'], 0.0)
+        self.assertAlmostEqual(sum(row['principal'] for row in schedule), 1000, places=1)
+
+
+class TestLoanApplications(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            users = [User(email=f'loan{n}@example.com', password_hash='x') for n in range(4)]
+            db.session.add_all(users)
+            db.session.commit()
+            self.headers = [{'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+                            for user in users]
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def apply(self, user, **overrides):
+        return self.client.post('/api/loans', json=application(**overrides), headers=self.headers[user])
+
+    def history(self, user, monthly_income, monthly_expenses):
+        """Six months of income and expenses inside the scoring window."""
+        now = datetime.utcnow()
+        for kind, amount in (('income', monthly_income), ('expense', monthly_expenses)):
+            entries = [{'amount': amount, 'date': (now - timedelta(days=30 * month + 1)).isoformat()}
+                       for month in range(6)]
+            response = self.client.post(f'/api/{kind}/batch', json=entries, headers=self.headers[user])
+            self.assertEqual(response.status_code, 201)
+
+    def test_intake_validation(self):
+        response = self.apply(0)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['status'], 'pending')
+
+        for overrides in ({'phone_number': '0712345678'}, {'email_address': 'not-an-email'},
+                          {'estimated_cost': -5}, {'term_months': 7}, {'first_name': ' '},
+                          {'phone_number': None}):
+            response = self.apply(0, **overrides)
+            self.assertEqual(response.status_code, 400, overrides)
+        self.assertEqual(self.client.post('/api/loans', json=application()).status_code, 401)
+
+    def score_and_check(self, workers):
+        # A 1200 loan over 12 months costs 106.62 a month; the ratio limit is 10% of income.
+        self.history(0, 3000, 1000)
+        self.history(1, 1000, 800)
+        self.history(3, 1000, 990)
+        self.apply(0)                       # 3.6% of income: approved
+        self.apply(1, estimated_cost=4000)  # 355.39 exceeds the 200 free cash: declined
+        self.apply(1)                       # fits the free cash but is 10.7% of income: review
+        self.apply(2)                       # no history: declined
+        self.apply(3)                       # 10 free cash: declined
+
+        with self.app.app_context():
+            self.app.config['LOAN_MAX_PAYMENT_RATIO'] = 0.1
+            counts = loans.score_pending(chunk_size=2, workers=workers)
+            statuses = dict(db.session.execute(
+                db.select(LoanApplication.id, LoanApplication.status).order_by(LoanApplication.id)).all())
+        self.assertEqual(list(statuses.values()), ['approved', 'declined', 'review', 'declined', 'declined'])
+        self.assertEqual(counts, {'approved': 1, 'review': 1, 'declined': 3})
+
+        loan = self.client.get('/api/loans/1', headers=self.headers[0]).get_json()
+        self.assertEqual(loan['monthly_payment'], 106.62)
+        self.assertEqual(len(loan['repayment_schedule']), 12)
+        self.assertEqual(self.client.get('/api/loans/1', headers=self.headers[1]).status_code, 404)
+        self.assertEqual(len(self.client.get('/api/loans', headers=self.headers[1]).get_json()), 2)
+
+        with self.app.app_context():
+            self.assertEqual(sum(loans.score_pending(workers=workers).values()), 0)
+
+    def test_scoring_needs_the_cash_flow_buckets(self):
+        self.history(0, 3000, 1000)
+        self.apply(0)
+        with self.app.app_context():
+            db.session.execute(db.delete(DailyCashFlow))
+            db.session.commit()
+            with self.assertRaises(loans.CashFlowMissing):
+                loans.score_pending(workers=0)
+            result = self.app.test_cli_runner().invoke(args=['loans', 'score', '--workers', '0'])
+            self.assertEqual(result.exit_code, 1)
+            self.assertIn('flask rollups rebuild', result.output)
+            self.assertEqual(db.session.get(LoanApplication, 1).status, loans.PENDING)
+            cashflow.rebuild()
+            self.assertEqual(loans.score_pending(workers=0), {'approved': 1})
+
+    def test_scoring_inline(self):
+        self.score_and_check(workers=0)
+
+    def test_scoring_in_process_pool(self):
+        self.score_and_check(workers=1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,118 @@
+import json
+import logging
+import os
+import tempfile
+import threading
+import unittest
+from unittest import mock
+from app import create_app, db, log_pipeline
+from app.config import TestConfig
+from app.logs import REDACTED, JSONFormatter, RedactingFormatter, SamplingFilter
+
+
+def record(msg, *args, level=logging.INFO, name='app.routes', **extra):
+    entry = logging.LogRecord(name, level, __file__, 1, msg, args, None)
+    entry.__dict__.update(extra)
+    return entry
+
+
+class Traced:
+    """Notes which thread turned it into text."""
+
+    def __init__(self):
+        self.formatted_in = []
+
+    def __str__(self):
+        self.formatted_in.append(threading.current_thread().name)
+        return 'traced'
+
+
+class TestFormatters(unittest.TestCase):
+
+    def test_json_records_are_redacted(self):
+        formatter = JSONFormatter(redact=['email', 'message'])
+        line = formatter.format(record('Request data: %s from %s', {'email': 'a@b.io', 'amount': 5},
+                                       'jane@example.com', user_id=7, email='a@b.io'))
+        payload = json.loads(line)
+        self.assertEqual(payload['level'], 'INFO')
+        self.assertEqual(payload['logger'], 'app.routes')
+        self.assertEqual(payload['message'],
+                         f"Request data: {{'email': '{REDACTED}', 'amount': 5}} from {REDACTED}")
+        self.assertEqual((payload['user_id'], payload['email']), (7, REDACTED))
+
+    def test_text_format_redacts_too(self):
+        formatter = RedactingFormatter('%(levelname)s %(message)s', redact=['password'])
+        self.assertEqual(formatter.format(record('login %s', {'password': 'pw', 'ok': True})),
+                         f"INFO login {{'password': '{REDACTED}', 'ok': True}}")
+
+    def test_sampling_uses_longest_prefix_and_keeps_warnings(self):
+        sampler = SamplingFilter({'app': 0.0, 'app.outbox': 1.0})
+        self.assertFalse(sampler.filter(record('x', name='app.routes')))
+        self.assertTrue(sampler.filter(record('x', name='app.outbox')))
+        self.assertTrue(sampler.filter(record('x', name='werkzeug')))
+        self.assertTrue(sampler.filter(record('x', name='app.routes', level=logging.WARNING)))
+        with mock.patch('app.logs.random.random', side_effect=[0.2, 0.7]):
+            half = SamplingFilter({'app': 0.5})
+            self.assertEqual([half.filter(record('x')), half.filter(record('x'))], [True, False])
+
+
+class TestLogPipeline(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.log')
+        os.close(handle)
+        self.overrides = {'LOG_FILE': self.path, 'LOG_LEVEL': 'DEBUG'}
+
+    def tearDown(self):
+        log_pipeline.stop()
+        os.remove(self.path)
+
+    def _make_app(self, **overrides):
+        config = type('LogConfig', (TestConfig,), {**self.overrides, **overrides})
+        self.app = create_app(config)
+        with self.app.app_context():
+            db.create_all()
+        return self.app
+
+    def _lines(self):
+        log_pipeline.stop()  # flushes the queue
+        with open(self.path) as handle:
+            return [json.loads(line) for line in handle]
+
+    def test_contact_form_is_logged_without_pii(self):
+        self._make_app()
+        contact = {'name': 'Jane Doe', 'email': 'jane@example.com', 'message': 'My knee hurts'}
+        self.assertEqual(self.app.test_client().post('/api/send-message', json=contact).status_code, 200)
+        lines = self._lines()
+        self.assertIn('Message saved to database successfully.', [line['message'] for line in lines])
+        written = json.dumps(lines)
+        for value in contact.values():
+            self.assertNotIn(value, written)
+
+    def test_formatting_happens_off_the_request_thread(self):
+        self._make_app()
+        traced = Traced()
+        # Straight to our handler: pytest hooks its own into every logger.
+        log_pipeline.handler.handle(record('value: %s', traced))
+        self.assertEqual(self._lines()[-1]['message'], 'value: traced')
+        self.assertEqual(len(traced.formatted_in), 1)
+        self.assertNotEqual(traced.formatted_in[0], threading.current_thread().name)
+
+    def test_records_below_level_are_never_formatted(self):
+        self._make_app(LOG_LEVEL='WARNING')
+        traced = Traced()
+        logging.getLogger('app.routes').debug('value: %s', traced)
+        self.assertEqual(self._lines(), [])
+        self.assertEqual(traced.formatted_in, [])
+
+    def test_full_queue_drops_instead_of_blocking(self):
+        self._make_app(LOG_QUEUE_SIZE=1)
+        log_pipeline.listener.stop()  # nothing drains the queue now
+        dropped = log_pipeline.dropped
+        for n in range(3):
+            logging.getLogger('app.routes').info('burst %s', n)
+        self.assertEqual(log_pipeline.dropped - dropped, 2)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import unittest
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from sqlalchemy.exc import OperationalError
+from app import create_app, db, metrics
+from app.config import TestConfig
+from app.metrics import NPlusOneError, statement_shape
+from app.models import User, Income
+
+
+class MetricsConfig(TestConfig):
+    METRICS_EXPOSE = True
+    METRICS_TOKEN = 'scrape-token'
+
+
+class TestMetrics(unittest.TestCase):
+
+    def setUp(self):
+        metrics.reset()
+        self.app = create_app(MetricsConfig)
+
+        @self.app.route('/n-plus-one')
+        def n_plus_one():
+            for user_id in range(1, 13):
+                db.session.get(User, user_id)
+                db.session.expunge_all()
+            return {'ok': True}
+
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='metrics@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _samples(self):
+        response = self.client.get('/metrics', headers={'Authorization': 'Bearer scrape-token'})
+        self.assertEqual(response.status_code, 200)
+        body = response.get_data(as_text=True)
+        samples = {}
+        for line in body.splitlines():
+            if line and not line.startswith('#'):
+                name, value = line.rsplit(' ', 1)
+                samples[name] = float(value)
+        return samples
+
+    def test_per_endpoint_histograms(self):
+        self.client.get('/api/dashboard', headers=self.headers)
+        self.client.get('/api/dashboard', headers=self.headers)
+        self.client.get('/api/about-us')
+
+        samples = self._samples()
+        label = 'endpoint="main.get_dashboard_data"'
+        self.assertEqual(samples[f'healthfin_request_duration_seconds_count{{{label}}}'], 2)
+        self.assertEqual(samples[f'healthfin_sql_queries_per_request_sum{{{label}}}'], 2)
+        self.assertGreater(samples[f'healthfin_sql_duration_seconds_sum{{{label}}}'], 0)
+        self.assertGreater(samples[f'healthfin_serialization_duration_seconds_sum{{{label}}}'], 0)
+        self.assertEqual(samples[f'healthfin_sql_queries_per_request_bucket{{{label},le="0"}}'], 0)
+        self.assertEqual(samples[f'healthfin_sql_queries_per_request_bucket{{{label},le="1"}}'], 2)
+        self.assertEqual(samples['healthfin_requests_total{endpoint="main.get_dashboard_data",method="GET",status="200"}'], 2)
+        self.assertEqual(samples['healthfin_sql_queries_per_request_sum{endpoint="main.get_about_us"}'], 0)
+        self.assertNotIn('healthfin_request_duration_seconds_count{endpoint="metrics"}', samples)
+
+    def test_endpoint_is_private(self):
+        self.assertEqual(self.client.get('/metrics').status_code, 401)
+        self.assertEqual(self.client.get('/metrics', headers={'Authorization': 'Bearer guess'}).status_code, 401)
+        self.assertEqual(self.client.get('/metrics', headers=self.headers).status_code, 401)
+        # Collected but not served unless METRICS_EXPOSE is set.
+        app = create_app(TestConfig)
+        self.assertIn('metrics', app.extensions)
+        self.assertEqual(app.test_client().get('/metrics').status_code, 404)
+
+    def test_failed_statements_leave_nothing_on_the_connection(self):
+        @self.app.route('/broken-query')
+        def broken_query():
+            try:
+                db.session.execute(text('SELECT * FROM no_such_table'))
+            except OperationalError:
+                db.session.rollback()
+            db.session.execute(text('SELECT 1'))
+            return {'info': sorted(db.session.connection().info)}
+
+        for _ in range(3):
+            self.assertNotIn('metrics_query_start', self.client.get('/broken-query').json['info'])
+        samples = self._samples()
+        self.assertEqual(samples['healthfin_sql_queries_per_request_sum{endpoint="broken_query"}'], 3.0)
+
+    def test_n_plus_one_fails_in_tests(self):
+        with self.assertRaises(NPlusOneError):
+            self.client.get('/n-plus-one')
+
+    def test_n_plus_one_warns_outside_tests(self):
+        self.app.config['METRICS_N_PLUS_ONE_RAISE'] = False
+        with self.assertLogs('app.metrics', level='WARNING') as logs:
+            self.assertEqual(self.client.get('/n-plus-one').status_code, 200)
+        self.assertIn('Possible N+1 in n_plus_one', logs.output[0])
+        self.assertEqual(self._samples()['healthfin_n_plus_one_total{endpoint="n_plus_one"}'], 1)
+
+    def test_batch_statements_are_one_shape(self):
+        self.assertEqual(statement_shape('SELECT * FROM t WHERE id IN (?, ?, ?)'),
+                         statement_shape('SELECT * FROM t WHERE id IN (?)'))
+        response = self.client.post('/api/income/batch', json=[{'amount': 1}] * 50, headers=self.headers)
+        self.assertEqual(response.status_code, 201)
+        with self.app.app_context():
+            self.assertEqual(Income.query.count(), 50)
+
+
+if __name__ == '__main__':
+    unittest.main()
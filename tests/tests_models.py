@@ -1,29 +1,56 @@
 import unittest
-from myapp import create_app, db
-from myapp.models import User, Savings, Transaction, LoanApplication, EmailVerificationToken, PasswordResetToken, ContactFormSubmission, ContactMessage, SavingPlan
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User, Savings, Transaction, LoanApplication, ContactMessage, SavingPlan
 from datetime import datetime
 
 class TestModels(unittest.TestCase):
 
     def setUp(self):
-        self.app = create_app('test')
+        self.app = create_app(TestConfig)
         self.client = self.app.test_client()
-        with self.app.app_context():
-            db.create_all()
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
 
     def tearDown(self):
-        with self.app.app_context():
-            db.session.remove()
-            db.drop_all()
+        db.session.remove()
+        db.drop_all()
+        self.app_context.pop()
 
     def test_user_creation(self):
-        user = User(first_name='John', last_name='Doe', phone_number='123456789', email='john@example.com')
+        user = User(email='john@example.com', password_hash='hashed')
         db.session.add(user)
         db.session.commit()
 
         saved_user = User.query.filter_by(email='john@example.com').first()
         self.assertIsNotNone(saved_user)
-        self.assertEqual(saved_user.first_name, 'John')
+        self.assertEqual(saved_user.password_hash, 'hashed')
+
+    def test_user_relationships(self):
+        user = User(email='jane@example.com', password_hash='hashed')
+        db.session.add(user)
+        db.session.flush()
+        db.session.add(Savings(user_id=user.id, balance=10.0))
+        db.session.add(Transaction(user_id=user.id, type='deposit', amount=10.0))
+        db.session.add(LoanApplication(user_id=user.id, first_name='Jane', last_name='Doe',
+                                       email_address='jane@example.com', phone_number='+254712345678',
+                                       required_treatment='Dental', estimated_cost=500.0,
+                                       healthcare_provider='City Clinic'))
+        db.session.commit()
+
+        self.assertEqual(user.savings[0].balance, 10.0)
+        self.assertEqual(user.transactions[0].owner, user)
+        self.assertEqual(user.loans[0].applicant, user)
+        self.assertIsInstance(user.transactions[0].timestamp, datetime)
+
+    def test_contact_message_and_saving_plan(self):
+        db.session.add(ContactMessage(name='Jane', email='jane@example.com', message='Hi'))
+        db.session.add(SavingPlan(name='Monthly Deposit', description='Save monthly'))
+        db.session.commit()
+
+        self.assertIsNotNone(ContactMessage.query.one().timestamp)
+        self.assertEqual(SavingPlan.query.one().name, 'Monthly Deposit')
 
     # Add more tests for other models...
 
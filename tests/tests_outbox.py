@@ -0,0 +1,138 @@
+import os
+import tempfile
+import time
+import unittest
+from datetime import datetime, timedelta
+from app import create_app, db, outbox
+from app.config import TestConfig
+from app.models import ContactMessage, EmailOutbox
+from app.testing import SMTPStub
+
+CONTACT = {'name': 'Jane', 'email': 'jane@example.com', 'message': 'Hello there'}
+
+
+class TestOutbox(unittest.TestCase):
+
+    def setUp(self):
+        self.smtp = SMTPStub().start()
+        # A file, not sqlite://: the worker pool test drains from several
+        # threads, and an in-memory database is one shared connection.
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class OutboxConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.path}'
+            OUTBOX_RETRY_BASE_SECONDS = 60
+            OUTBOX_MAX_ATTEMPTS = 2
+
+        for key, value in self.smtp.mail_config().items():
+            setattr(OutboxConfig, key, value)
+        self.app = create_app(OutboxConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+        self.smtp.stop()
+        os.remove(self.path)
+
+    def _statuses(self):
+        with self.app.app_context():
+            return [row.status for row in EmailOutbox.query.order_by(EmailOutbox.id)]
+
+    def test_send_message_only_queues(self):
+        self.smtp.delay = 1.0
+        started = time.perf_counter()
+        response = self.client.post('/api/send-message', json=CONTACT)
+        self.assertLess(time.perf_counter() - started, 0.5)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(self.smtp.connections, 0)
+        with self.app.app_context():
+            self.assertEqual(ContactMessage.query.count(), 1)
+        self.assertEqual(self._statuses(), ['pending', 'pending'])
+
+    def test_drain_reuses_one_connection_for_all_batches(self):
+        for _ in range(3):
+            self.client.post('/api/send-message', json=CONTACT)
+        self.app.config['OUTBOX_BATCH_SIZE'] = 2
+        with self.app.app_context():
+            self.assertEqual(outbox.drain(), 6)
+        self.assertEqual(self.smtp.connections, 1)
+        self.assertEqual(len(self.smtp.messages), 6)
+        self.assertEqual(self._statuses(), ['sent'] * 6)
+        _, recipients, message = self.smtp.messages[1]
+        self.assertEqual(recipients, ['<jane@example.com>'])
+        self.assertEqual(message['Subject'], 'Your Message Received')
+
+    def test_transient_failures_back_off_then_dead_letter(self):
+        self.client.post('/api/send-message', json=CONTACT)
+        self.smtp.fail_next = 1
+        with self.app.app_context():
+            outbox.drain()
+            first = db.session.get(EmailOutbox, 1)
+            self.assertEqual((first.status, first.attempts), ('pending', 1))
+            self.assertGreater(first.next_attempt_at, datetime.utcnow() + timedelta(seconds=50))
+            self.assertEqual(db.session.get(EmailOutbox, 2).status, 'sent')
+
+            # Not due yet: nothing is claimed.
+            self.assertEqual(outbox.drain(), 0)
+
+            first.next_attempt_at = datetime.utcnow()
+            db.session.commit()
+            self.smtp.fail_next = 1
+            outbox.drain()
+            db.session.expire_all()
+            first = db.session.get(EmailOutbox, 1)
+            self.assertEqual((first.status, first.attempts), ('dead', 2))
+            self.assertIn('451', first.last_error)
+
+    def test_expired_leases_are_charged_an_attempt(self):
+        self.client.post('/api/send-message', json=CONTACT)
+        with self.app.app_context():
+            # A worker claims both messages and dies before sending either.
+            self.assertEqual(len(outbox.claim_batch()), 2)
+            self.assertEqual(outbox.claim_batch(), [])
+            EmailOutbox.query.update({'claimed_until': datetime.utcnow() - timedelta(seconds=1)})
+            db.session.commit()
+
+            reclaimed = outbox.claim_batch(limit=1)
+            self.assertEqual([(row.id, row.status, row.attempts) for row in reclaimed], [(1, 'sending', 1)])
+
+            # The second lease ran out too; with OUTBOX_MAX_ATTEMPTS = 2, losing
+            # the first message again uses its last attempt.
+            EmailOutbox.query.update({'claimed_until': datetime.utcnow() - timedelta(seconds=1)})
+            db.session.commit()
+            self.assertEqual([(row.id, row.attempts) for row in outbox.claim_batch()], [(2, 1)])
+            db.session.expire_all()
+            first = db.session.get(EmailOutbox, 1)
+            self.assertEqual((first.status, first.attempts, first.last_error), ('dead', 2, 'Lease expired'))
+
+    def test_unreachable_server_charges_an_attempt(self):
+        self.client.post('/api/send-message', json=CONTACT)
+        self.smtp.stop()
+        with self.app.app_context():
+            outbox.drain()
+        self.smtp.start()
+        self.assertEqual(self._statuses(), ['pending', 'pending'])
+        with self.app.app_context():
+            self.assertEqual({row.attempts for row in EmailOutbox.query}, {1})
+
+    def test_worker_pool_drains_in_background(self):
+        for _ in range(5):
+            self.client.post('/api/send-message', json=CONTACT)
+        pool = outbox.OutboxWorkerPool(self.app, workers=3, poll_interval=0.05).start()
+        try:
+            deadline = time.time() + 5
+            while len(self.smtp.messages) < 10 and time.time() < deadline:
+                time.sleep(0.05)
+        finally:
+            pool.stop()
+        self.assertEqual(len(self.smtp.messages), 10)
+        self.assertEqual(self._statuses(), ['sent'] * 10)
+
+
+if __name__ == '__main__':
+    unittest.main()
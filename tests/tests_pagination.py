@@ -0,0 +1,109 @@
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User, Savings, Transaction, Income, Expense
+from app.pagination import encode_cursor
+
+
+class TestKeysetPagination(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user, other = User(email='pages@example.com', password_hash='x'), User(email='other@example.com', password_hash='x')
+            db.session.add_all([user, other])
+            db.session.flush()
+            base = datetime(2024, 1, 1)
+            db.session.add(Savings(user_id=user.id, balance=0))
+            for n in range(10):
+                # Income and expense share timestamps and ids to exercise the tie-breakers.
+                when = base + timedelta(days=n // 2)
+                db.session.add(Income(id=n + 1, user_id=user.id, amount=float(n), date=when))
+                db.session.add(Expense(id=n + 1, user_id=user.id, amount=float(n), date=when))
+                db.session.add(Transaction(user_id=user.id, type='deposit' if n % 2 else 'withdraw',
+                                           amount=float(n), timestamp=when))
+            db.session.add(Income(user_id=other.id, amount=999.0, date=base))
+            db.session.commit()
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _walk(self, path, direction='before', cursor=None):
+        seen = []
+        while True:
+            query = f'{path}&{direction}={cursor}' if cursor else path
+            body = self.client.get(query, headers=self.headers).json
+            seen.extend(body['items'])
+            cursor = body['next_cursor' if direction == 'before' else 'prev_cursor']
+            if not cursor:
+                return seen, body
+
+    def test_finances_pages_cover_everything_once_newest_first(self):
+        items, _ = self._walk('/api/finances?limit=7')
+        keys = [(i['date'], i['id'], i['kind']) for i in items]
+        self.assertEqual(len(keys), 30)
+        self.assertEqual(len(set(keys)), 30)
+        self.assertEqual(keys, sorted(keys, reverse=True))
+        self.assertNotIn(999.0, [i['amount'] for i in items])
+
+    def test_after_walks_back_towards_newest(self):
+        first = self.client.get('/api/finances?limit=4', headers=self.headers).json
+        second = self.client.get(f"/api/finances?limit=4&before={first['next_cursor']}", headers=self.headers).json
+        back = self.client.get(f"/api/finances?limit=4&after={second['prev_cursor']}", headers=self.headers).json
+        self.assertEqual(back['items'], first['items'])
+        self.assertIsNone(back['prev_cursor'])
+
+    def test_type_and_date_filters(self):
+        body = self.client.get('/api/finances?type=expense&start=2024-01-02&end=2024-01-04&limit=50',
+                               headers=self.headers).json
+        self.assertEqual({i['kind'] for i in body['items']}, {'expense'})
+        self.assertEqual(len(body['items']), 4)
+        self.assertIsNone(body['next_cursor'])
+
+        history = self.client.get('/api/savings/history?type=deposit&limit=2', headers=self.headers).json
+        self.assertEqual({t['type'] for t in history['items']}, {'deposit'})
+        deposits, _ = self._walk('/api/savings/history?type=deposit&limit=2')
+        self.assertEqual(len(deposits), 5)
+
+    def test_bad_parameters(self):
+        for query in ('limit=0', 'limit=abc', 'before=garbage', 'type=bogus', 'start=yesterday'):
+            with self.subTest(query=query):
+                response = self.client.get(f'/api/finances?{query}', headers=self.headers)
+                self.assertEqual(response.status_code, 400)
+
+    def test_malformed_cursors(self):
+        # Well-formed base64 JSON of the wrong shape: ["2026-01-01"], {"a": 1} and [].
+        cursors = ['WyIyMDI2LTAxLTAxIl0', 'eyJhIjogMX0', 'W10']
+        # The right shape with parts of the wrong type.
+        cursors += [encode_cursor(*key) for key in (
+            ('2024-01-01T00:00:00', {'a': 1}), (1, 2), ('2024-01-01T00:00:00', True),
+            ('2024-01-01T00:00:00', 1.5, 'income'), ('2024-01-01T00:00:00', 1, {'a': 1}),
+            ('2024-01-01T00:00:00', 1, 'bogus'))]
+        for cursor in cursors:
+            for path in ('/api/finances', '/api/savings/history'):
+                for direction in ('before', 'after'):
+                    with self.subTest(cursor=cursor, path=path, direction=direction):
+                        response = self.client.get(f'{path}?{direction}={cursor}', headers=self.headers)
+                        self.assertEqual(response.status_code, 400)
+                        self.assertEqual(response.json, {'error': 'Invalid cursor'})
+
+    def test_legacy_shape(self):
+        body = self.client.get('/api/finances?legacy=1', headers=self.headers).json
+        self.assertEqual(set(body), {'income', 'expenses', 'transactions'})
+        self.assertEqual(len(body['income']), 10)
+
+        self.app.config['LEGACY_LIST_RESPONSES'] = True
+        history = self.client.get('/api/savings/history', headers=self.headers).json
+        self.assertIsInstance(history, list)
+        self.assertEqual(set(history[0]), {'id', 'amount', 'type'})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,86 @@
+import os
+import tempfile
+import threading
+import unittest
+from flask_jwt_extended import create_access_token
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User, Savings, Transaction, FinancialSummary
+
+
+class TestSavingsPostings(unittest.TestCase):
+
+    def setUp(self):
+        # A file database so the concurrency test gets one connection per thread.
+        handle, self.db_path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class PostingConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.db_path}'
+
+        self.app = create_app(PostingConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='saver@example.com', password_hash='x')
+            db.session.add(user)
+            db.session.commit()
+            self.user_id = user.id
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+            db.engine.dispose()
+        os.remove(self.db_path)
+
+    def _post(self, kind, amount):
+        return self.client.post(f'/api/savings/{kind}', json={'amount': amount}, headers=self.headers)
+
+    def test_postings_write_ledger_rows(self):
+        self.assertEqual(self._post('withdraw', 5).status_code, 404)
+        self.assertEqual(self._post('deposit', 100).status_code, 200)
+        self.assertEqual(self._post('deposit', 20).status_code, 200)
+        self.assertEqual(self._post('withdraw', 500).status_code, 400)
+        self.assertEqual(self._post('withdraw', 70).status_code, 200)
+
+        with self.app.app_context():
+            self.assertEqual(Savings.query.filter_by(user_id=self.user_id).one().balance, 50.0)
+            ledger = [(t.type, t.amount) for t in Transaction.query.order_by(Transaction.id)]
+            self.assertEqual(ledger, [('deposit', 100.0), ('deposit', 20.0), ('withdraw', 70.0)])
+            self.assertEqual(db.session.get(FinancialSummary, self.user_id).savings_balance, 50.0)
+
+        history = self.client.get('/api/savings/history', headers=self.headers).json
+        self.assertEqual([t['type'] for t in history['items']], ['withdraw', 'deposit', 'deposit'])
+
+    def test_concurrent_postings_do_not_lose_updates(self):
+        self._post('deposit', 100)
+        threads, per_thread = 8, 15
+        outcomes = []
+
+        def hammer(n):
+            client = self.app.test_client()
+            for i in range(per_thread):
+                kind = 'deposit' if (n + i) % 2 else 'withdraw'
+                response = client.post(f'/api/savings/{kind}', json={'amount': 10}, headers=self.headers)
+                outcomes.append((kind, response.status_code))
+
+        workers = [threading.Thread(target=hammer, args=(n,)) for n in range(threads)]
+        for worker in workers:
+            worker.start()
+        for worker in workers:
+            worker.join()
+
+        deposits = sum(1 for kind, status in outcomes if kind == 'deposit' and status == 200)
+        withdrawals = sum(1 for kind, status in outcomes if kind == 'withdraw' and status == 200)
+        self.assertTrue(all(status in (200, 400) for _, status in outcomes))
+        with self.app.app_context():
+            balance = Savings.query.filter_by(user_id=self.user_id).one().balance
+            self.assertEqual(balance, 100 + 10 * (deposits - withdrawals))
+            self.assertGreaterEqual(balance, 0)
+            self.assertEqual(Transaction.query.count(), 1 + deposits + withdrawals)
+
+
+if __name__ == '__main__':
+    unittest.main()
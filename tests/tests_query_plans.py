@@ -0,0 +1,107 @@
+import unittest
+from datetime import datetime, timedelta
+from sqlalchemy import event
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User, Savings, Transaction, Income, Expense
+
+PER_USER_TABLES = {'income', 'expense', 'savings', 'transaction', 'loan_application', 'daily_cash_flow',
+                   'financial_summary', 'saving_plan_enrollment'}
+PER_USER_ROUTES = [
+    '/api/dashboard',
+    '/api/finances',
+    '/api/finances?legacy=1',
+    '/api/expenses/summary',
+    '/api/savings/history',
+    '/api/savings/history?legacy=1',
+    '/api/analytics/cash-flow?granularity=week',
+    '/api/saving-plans',
+    '/api/saving-plans/projection',
+    '/api/loans',
+    '/api/export?format=ndjson',
+]
+
+
+class TestQueryPlans(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            users = [User(email=f'user{n}@example.com', password_hash='x') for n in range(3)]
+            db.session.add_all(users)
+            db.session.flush()
+            now = datetime.utcnow()
+            for user in users:
+                db.session.add(Savings(user_id=user.id, balance=100.0))
+                for day in range(5):
+                    when = now - timedelta(days=day)
+                    db.session.add(Income(user_id=user.id, amount=10.0, date=when))
+                    db.session.add(Expense(user_id=user.id, amount=5.0, date=when))
+                    db.session.add(Transaction(user_id=user.id, type='deposit', amount=1.0, timestamp=when))
+            db.session.commit()
+            self.user_id = users[0].id
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _auth_headers(self):
+        from flask_jwt_extended import create_access_token
+        with self.app.app_context():
+            token = create_access_token(identity=str(self.user_id))
+        return {'Authorization': f'Bearer {token}'}
+
+    def _capture_statements(self, path):
+        statements = []
+
+        def before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+            if statement.lstrip().upper().startswith('SELECT'):
+                statements.append((statement, parameters))
+
+        with self.app.app_context():
+            engine = db.engine
+        event.listen(engine, 'before_cursor_execute', before_cursor_execute)
+        try:
+            response = self.client.get(path, headers=self._auth_headers())
+        finally:
+            event.remove(engine, 'before_cursor_execute', before_cursor_execute)
+        self.assertEqual(response.status_code, 200, response.get_data(as_text=True))
+        return statements
+
+    def _full_scans(self, statement, parameters):
+        with self.app.app_context():
+            plan = db.session.connection().exec_driver_sql(
+                f'EXPLAIN QUERY PLAN {statement}', parameters).fetchall()
+        scans = []
+        for row in plan:
+            detail = row[-1]
+            words = detail.split()
+            # Per-user reads must be "SEARCH <table> USING [COVERING] INDEX"
+            # on a user_id prefix. "SCAN <table>", even "USING INDEX", walks
+            # the whole table (or index) across every user.
+            if words[0] == 'SCAN' and words[1].strip('"') in PER_USER_TABLES:
+                scans.append(detail)
+        return scans
+
+    def test_per_user_routes_use_an_index(self):
+        for path in PER_USER_ROUTES:
+            with self.subTest(path=path):
+                statements = self._capture_statements(path)
+                self.assertTrue(statements)
+                for statement, parameters in statements:
+                    self.assertEqual(self._full_scans(statement, parameters), [], statement)
+
+    def test_expenses_summary_sums_in_sql(self):
+        reads = [statement for statement, _ in self._capture_statements('/api/expenses/summary')
+                 if 'FROM expense' in statement]
+        self.assertEqual(len(reads), 1)
+        self.assertIn('sum(expense.amount)', reads[0])
+        response = self.client.get('/api/expenses/summary', headers=self._auth_headers())
+        self.assertEqual(response.json, {'total_expenses': 25.0})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,120 @@
+import multiprocessing
+import os
+import tempfile
+import unittest
+from unittest import mock
+from limits import parse
+from limits.errors import ConfigurationError
+from limits.storage import storage_from_string
+from limits.strategies import SlidingWindowCounterRateLimiter
+from app import create_app, limiter
+from app.config import TestConfig
+from app.ratelimits import SQLiteStorage
+
+
+def _hammer(uri, attempts):
+    storage = storage_from_string(uri)
+    return sum(storage.acquire_sliding_window_entry('shared', 25, 60) for _ in range(attempts))
+
+
+class TestSQLiteStorage(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.uri = f"sqlite:///{os.path.join(self.directory.name, 'ratelimit.db')}"
+        self.storage = storage_from_string(self.uri)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_registered_for_the_sqlite_scheme(self):
+        self.assertIsInstance(self.storage, SQLiteStorage)
+        self.assertTrue(self.storage.check())
+        with self.assertRaises(ConfigurationError):
+            storage_from_string('sqlite://')
+
+    def test_counters_expire(self):
+        with mock.patch('app.ratelimits.time.time', return_value=1000.0):
+            self.assertEqual(self.storage.incr('k', 10), 1)
+            self.assertEqual(self.storage.incr('k', 10, amount=2), 3)
+            self.assertEqual(self.storage.get_expiry('k'), 1010.0)
+        with mock.patch('app.ratelimits.time.time', return_value=1010.0):
+            self.assertEqual(self.storage.get('k'), 0)
+            # An expired counter restarts with a fresh expiry.
+            self.assertEqual(self.storage.incr('k', 10), 1)
+            self.assertEqual(self.storage.get_expiry('k'), 1020.0)
+
+    def test_idle_keys_are_purged(self):
+        with mock.patch('app.ratelimits.time.time', return_value=1000.0):
+            for client in range(5):
+                self.storage.incr(f'idle-{client}', 10)
+        with mock.patch('app.ratelimits.time.time', return_value=2000.0):
+            self.assertEqual(self.storage.purge(), 5)
+            self.storage.incr('active', 10)
+        self.assertEqual(self.storage.reset(), 1)
+
+    def test_sliding_window_weights_previous_window(self):
+        limiter = SlidingWindowCounterRateLimiter(self.storage)
+        item = parse('4 per minute')
+        with mock.patch('app.ratelimits.time.time', return_value=600.0):
+            self.assertEqual([limiter.hit(item, 'ip') for _ in range(5)], [True] * 4 + [False])
+        # A quarter into the next window, 3/4 of the previous 4 hits still count.
+        with mock.patch('app.ratelimits.time.time', return_value=675.0):
+            self.assertEqual([limiter.hit(item, 'ip') for _ in range(2)], [True, False])
+            self.assertEqual(limiter.get_window_stats(item, 'ip').remaining, 0)
+        with mock.patch('app.ratelimits.time.time', return_value=780.0):
+            self.assertTrue(limiter.test(item, 'ip'))
+            limiter.clear(item, 'ip')
+            self.assertEqual(self.storage.get_sliding_window(item.key_for('ip'), 60)[2], 0)
+
+    def test_limit_is_shared_across_processes(self):
+        context = multiprocessing.get_context('spawn')
+        with context.Pool(3) as pool:
+            granted = pool.starmap(_hammer, [(self.uri, 20)] * 3)
+        self.assertEqual(sum(granted), 25)
+
+
+class TestRouteLimits(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        uri = f"sqlite:///{os.path.join(self.directory.name, 'ratelimit.db')}"
+
+        class LimitedConfig(TestConfig):
+            RATELIMIT_STORAGE_URI = uri
+            LOGIN_RATE_LIMIT = '2 per minute'
+            REGISTER_RATE_LIMIT = '1 per minute'
+            CONTACT_RATE_LIMIT = '1 per minute'
+
+        self.app = create_app(LimitedConfig)
+        self.client = self.app.test_client()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_login_register_and_contact_are_limited(self):
+        credentials = {'email': 'jane@example.com', 'password': 'pw'}
+        self.assertEqual(self.client.post('/api/register', json=credentials).status_code, 201)
+        self.assertEqual(self.client.post('/api/register', json=credentials).status_code, 429)
+
+        statuses = [self.client.post('/api/login', json=credentials).status_code for _ in range(3)]
+        self.assertEqual(statuses, [200, 200, 429])
+
+        contact = {'name': 'Jane', 'email': 'jane@example.com', 'message': 'Hello'}
+        self.assertEqual(self.client.post('/api/send-message', json=contact).status_code, 200)
+        response = self.client.post('/api/send-message', json=contact)
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.get_json(), {'error': 'Too many requests'})
+        self.assertGreaterEqual(int(response.headers['Retry-After']), 1)
+
+    def test_limits_are_per_client_address(self):
+        credentials = {'email': 'jane@example.com', 'password': 'pw'}
+        self.client.post('/api/register', json=credentials)
+        response = self.client.post('/api/register', json=credentials,
+                                    environ_base={'REMOTE_ADDR': '10.0.0.2'})
+        self.assertEqual(response.status_code, 400)  # reached the view: already registered
+        self.assertIsInstance(limiter.storage, SQLiteStorage)
+
+
+if __name__ == '__main__':
+    unittest.main()
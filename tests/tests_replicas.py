@@ -0,0 +1,94 @@
+import os
+import tempfile
+import time
+import unittest
+from flask import Flask
+from flask_jwt_extended import create_access_token
+from flask_sqlalchemy import SQLAlchemy
+from app import create_app, db
+from app.config import TestConfig
+from app.replicas import ReadRouter
+from app.models import User, Expense
+
+
+class TestReadReplicaRouting(unittest.TestCase):
+
+    def setUp(self):
+        self.paths = []
+        for _ in range(2):
+            handle, path = tempfile.mkstemp(suffix='.db')
+            os.close(handle)
+            self.paths.append(path)
+        primary, replica = self.paths
+
+        class ReplicaConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{primary}'
+            SQLALCHEMY_BINDS = {'replica': f'sqlite:///{replica}'}
+            READ_YOUR_WRITES_SECONDS = 0.5
+
+        self.app = create_app(ReplicaConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.metadata.create_all(db.engines['replica'])
+            # The "replica" deliberately lags: it has a different expense, so
+            # responses show which database served them.
+            for engine, amount in ((db.engines[None], 10.0), (db.engines['replica'], 99.0)):
+                with engine.begin() as conn:
+                    for user_id in (1, 2):
+                        conn.execute(db.insert(User).values(id=user_id, email=f'u{user_id}@example.com',
+                                                            password_hash='x'))
+                        conn.execute(db.insert(Expense).values(user_id=user_id, amount=amount))
+            self.headers = {
+                user_id: {'Authorization': f'Bearer {create_access_token(identity=str(user_id))}'}
+                for user_id in (1, 2)
+            }
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            for engine in db.engines.values():
+                engine.dispose()
+        for path in self.paths:
+            for suffix in ('', '-wal', '-shm'):
+                if os.path.exists(path + suffix):
+                    os.remove(path + suffix)
+
+    def total_expenses(self, user_id):
+        response = self.client.get('/api/expenses/summary', headers=self.headers[user_id])
+        self.assertEqual(response.status_code, 200)
+        return response.get_json()['total_expenses']
+
+    def test_reads_go_to_replica(self):
+        self.assertEqual(self.total_expenses(1), 99.0)
+
+    def test_writer_reads_own_writes_then_returns_to_replica(self):
+        response = self.client.post('/api/expense', json={'amount': 5}, headers=self.headers[1])
+        self.assertEqual(response.status_code, 201)
+
+        self.assertEqual(self.total_expenses(1), 15.0)
+        self.assertEqual(self.total_expenses(2), 99.0)
+
+        time.sleep(0.6)
+        self.assertEqual(self.total_expenses(1), 99.0)
+
+    def test_failed_write_does_not_pin_user(self):
+        response = self.client.post('/api/expense', json={'amount': -5}, headers=self.headers[1])
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(self.total_expenses(1), 99.0)
+
+
+class TestReadRouterSetup(unittest.TestCase):
+
+    def test_init_without_a_replica_bind_or_models(self):
+        # No replica bind registered and no tables yet: nothing to remove.
+        app = Flask(__name__)
+        app.config.from_object(TestConfig)
+        empty = SQLAlchemy()
+        router = ReadRouter()
+        router.init_app(app, empty)
+        self.assertIs(app.extensions['read_router'], router)
+        self.assertNotIn('replica', empty.metadatas)
+
+
+if __name__ == '__main__':
+    unittest.main()
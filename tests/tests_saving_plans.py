@@ -0,0 +1,139 @@
+import csv
+import io
+import random
+import unittest
+import numpy as np
+from flask_jwt_extended import create_access_token
+from sqlalchemy import event
+from sqlalchemy.orm import Session
+from app import create_app, db
+from app.config import TestConfig
+from app.models import User, Savings, SavingPlan, SavingPlanEnrollment
+from app.projections import PERIODS_PER_YEAR, contribution_schedule, project
+
+
+def naive_projection(balance, annual_rate, contribution, frequency, term_months, months):
+    """Month-by-month reference implementation."""
+    per_year = PERIODS_PER_YEAR[frequency]
+    curve = []
+    for month in range(1, months + 1):
+        balance *= 1 + annual_rate / 12
+        if term_months is None or month <= term_months:
+            if per_year > 12:
+                balance += contribution * per_year / 12
+            elif month % (12 // per_year) == 0:
+                balance += contribution
+        curve.append(balance)
+    return curve
+
+
+class TestProjectionEngine(unittest.TestCase):
+
+    def test_matches_month_by_month_loop(self):
+        rng = random.Random(4)
+        rows = [(rng.uniform(0, 5000), rng.uniform(0, 0.1), rng.uniform(10, 500),
+                 rng.choice(list(PERIODS_PER_YEAR)), rng.choice([None, 12, 30])) for _ in range(20)]
+        offsets = [-0.01, 0.0, 0.02]
+        balances, rates, contributions, frequencies, terms = zip(*rows)
+        curves = project(balances, rates, contribution_schedule(contributions, frequencies, terms, 60), offsets)
+
+        self.assertEqual(curves.shape, (20, 3, 60))
+        for i, (balance, rate, contribution, frequency, term) in enumerate(rows):
+            for j, offset in enumerate(offsets):
+                expected = naive_projection(balance, rate + offset, contribution, frequency, term, 60)
+                np.testing.assert_allclose(curves[i, j], expected, rtol=1e-9)
+
+    def test_rejects_rates_below_minus_one_hundred_percent(self):
+        with self.assertRaises(ValueError):
+            project([0], [0.0], contribution_schedule([1], ['monthly'], [None], 3), [-12.0])
+
+
+class TestSavingPlanRoutes(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(TestConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            user = User(email='plans@example.com', password_hash='x')
+            monthly = SavingPlan(name='Monthly Deposit', description='Save monthly', annual_rate=0.12)
+            yearly = SavingPlan(name='Yearly Deposit', description='Save yearly', annual_rate=0.0,
+                                contribution_frequency='yearly')
+            db.session.add_all([user, monthly, yearly])
+            db.session.flush()
+            db.session.add(Savings(user_id=user.id, balance=1000.0))
+            db.session.commit()
+            self.plan_ids = (monthly.id, yearly.id)
+            self.headers = {'Authorization': f'Bearer {create_access_token(identity=str(user.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def enroll(self, plan_id, amount):
+        return self.client.post(f'/api/saving-plans/{plan_id}/enroll', json={'amount': amount}, headers=self.headers)
+
+    def test_enrollment_lifecycle(self):
+        monthly, yearly = self.plan_ids
+        self.assertEqual(len(self.client.get('/api/saving-plans/available').get_json()), 2)
+        self.assertEqual(self.client.get('/api/saving-plans', headers=self.headers).get_json(), [])
+
+        self.assertEqual(self.enroll(monthly, 100).status_code, 201)
+        self.assertEqual(self.enroll(monthly, 50).status_code, 409)
+        self.assertEqual(self.enroll(999, 50).status_code, 404)
+        self.assertEqual(self.enroll(yearly, -5).status_code, 400)
+
+        plans = self.client.get('/api/saving-plans', headers=self.headers).get_json()
+        self.assertEqual([(p['id'], p['name'], p['amount']) for p in plans], [(monthly, 'Monthly Deposit', 100.0)])
+        response = self.client.get(f'/api/saving-plans/{monthly}', headers=self.headers)
+        self.assertEqual(response.get_json()['annual_rate'], 0.12)
+        self.assertEqual(self.client.get(f'/api/saving-plans/{yearly}', headers=self.headers).status_code, 404)
+
+        self.assertEqual(self.client.delete(f'/api/saving-plans/{monthly}/enroll', headers=self.headers).status_code, 200)
+        self.assertEqual(self.client.delete(f'/api/saving-plans/{monthly}/enroll', headers=self.headers).status_code, 404)
+
+    def test_enrollment_cancelled_before_the_response(self):
+        monthly, _ = self.plan_ids
+
+        def cancel(session):
+            with db.engine.begin() as connection:
+                connection.execute(db.delete(SavingPlanEnrollment))
+
+        event.listen(Session, 'after_commit', cancel)
+        self.addCleanup(event.remove, Session, 'after_commit', cancel)
+        response = self.enroll(monthly, 100)
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.get_json()['amount'], 100.0)
+
+    def test_projection(self):
+        monthly, yearly = self.plan_ids
+        self.enroll(monthly, 100)
+        self.enroll(yearly, 1200)
+
+        response = self.client.get('/api/saving-plans/projection?months=12&scenarios=0,0.12', headers=self.headers)
+        self.assertEqual(response.status_code, 200)
+        body = response.get_json()
+        self.assertEqual(body['starting_balance'], 1000.0)
+        monthly_curves, yearly_curves = body['plans'][0]['balances'], body['plans'][1]['balances']
+        self.assertEqual(monthly_curves[0][:2], [1110.0, 1221.1])
+        self.assertEqual(monthly_curves[1][:2], [1120.0, 1242.4])
+        self.assertEqual(yearly_curves[0][10:], [1000.0, 2200.0])
+
+        for query in ('months=0', 'months=abc', 'scenarios=5', 'months=100000',
+                      'scenarios=nan', 'scenarios=0.01,inf', 'scenarios=-inf'):
+            self.assertEqual(self.client.get(f'/api/saving-plans/projection?{query}',
+                                             headers=self.headers).status_code, 400)
+
+    def test_batch_projection_command(self):
+        monthly, _ = self.plan_ids
+        self.enroll(monthly, 100)
+        result = self.app.test_cli_runner().invoke(
+            args=['saving-plans', 'project', '--months', '2', '--scenarios', '0'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        rows = list(csv.reader(io.StringIO(result.stdout)))
+        self.assertEqual(rows, [['user_id', 'plan_id', 'balance_+0'], ['1', str(monthly), '1221.1']])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,136 @@
+import unittest
+from datetime import datetime, timedelta
+from flask_jwt_extended import create_access_token
+from sqlalchemy import text
+from app import create_app, db
+from app.config import TestConfig
+from app.models import ContactMessage, User
+from app.pagination import encode_cursor
+from app.search import match_query
+
+BASE = datetime(2026, 1, 1)
+
+
+class SearchConfig(TestConfig):
+    ADMIN_EMAILS = ['support@example.com']
+
+
+class TestContactSearch(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(SearchConfig)
+        self.client = self.app.test_client()
+        with self.app.app_context():
+            db.create_all()
+            admin = User(email='Support@example.com', password_hash='x')
+            member = User(email='member@example.com', password_hash='x')
+            db.session.add_all([admin, member])
+            db.session.commit()
+            self.admin = {'Authorization': f'Bearer {create_access_token(identity=str(admin.id))}'}
+            self.member = {'Authorization': f'Bearer {create_access_token(identity=str(member.id))}'}
+
+    def tearDown(self):
+        with self.app.app_context():
+            db.session.remove()
+            db.drop_all()
+
+    def _add(self, *messages):
+        with self.app.app_context():
+            rows = [ContactMessage(name=name, email=email, message=message, timestamp=BASE + timedelta(days=day))
+                    for day, (name, email, message) in enumerate(messages)]
+            db.session.add_all(rows)
+            db.session.commit()
+            return [row.id for row in rows]
+
+    def _search(self, expected_status=200, **args):
+        response = self.client.get('/api/admin/messages', query_string=args, headers=self.admin)
+        self.assertEqual(response.status_code, expected_status, response.json)
+        return response.json
+
+    def _pages(self, **args):
+        ids, cursor = [], None
+        while True:
+            page = self._search(**args, **({'after': cursor} if cursor else {}))
+            ids += [item['id'] for item in page['items']]
+            cursor = page['next_cursor']
+            if cursor is None:
+                return ids
+
+    def test_admins_only(self):
+        self.assertEqual(self.client.get('/api/admin/messages').status_code, 401)
+        response = self.client.get('/api/admin/messages', headers=self.member)
+        self.assertEqual(response.status_code, 403)
+        response = self.client.get('/api/admin/messages', headers=self.admin)
+        self.assertEqual(response.status_code, 200)
+        self.assertEqual(response.headers['Cache-Control'], 'no-store')
+
+    def test_ranked_matches_with_snippets(self):
+        in_body, in_name, _ = self._add(('Jane Doe', 'jane@example.com', 'Question about a Knee replacement loan'),
+                                        ('Knee Clinic', 'billing@clinic.example', 'Invoice attached'),
+                                        ('Bob', 'bob@example.com', 'Savings plan question'))
+        items = self._search(q='knee')['items']
+        self.assertEqual([item['id'] for item in items], [in_name, in_body])
+        self.assertLess(items[0]['rank'], items[1]['rank'])
+        self.assertEqual(items[1]['snippet'], 'Question about a [Knee] replacement loan')
+        self.assertEqual(items[1]['timestamp'], BASE.isoformat())
+
+        self.assertEqual([item['id'] for item in self._search(q='jane@example.com')['items']], [in_body])
+        self.assertEqual([item['id'] for item in self._search(q='repl* loan')['items']], [in_body])
+        self.assertEqual(self._search(q='knee savings')['items'], [])
+
+    def test_index_follows_updates_and_deletes(self):
+        first, second = self._add(('Jane', 'jane@example.com', 'knee'), ('Bob', 'bob@example.com', 'knee'))
+        with self.app.app_context():
+            db.session.get(ContactMessage, first).message = 'shoulder'
+            db.session.delete(db.session.get(ContactMessage, second))
+            db.session.commit()
+        self.assertEqual(self._search(q='knee')['items'], [])
+        self.assertEqual([item['id'] for item in self._search(q='shoulder')['items']], [first])
+
+    def test_keyset_pages_cover_every_match_once(self):
+        ids = self._add(*[(f'Patient {n}', f'p{n}@example.com', 'knee ' * (n % 4 + 1)) for n in range(23)])
+        ranked = self._pages(q='knee', limit=5)
+        self.assertEqual(sorted(ranked), ids)
+        self.assertEqual(ranked, [item['id'] for item in self._search(q='knee', limit=100)['items']])
+        self.assertEqual(self._pages(limit=5), ids[::-1])
+
+    def test_date_filters(self):
+        ids = self._add(*[('Jane', 'jane@example.com', 'knee') for _ in range(10)])
+        start, end = (BASE + timedelta(days=3)).isoformat(), (BASE + timedelta(days=7)).isoformat()
+        self.assertEqual(sorted(self._pages(q='knee', start=start, end=end, limit=2)), ids[3:7])
+        self.assertEqual(self._pages(sort='newest', q='knee', start=start, limit=3), ids[3:][::-1])
+
+    def test_bad_arguments(self):
+        self.assertIn('sort', self._search(400, sort='rank')['error'])
+        self.assertIn('sort', self._search(400, q='knee', sort='oldest')['error'])
+        self.assertEqual(self._search(400, q='knee', after='bm90IGEgY3Vyc29y')['error'], 'Invalid cursor')
+        self.assertEqual(self._search(400, after='WzEuNSwgM10')['error'], 'Invalid cursor')  # a rank cursor
+        for key in (('2024-01-01T00:00:00', {'a': 1}), ('2024-01-01T00:00:00', True), ('2024-01-01T00:00:00', 1.5)):
+            self.assertEqual(self._search(400, sort='newest', after=encode_cursor(*key))['error'], 'Invalid cursor')
+        for key in ((1.5, {'a': 1}), (1.5, True), (1.5, 2.5), (True, 3)):
+            self.assertEqual(self._search(400, q='knee', after=encode_cursor(*key))['error'], 'Invalid cursor')
+        self.assertIn('start', self._search(400, start='yesterday')['error'])
+
+    def test_query_syntax_is_taken_literally(self):
+        self.assertEqual(match_query('jan* "knee OR NEAR( -x'), '"jan"* """knee" "OR" "NEAR(" "-x"')
+        self._add(('Jane', 'jane@example.com', 'knee OR hip'))
+        self.assertEqual(len(self._search(q='"knee OR NEAR( AND')['items']), 0)
+        self.assertEqual(len(self._search(q='knee OR')['items']), 1)
+
+    def test_control_characters_are_ignored(self):
+        self.assertEqual(match_query('\x00knee\x1f hip\x7f'), '"knee" "hip"')
+        self._add(('Jane', 'jane@example.com', 'knee'))
+        self.assertEqual(len(self._search(q='\x00')['items']), 1)  # nothing left to match: newest first
+        self.assertEqual(len(self._search(q='kn\x00ee')['items']), 0)
+
+    def test_text_queries_need_the_index(self):
+        self._add(('Jane', 'jane@example.com', 'knee'))
+        with self.app.app_context():
+            db.session.execute(text('DROP TABLE contact_message_fts'))
+            db.session.commit()
+        self.assertIn('not available', self._search(501, q='knee')['error'])
+        self.assertEqual(len(self._search()['items']), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from sqlalchemy import func, select
+from app import create_app, db, password_hasher, seeding
+from app import cashflow, rollups
+from app.config import TestConfig
+from app.models import User, Income, Expense, Transaction, Savings, DailyCashFlow
+
+END = datetime(2024, 1, 1)
+
+
+def snapshot():
+    # Rounded: slices may land in a different order, which changes float sums.
+    return [
+        tuple(db.session.execute(select(func.count(model.id), func.round(func.sum(model.amount), 2))).one())
+        for model in (Income, Expense, Transaction)
+    ] + [db.session.execute(select(func.round(func.sum(Savings.balance), 2))).scalar()]
+
+
+class TestSeeding(unittest.TestCase):
+
+    def setUp(self):
+        handle, self.path = tempfile.mkstemp(suffix='.db')
+        os.close(handle)
+
+        class FileConfig(TestConfig):
+            SQLALCHEMY_DATABASE_URI = f'sqlite:///{self.path}'
+
+        self.app = create_app(FileConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        db.create_all()
+
+    def tearDown(self):
+        db.session.remove()
+        db.drop_all()
+        db.engine.dispose()
+        self.app_context.pop()
+        os.remove(self.path)
+
+    def test_seed_writes_history_and_consistent_rollups(self):
+        first, rows = seeding.seed(5, 30, seed=1, end=END, chunk_size=50)
+        self.assertEqual(first, 1)
+        self.assertEqual(rows, 5 + 5 * 30 * 3 + 5 * 30 + 5 * 3)
+        self.assertEqual(db.session.execute(select(func.count(Income.id))).scalar(), 150)
+        self.assertLess(db.session.execute(select(func.max(Expense.date))).scalar(), END)
+        self.assertEqual(rollups.rebuild(dry_run=True), [])
+        buckets = db.session.execute(select(*DailyCashFlow.__table__.c)
+                                     .order_by(DailyCashFlow.user_id, DailyCashFlow.day)).all()
+        self.assertEqual(cashflow.rebuild(), 150)
+        rebuilt = db.session.execute(select(*DailyCashFlow.__table__.c)
+                                     .order_by(DailyCashFlow.user_id, DailyCashFlow.day)).all()
+        self.assertEqual([(r.user_id, r.day, r.income_count, r.expense_count, round(r.income, 2)) for r in buckets],
+                         [(r.user_id, r.day, r.income_count, r.expense_count, round(r.income, 2)) for r in rebuilt])
+
+        user = db.session.get(User, 3)
+        self.assertEqual(user.email, 'user3@example.com')
+        self.assertTrue(password_hasher.verify(user.password_hash, seeding.TEMPLATE_PASSWORD))
+
+    def test_same_seed_gives_same_data_and_appends(self):
+        seeding.seed(4, 20, seed=7, end=END)
+        before = snapshot()
+        db.drop_all()
+        db.create_all()
+        seeding.seed(4, 20, seed=7, end=END, chunk_size=17)
+        self.assertEqual(snapshot(), before)
+
+        first, _ = seeding.seed(2, 20, seed=8, end=END)
+        self.assertEqual(first, 5)
+        self.assertEqual(db.session.execute(select(func.count(User.id))).scalar(), 6)
+
+    def test_process_split_matches_single_process(self):
+        seeding.seed(4, 10, seed=3, end=END)
+        before = snapshot()
+        db.drop_all()
+        db.create_all()
+        seeding.seed(4, 10, seed=3, end=END, processes=2)
+        self.assertEqual(snapshot(), before)
+        self.assertEqual(rollups.rebuild(dry_run=True), [])
+
+    def test_cli_command(self):
+        result = self.app.test_cli_runner().invoke(args=['seed', '--users', '2', '--history', '3',
+                                                         '--end', '2024-01-01'])
+        self.assertEqual(result.exit_code, 0, result.output)
+        self.assertIn('Seeded users 1-2', result.output)
+
+
+if __name__ == '__main__':
+    unittest.main()
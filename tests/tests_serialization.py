@@ -0,0 +1,60 @@
+import unittest
+from datetime import date, datetime
+from decimal import Decimal
+from app import create_app, db
+from app.config import TestConfig
+from app.metrics import _TimedJSONProvider
+from app.models import Income, User
+from app.serialization import FastJSONProvider, orjson
+
+
+class TestFastJSONProvider(unittest.TestCase):
+
+    def _app(self, encoder):
+        config = type('JSONConfig', (TestConfig,), {'JSON_ENCODER': encoder})
+        app = create_app(config)
+        with app.app_context():
+            db.create_all()
+            db.session.add(User(id=1, email='a@example.com', password_hash='x'))
+            db.session.add(Income(user_id=1, amount=12.5, date=datetime(2024, 3, 1, 9, 30)))
+            db.session.commit()
+        return app
+
+    def _payload(self, app):
+        with app.app_context():
+            rows = db.session.execute(db.select(Income.id, Income.amount, Income.date)).all()
+            return {'rows': rows, 'mapping': rows[0]._mapping, 'day': date(2024, 3, 1),
+                    'price': Decimal('19.99'), 'by_id': {7: 'seven'}}
+
+    def test_encoders_produce_the_same_document(self):
+        expected = {'rows': [{'id': 1, 'amount': 12.5, 'date': '2024-03-01T09:30:00'}],
+                    'mapping': {'id': 1, 'amount': 12.5, 'date': '2024-03-01T09:30:00'},
+                    'day': '2024-03-01', 'price': '19.99', 'by_id': {'7': 'seven'}}
+        for encoder in ('stdlib', 'auto'):
+            with self.subTest(encoder=encoder):
+                app = self._app(encoder)
+                with app.app_context():
+                    response = app.json.response(self._payload(app))
+                self.assertEqual(response.get_json(), expected)
+                self.assertTrue(response.get_data().endswith(b'\n'))
+
+    @unittest.skipIf(orjson is None, 'orjson is not installed')
+    def test_orjson_is_used_when_installed(self):
+        app = self._app('auto')
+        self.assertIsInstance(app.json, _TimedJSONProvider)  # metrics still wraps it
+        provider = app.json.inner
+        self.assertIsInstance(provider, FastJSONProvider)
+        self.assertTrue(provider.use_orjson)
+        with app.app_context():
+            body = provider.response({'b': 1, 'a': [1, 2]}).get_data()
+            self.assertEqual(body, b'{"a":[1,2],"b":1}\n')
+            # Too wide for orjson: the stdlib takes over.
+            self.assertEqual(provider.dumps({'n': 2 ** 70}), '{"n": 1180591620717411303424}')
+
+    def test_unknown_encoder_is_rejected(self):
+        with self.assertRaises(ValueError):
+            create_app(type('JSONConfig', (TestConfig,), {'JSON_ENCODER': 'simdjson'}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,124 @@
+import threading
+import time
+import unittest
+from unittest import mock
+from email_validator import EmailUndeliverableError
+from app import create_app, db
+from app.config import TestConfig
+from app.validators import (DomainCache, EmailChecker, validate_contact_form, validate_email,
+                            validate_emails, validate_phone_number)
+
+
+class FakeDNS:
+    """Stands in for the network: records lookups and answers per domain."""
+
+    def __init__(self, undeliverable=(), broken=()):
+        self.undeliverable = set(undeliverable)
+        self.broken = set(broken)
+        self.lookups = []
+        self.lock = threading.Lock()
+
+    def __call__(self, domain, domain_i18n, timeout=None):
+        with self.lock:
+            self.lookups.append((domain, timeout))
+        if domain in self.broken:
+            raise OSError('resolver unavailable')
+        if domain in self.undeliverable:
+            raise EmailUndeliverableError(f'The domain name {domain_i18n} does not exist.')
+        return {'mx': [(10, f'mx.{domain}')]}
+
+
+class DeliverabilityConfig(TestConfig):
+    EMAIL_CHECK_DELIVERABILITY = True
+    EMAIL_DNS_TIMEOUT = 0.5
+    EMAIL_DOMAIN_FAILURE_TTL = 0.05
+
+
+class TestEmailChecker(unittest.TestCase):
+
+    def setUp(self):
+        self.app = create_app(DeliverabilityConfig)
+        self.app_context = self.app.app_context()
+        self.app_context.push()
+        self.dns = FakeDNS(undeliverable={'nowhere.example'}, broken={'flaky.example'})
+        patcher = mock.patch('app.validators.validate_email_deliverability', self.dns)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.app_context.pop()
+
+    def test_syntax_only_mode_never_resolves(self):
+        self.assertTrue(validate_email('jane@nowhere.example', check_deliverability=False))
+        self.assertFalse(validate_email('not-an-email', check_deliverability=False))
+        self.assertFalse(validate_email(None))
+        self.assertEqual(self.dns.lookups, [])
+
+    def test_domain_results_are_cached(self):
+        self.assertTrue(validate_email('a@mail.example'))
+        self.assertTrue(validate_email('b@MAIL.example'))
+        self.assertFalse(validate_email('c@nowhere.example'))
+        self.assertFalse(validate_email('d@nowhere.example'))
+        self.assertEqual(self.dns.lookups, [('mail.example', 0.5), ('nowhere.example', 0.5)])
+
+    def test_resolver_failures_accept_and_expire_quickly(self):
+        self.assertTrue(validate_email('a@flaky.example'))
+        self.assertTrue(validate_email('b@flaky.example'))
+        self.assertEqual(len(self.dns.lookups), 1)
+        time.sleep(0.06)
+        self.assertTrue(validate_email('c@flaky.example'))
+        self.assertEqual(len(self.dns.lookups), 2)
+
+    def test_batch_looks_up_each_domain_once(self):
+        emails = [f'user{n}@{domain}' for n in range(50)
+                  for domain in ('mail.example', 'nowhere.example', 'other.example')] + ['broken@', 42]
+        checks = validate_emails(emails)
+
+        self.assertEqual(len(checks), len(emails))
+        self.assertEqual(sorted(domain for domain, _ in self.dns.lookups),
+                         ['mail.example', 'nowhere.example', 'other.example'])
+        self.assertEqual([c.valid for c in checks[:3]], [True, False, True])
+        self.assertIn('does not exist', checks[1].reason)
+        self.assertEqual(checks[0].normalized, 'user0@mail.example')
+        self.assertEqual([c.valid for c in checks[-2:]], [False, False])
+
+    def test_contact_form_flags_invalid_email(self):
+        form = {'name': 'Jane', 'message': 'Hello'}
+        self.assertEqual(validate_contact_form(dict(form, email='jane@mail.example')), [])
+        self.assertEqual(validate_contact_form(dict(form, email='jane@nowhere.example')), ['Invalid email'])
+        self.assertEqual(validate_contact_form(dict(form, email='jane')), ['Invalid email'])
+
+    def test_send_message_rejects_invalid_email(self):
+        db.create_all()
+        response = self.app.test_client().post('/api/send-message',
+                                               json={'name': 'Jane', 'email': 'jane', 'message': 'Hi'})
+        self.assertEqual(response.status_code, 400)
+        db.drop_all()
+
+
+class TestDomainCache(unittest.TestCase):
+
+    def test_lru_eviction(self):
+        cache = DomainCache(maxsize=2)
+        cache.set('a', 1, 60)
+        cache.set('b', 2, 60)
+        cache.get('a')
+        cache.set('c', 3, 60)
+        self.assertEqual((cache.get('a'), cache.get('b'), cache.get('c')), (1, None, 3))
+
+    def test_checker_without_app_uses_defaults(self):
+        checker = EmailChecker()
+        self.assertTrue(checker.check('jane@example.com', check_deliverability=False).valid)
+
+
+class TestPhoneNumbers(unittest.TestCase):
+
+    def test_phone_numbers(self):
+        self.assertTrue(validate_phone_number('+254712345678'))
+        self.assertTrue(validate_phone_number('254712345678'))
+        self.assertFalse(validate_phone_number('0712345678'))
+        self.assertFalse(validate_phone_number(None))
+
+
+if __name__ == '__main__':
+    unittest.main()
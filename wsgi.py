@@ -0,0 +1,8 @@
+# wsgi.py - entry point for pre-forking servers, e.g.
+#   flask --app wsgi db upgrade
+#   gunicorn --preload -w 4 wsgi:app
+from app import create_app, db
+from app.config import ProductionConfig
+from app.lifecycle import preload
+
+app = preload(create_app(ProductionConfig), db)